@@ -3,9 +3,12 @@ from typing import List
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
+from backend.core.content_negotiation import MsgPackRoute
+from backend.core.responses import TrustedResponse
 from backend.core.security import get_current_user
 from backend.db.models import User
-from backend.db.session import get_db
+from backend.db.session import (get_db,
+                                get_read_db)
 from backend.schemas.article import (ArticleResponse,
                                      ArticleCreate,
                                      ArticleUpdate)
@@ -14,7 +17,7 @@ from backend.crud.articles import (create,
                                    update,
                                    delete)
 
-router = APIRouter(prefix='/articles')
+router = APIRouter(prefix='/articles', route_class=MsgPackRoute)
 
 
 @router.post('/create',
@@ -131,14 +134,14 @@ async def create_article(
         }
     }
 )
-async def show_article(db: Session = Depends(get_db)):
+async def show_article(db: Session = Depends(get_read_db)):
     """
         Получение списка статей
 
     Возвращает:
     - List[ArticleResponse]: Список объектов статей с основной информацией
     """
-    return await read(db)
+    return TrustedResponse(await read(db))
 
 
 @router.get(
@@ -185,7 +188,7 @@ async def show_article(db: Session = Depends(get_db)):
         }
     }
 )
-async def show_article(article_id: int, db: Session = Depends(get_db)):
+async def show_article(article_id: int, db: Session = Depends(get_read_db)):
     """
         Получение конкретной статьи
 
@@ -195,7 +198,7 @@ async def show_article(article_id: int, db: Session = Depends(get_db)):
     Возвращает:
     - ArticleResponse: Объект статьи со всей информацией
     """
-    return await read(db, article_id)
+    return TrustedResponse(await read(db, article_id))
 
 
 @router.patch(
@@ -8,7 +8,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from argon2.exceptions import VerifyMismatchError
 
-from backend.core.security import (verify_password,
+from backend.core.content_negotiation import MsgPackRoute
+from backend.core.security import (verify_password_async,
                                    create_access_token,
                                    oauth2_scheme,
                                    get_current_user)
@@ -21,11 +22,11 @@ from backend.crud.user import (create,
                                get_user,
                                add_token,
                                del_token,
-                               activate)
+                               activate,
+                               resend_link)
 from backend.db.models import User
-from backend.crud.user import send_link
 
-router = APIRouter(prefix='/auth')
+router = APIRouter(prefix='/auth', route_class=MsgPackRoute)
 
 
 @router.post(
@@ -108,7 +109,7 @@ async def login(
             detail='User not found'
         )
     try:
-        verify_password(form_data.password, db_user.hashed_password)
+        await verify_password_async(form_data.password, db_user.hashed_password)
     except VerifyMismatchError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -317,6 +318,10 @@ async def reg_confirm(
     Требования:
     - Пользователь должен быть авторизован
     - Аккаунт не должен быть уже подтвержден
+
+    Особенности:
+    - Повторные запросы в течение минуты не отправляют новое письмо
+    - Пока ссылка действительна, отправляется та же ссылка
     """,
     tags=['Аутентификация'],
     responses={
@@ -324,8 +329,13 @@ async def reg_confirm(
             'description': 'Ссылка успешно отправлена',
             'content': {
                 'application/json': {
-                    'example': {
-                        'message': 'link was sent'
+                    'examples': {
+                        'Link sent': {
+                            'value': {'message': 'link was sent'}
+                        },
+                        'Already active': {
+                            'value': {'message': 'User already active'}
+                        }
                     }
                 }
             }
@@ -353,5 +363,4 @@ async def get_link(
     Ошибки:
     - 401: Если пользователь не авторизован
     """
-    await send_link(current_user, db)
-    return {'message': 'link was sent'}
+    return await resend_link(current_user, db)
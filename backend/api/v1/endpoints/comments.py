@@ -5,16 +5,19 @@ from fastapi import (APIRouter,
                      Depends,
                      status)
 
+from backend.core.content_negotiation import MsgPackRoute
+from backend.core.responses import TrustedResponse
 from backend.core.security import get_current_user
 from backend.db.models import User
-from backend.db.session import get_db
+from backend.db.session import (get_db,
+                                get_read_db)
 from backend.schemas.comment import (CommentCreate,
                                      CommentResponse)
 from backend.crud.comments import (create,
                                    read,
                                    delete)
 
-router = APIRouter(prefix='/comments')
+router = APIRouter(prefix='/comments', route_class=MsgPackRoute)
 
 
 @router.post(
@@ -157,7 +160,7 @@ async def create_comment(
         }
     }
 )
-async def show_comment(article_id: int, db: Session = Depends(get_db)):
+async def show_comment(article_id: int, db: Session = Depends(get_read_db)):
     """
         Получение комментариев статьи
 
@@ -170,7 +173,7 @@ async def show_comment(article_id: int, db: Session = Depends(get_db)):
     Ошибки:
     - 404: Если статья не найдена
     """
-    return await read(article_id, db)
+    return TrustedResponse(await read(article_id, db))
 
 
 # @router.patch('/')
@@ -0,0 +1,113 @@
+from fastapi import (APIRouter,
+                     Request,
+                     Response,
+                     status)
+
+from backend.core.content_negotiation import MsgPackRoute
+from backend.core.health import create_health_checker
+from backend.db.session import engine
+from backend.schemas.service import HealthResponse
+
+router = APIRouter(prefix='/health', route_class=MsgPackRoute)
+
+health_checker = create_health_checker(engine)
+
+
+@router.get(
+    '/live',
+    response_model=HealthResponse,
+    status_code=status.HTTP_200_OK,
+    summary='Процесс жив',
+    description="""
+    Проверка, что процесс отвечает на запросы. Зависимости (БД, брокер)
+    не проверяются: их недоступность не повод перезапускать процесс.
+    """,
+    tags=['Сервис'],
+    responses={
+        status.HTTP_200_OK: {
+            'description': 'Процесс отвечает',
+            'content': {
+                'application/json': {
+                    'example': {'status': 'alive', 'checks': {}}
+                }
+            }
+        }
+    }
+)
+async def live():
+    """
+        Liveness-проверка
+
+    Возвращает:
+    - dict: {'status': 'alive'}
+    """
+    return {'status': 'alive'}
+
+
+@router.get(
+    '/ready',
+    response_model=HealthResponse,
+    status_code=status.HTTP_200_OK,
+    summary='Процесс готов принимать запросы',
+    description="""
+    Проверка готовности для балансировщика.
+
+    Процесс не готов (503), если:
+    - не закончен прогрев при запуске или идет остановка
+    - БД или брокер задач (Celery) не ответили за HEALTH_CHECK_TIMEOUT секунд
+    - пул соединений занят больше HEALTH_POOL_SATURATION дольше HEALTH_POOL_SATURATION_SECONDS
+
+    Результат проверок БД и брокера кешируется на HEALTH_CACHE_SECONDS.
+    """,
+    tags=['Сервис'],
+    responses={
+        status.HTTP_200_OK: {
+            'description': 'Процесс готов',
+            'content': {
+                'application/json': {
+                    'example': {
+                        'status': 'ready',
+                        'checks': {
+                            'database': {'status': 'ok', 'duration_ms': 1.2},
+                            'broker': {'status': 'ok', 'duration_ms': 0.4},
+                            'pool': {'status': 'ok', 'saturation': 0.2}
+                        }
+                    }
+                }
+            }
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            'description': 'Процесс не готов',
+            'content': {
+                'application/json': {
+                    'example': {
+                        'status': 'not_ready',
+                        'checks': {
+                            'database': {'status': 'error', 'duration_ms': 1000.5, 'error': 'timeout'},
+                            'pool': {'status': 'saturated', 'saturation': 1.0}
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def ready(request: Request, response: Response):
+    """
+        Readiness-проверка
+
+    Возвращает:
+    - dict: Общий статус и результат каждой проверки
+
+    Ошибки:
+    - 503: Процесс не готов принимать запросы
+    """
+    # Приложение без прогрева (тесты) считается готовым
+    if not getattr(request.app.state, 'ready', True):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {'status': 'not_ready', 'checks': {}}
+
+    is_ready, checks = await health_checker.readiness()
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {'status': 'ready' if is_ready else 'not_ready', 'checks': checks}
@@ -0,0 +1,18 @@
+from fastapi import (APIRouter,
+                     Response)
+
+from backend.core.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get('/metrics', include_in_schema=False)
+async def metrics():
+    """
+        Метрики в текстовом формате Prometheus
+
+    В python -m backend.server содержит сумму по всем рабочим процессам.
+    Эндпоинт без авторизации: доступ ограничивается сетью (как /health).
+    """
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
@@ -0,0 +1,91 @@
+from fastapi import (APIRouter,
+                     Depends,
+                     status)
+
+from backend.core.content_negotiation import MsgPackRoute
+from backend.core.security import get_current_staff_user
+from backend.db.models import User
+from backend.db.session import (engine,
+                                read_engine)
+from backend.schemas.service import PoolStatsResponse
+
+router = APIRouter(prefix='/service', route_class=MsgPackRoute)
+
+
+@router.get(
+    '/db-pool',
+    response_model=dict[str, PoolStatsResponse],
+    status_code=status.HTTP_200_OK,
+    summary='Состояние пула соединений с БД',
+    description="""
+    Текущее состояние пула соединений процесса и накопленные счетчики.
+
+    Особенности:
+    - Данные относятся к процессу, обработавшему запрос
+    - replica присутствует, если настроена реплика для чтения
+    - Пустой ответ: пул в приложении отключен (DB_PGBOUNCER_NULLPOOL)
+    - waits и wait_time_* учитывают только выдачи, которым пришлось ждать свободное соединение
+    - timeouts - запросы, не дождавшиеся соединения за DB_POOL_TIMEOUT
+
+    Требования:
+    - Только для администраторов
+    """,
+    tags=['Сервис'],
+    responses={
+        status.HTTP_200_OK: {
+            'description': 'Статистика пула',
+            'content': {
+                'application/json': {
+                    'example': {
+                        'primary': {
+                            'size': 10,
+                            'checked_in': 8,
+                            'checked_out': 2,
+                            'overflow': 0,
+                            'max_overflow': 5,
+                            'checkouts': 15230,
+                            'waits': 12,
+                            'wait_time_total_ms': 84.5,
+                            'wait_time_max_ms': 21.3,
+                            'timeouts': 0
+                        }
+                    }
+                }
+            }
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            'description': 'Необходимо авторизоваться',
+            'content': {
+                'application/json': {
+                    'example': {'detail': 'Not authenticated'}
+                }
+            }
+        },
+        status.HTTP_403_FORBIDDEN: {
+            'description': 'Недостаточно прав',
+            'content': {
+                'application/json': {
+                    'example': {'detail': 'You don`t have permission'}
+                }
+            }
+        }
+    }
+)
+async def db_pool_stats(current_user: User = Depends(get_current_staff_user)):
+    """
+        Статистика пула соединений
+
+    Возвращает:
+    - dict: Состояние пула по имени движка
+
+    Ошибки:
+    - 401: Пользователь не авторизован
+    - 403: Пользователь не администратор
+    """
+    pools = {'primary': engine, 'replica': read_engine}
+    return {
+        name: pool_engine.pool.snapshot()
+        for name, pool_engine in pools.items()
+        # Без пула в приложении (DB_PGBOUNCER_NULLPOOL) статистики нет
+        if pool_engine is not None and hasattr(pool_engine.pool, 'snapshot')
+    }
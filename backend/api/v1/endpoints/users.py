@@ -5,8 +5,11 @@ from fastapi import (APIRouter,
 
 from sqlalchemy.orm import Session
 
+from backend.core.content_negotiation import MsgPackRoute
+from backend.core.responses import TrustedResponse
 from backend.core.security import get_current_user
-from backend.db.session import get_db
+from backend.db.session import (get_db,
+                                get_read_db)
 from backend.db.models import User
 from backend.schemas.user import (UserResponse,
                                   UserUpdate)
@@ -14,7 +17,7 @@ from backend.crud.user import (read,
                                update,
                                delete)
 
-router = APIRouter(prefix='/users')
+router = APIRouter(prefix='/users', route_class=MsgPackRoute)
 
 
 @router.get(
@@ -80,7 +83,7 @@ router = APIRouter(prefix='/users')
     }
 )
 async def get_users(
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     """
@@ -93,7 +96,7 @@ async def get_users(
     - 403: Если пользователь не является администратором
     - 401: Если пользователь не авторизован
     """
-    return await read(db, current_user, user_list=True)
+    return TrustedResponse(await read(db, current_user, user_list=True))
 
 
 @router.get(
@@ -147,7 +150,7 @@ async def get_users(
     }
 )
 async def profile(
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     """
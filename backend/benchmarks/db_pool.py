@@ -0,0 +1,100 @@
+"""Бенчмарк пула соединений.
+
+Для каждой комбинации размера пула и числа одновременных клиентов держит
+нагрузку duration секунд: клиент берет соединение, выполняет запрос
+длительностью query-ms на стороне Postgres и возвращает соединение.
+Печатает пропускную способность, задержки и счетчики ожидания пула.
+
+Пример:
+    python -m backend.benchmarks.db_pool --pool-size 5 10 20 --concurrency 10 50 100 --query-ms 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.config import SQLALCHEMY_DATABASE_URL
+from backend.db.pool import InstrumentedQueuePool
+
+
+async def client(engine, query_seconds: float, deadline: float, latencies: list[float]) -> None:
+    statement = text('SELECT pg_sleep(:seconds)')
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(statement, {'seconds': query_seconds})
+        except exc.TimeoutError:
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run(pool_size: int, max_overflow: int, concurrency: int, query_ms: float,
+              duration: float, pool_timeout: float) -> dict:
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+    # Прогрев: соединения открываются до замера
+    async with engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(engine, query_ms / 1000, deadline, latencies) for _ in range(concurrency)))
+    snapshot = engine.pool.snapshot()
+    await engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else [0.0] * 99
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(quantiles[49], 2),
+        'p99_ms': round(quantiles[98], 2),
+        'waits': snapshot['waits'],
+        'wait_max_ms': snapshot['wait_time_max_ms'],
+        'timeouts': snapshot['timeouts'],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Нагрузка на пул соединений')
+    parser.add_argument('--pool-size', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('--max-overflow', type=int, default=0)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--query-ms', type=float, default=5, help='Длительность запроса в Postgres, мс')
+    parser.add_argument('--duration', type=float, default=5, help='Длительность прогона, сек')
+    parser.add_argument('--pool-timeout', type=float, default=5)
+    parser.add_argument('--json', help='Сохранить результаты в файл')
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    results = []
+    print(f'{"pool":>5} {"clients":>8} {"rps":>8} {"p50 ms":>8} {"p99 ms":>8} {"waits":>7} {"wait max":>9} {"timeouts":>9}')
+    for pool_size in args.pool_size:
+        for concurrency in args.concurrency:
+            result = await run(pool_size, args.max_overflow, concurrency, args.query_ms,
+                               args.duration, args.pool_timeout)
+            results.append(result)
+            print(f'{pool_size:>5} {concurrency:>8} {result["rps"]:>8} {result["p50_ms"]:>8} '
+                  f'{result["p99_ms"]:>8} {result["waits"]:>7} {result["wait_max_ms"]:>9} {result["timeouts"]:>9}')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
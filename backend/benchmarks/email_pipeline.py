@@ -0,0 +1,147 @@
+"""Бенчмарк отправки писем через фоновые задачи.
+
+Поднимает локальный SMTP-приемник aiosmtpd с настраиваемой задержкой,
+ставит N писем в очередь LocalTaskPool и прогоняет их через настоящую
+задачу send_email_task (шаблон, fastapi_mail, aiosmtplib). Работает без сети.
+
+Пример:
+    python -m backend.benchmarks.email_pipeline -n 500 --concurrency 1 8 32 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import tempfile
+import time
+from email import message_from_bytes
+from pathlib import Path
+
+from aiosmtpd.controller import Controller
+from pydantic import SecretStr
+
+from backend.core.config import CONF
+from backend.tasks.email_tasks import send_email_task
+from backend.tasks.local_pool import LocalTaskPool
+
+
+class SinkHandler:
+    """SMTP-приемник: запоминает время доставки и считает соединения"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.delivered: dict[str, float] = {}
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        message = message_from_bytes(envelope.content)
+        self.delivered[message['Subject']] = time.perf_counter()
+        return '250 Message accepted for delivery'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def configure_mail(port: int) -> None:
+    CONF.MAIL_USERNAME = ''
+    CONF.MAIL_PASSWORD = SecretStr('')
+    CONF.MAIL_FROM = 'bench@example.com'
+    CONF.MAIL_SERVER = '127.0.0.1'
+    CONF.MAIL_PORT = port
+    CONF.MAIL_STARTTLS = False
+    CONF.MAIL_SSL_TLS = False
+    CONF.USE_CREDENTIALS = False
+    CONF.VALIDATE_CERTS = False
+    CONF.SUPPRESS_SEND = 0
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+async def run(messages: int, concurrency: int, latency: float) -> dict:
+    handler = SinkHandler(latency)
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    configure_mail(controller.port)
+
+    enqueued: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = LocalTaskPool(
+            {'send_email_task': send_email_task},
+            workers=concurrency,
+            maxsize=messages,
+            queue_file=Path(tmp) / 'queue.jsonl',
+            drain_timeout=3600,
+        )
+        await pool.start()
+        started = time.perf_counter()
+        for number in range(messages):
+            subject = f'bench-{number}'
+            enqueued[subject] = time.perf_counter()
+            await pool.enqueue(
+                'send_email_task',
+                user={'email': f'user_{number}@example.com', 'full_name': f'Bench user {number}'},
+                subject=subject,
+                template_name='reg_confirm.html',
+                link=f'http://localhost/auth/reg-confirm/{number}',
+            )
+        await pool.stop()
+        elapsed = time.perf_counter() - started
+
+    controller.stop()
+
+    delays = sorted(
+        (handler.delivered[subject] - enqueued[subject]) * 1000
+        for subject in handler.delivered
+    )
+    return {
+        'concurrency': concurrency,
+        'messages': messages,
+        'delivered': len(delays),
+        'seconds': round(elapsed, 3),
+        'messages_per_sec': round(len(delays) / elapsed, 1),
+        'delay_p50_ms': round(percentile(delays, 50), 1),
+        'delay_p99_ms': round(percentile(delays, 99), 1),
+        'connections': handler.connections,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Пропускная способность отправки писем')
+    parser.add_argument('-n', '--messages', type=int, default=200, help='Количество писем')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64],
+                        help='Количество воркеров (аналог --concurrency воркера Celery)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Задержка SMTP-приемника на письмо, сек')
+    parser.add_argument('--json', help='Сохранить результаты в файл')
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    results = []
+    print(f'{"workers":>8} {"sent":>6} {"msg/s":>8} {"p50 ms":>8} {"p99 ms":>8} {"conns":>6}')
+    for concurrency in args.concurrency:
+        result = await run(args.messages, concurrency, args.latency)
+        results.append(result)
+        print(f'{result["concurrency"]:>8} {result["delivered"]:>6} {result["messages_per_sec"]:>8} '
+              f'{result["delay_p50_ms"]:>8} {result["delay_p99_ms"]:>8} {result["connections"]:>6}')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'latency': args.latency, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,353 @@
+"""Нагрузочный тест API на смеси запросов, похожей на живых пользователей.
+
+Перед запуском в БД (SQLALCHEMY_DATABASE_URL) создаются тестовые данные:
+подтвержденные пользователи с одним паролем, статьи и комментарии, у
+популярных авторов и статей их больше. Клиенты (--clients) входят в
+систему и до конца --duration выполняют запросы в пропорциях MIX без
+пауз. После прогона данные теста удаляются.
+
+По умолчанию запросы идут в приложение в том же процессе через ASGI
+(httpx.ASGITransport, с lifespan и прогревом, без сети): клиент и сервер
+делят один цикл событий, результат удобен для сравнения веток, а не для
+оценки production. Письма подтверждения регистрации в этом режиме уходят
+в локальный SMTP-приемник aiosmtpd (как в email_pipeline) и никому не
+доставляются. С --url запросы идут на запущенный сервер
+(python -m backend.server), он должен работать с той же БД, а в MAIL_SERVER
+и MAIL_PORT у него должен быть указан SMTP-приемник (MailHog, aiosmtpd):
+иначе регистрации отправят настоящие письма на адреса @example.com.
+
+Выводит запросы/с и p50/p95/p99 по каждому эндпоинту, --json сохраняет
+результат, --compare печатает разницу с сохраненным результатом.
+
+Пример:
+    python -m backend.benchmarks.loadtest --clients 50 --duration 30 --json main.json
+    python -m backend.benchmarks.loadtest --clients 50 --duration 30 --compare main.json
+    python -m backend.benchmarks.loadtest --url http://127.0.0.1:8080 --clients 200 --duration 60
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from sqlalchemy import (delete,
+                        insert)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.core.security import get_password_hash
+from backend.db.models import (Article,
+                               Comment,
+                               User)
+from backend.db.models.user import Token
+from backend.db.seed import (ARTICLE_SKEW,
+                             AUTHOR_SKEW,
+                             SkewedChoice)
+
+PASSWORD = 'LoadTest123'
+
+# Доли операций в смеси (сумма не обязана быть 100)
+MIX = {
+    'article_list': 20,
+    'article_read': 35,
+    'comment_read': 25,
+    'comment_write': 8,
+    'login': 7,
+    'register': 5,
+}
+
+# Ожидаемые статусы: остальные считаются ошибками
+EXPECTED_STATUS = {
+    'article_list': 200,
+    'article_read': 200,
+    'comment_read': 200,
+    'comment_write': 201,
+    'login': 200,
+    'register': 201,
+}
+
+
+class Dataset:
+    """Данные теста: пользователи, статьи и веса популярности статей"""
+
+    def __init__(self, prefix: str, emails: list[str], user_ids: list[int], article_ids: list[int]):
+        self.prefix = prefix
+        self.emails = emails
+        self.user_ids = user_ids
+        self.article_ids = article_ids
+        # Закон Ципфа: статья с рангом k читается в k раз реже первой.
+        # Накопленные веса считаются один раз, выбор - бинарный поиск
+        self.hot_articles = SkewedChoice(article_ids, ARTICLE_SKEW)
+
+    def hot_article(self, rng: random.Random) -> int:
+        return self.hot_articles.pick(rng)
+
+
+async def seed(engine: AsyncEngine, users: int, articles: int, comments: int, seed_value: int) -> Dataset:
+    rng = random.Random(seed_value)
+    prefix = f'loadtest_{uuid.uuid4().hex[:8]}'
+    # Один хэш на всех: argon2 на каждого пользователя занял бы минуты
+    hashed_password = get_password_hash(PASSWORD)
+    emails = [f'{prefix}_{number}@example.com' for number in range(users)]
+
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            insert(User).returning(User.id),
+            [
+                {'email': email, 'hashed_password': hashed_password, 'full_name': f'Load user {number}',
+                 'is_active': True, 'is_staff': False}
+                for number, email in enumerate(emails)
+            ],
+        )
+        user_ids = list(result.scalars())
+
+        # Популярные авторы пишут больше статей
+        authors = SkewedChoice(user_ids, AUTHOR_SKEW)
+        result = await conn.execute(
+            insert(Article).returning(Article.id),
+            [
+                {'title': f'Load article {number}', 'content': f'Load test content {number} ' * 20,
+                 'author_id': authors.pick(rng)}
+                for number in range(articles)
+            ],
+        )
+        article_ids = list(result.scalars())
+
+        dataset = Dataset(prefix, emails, user_ids, article_ids)
+        if comments:
+            await conn.execute(
+                insert(Comment),
+                [
+                    {'content': f'Load comment {number}', 'article_id': dataset.hot_article(rng),
+                     'author_id': rng.choice(user_ids)}
+                    for number in range(comments)
+                ],
+            )
+    return dataset
+
+
+async def cleanup(engine: AsyncEngine, dataset: Dataset, tokens: list[str]) -> None:
+    async with engine.begin() as conn:
+        # Комментарии статей удаляет БД (ON DELETE CASCADE)
+        await conn.execute(delete(Comment).where(Comment.author_id.in_(dataset.user_ids)))
+        await conn.execute(delete(Article).where(Article.id.in_(dataset.article_ids)))
+        await conn.execute(delete(User).where(User.email.like(f'{dataset.prefix}\\_%')))
+        if tokens:
+            await conn.execute(delete(Token).where(Token.token.in_(tokens)))
+
+
+class Client:
+    """Пользователь: входит в систему и выполняет операции из MIX"""
+
+    def __init__(self, http: httpx.AsyncClient, dataset: Dataset, number: int, results: dict, tokens: list[str]):
+        self.http = http
+        self.dataset = dataset
+        self.number = number
+        self.rng = random.Random(number)
+        self.results = results
+        self.tokens = tokens
+        self.email = dataset.emails[number % len(dataset.emails)]
+        self.headers: dict[str, str] = {}
+        self.registered = 0
+
+    async def request(self, operation: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, **kwargs)
+            ok = response.status_code == EXPECTED_STATUS[operation]
+        except httpx.HTTPError:
+            response = None
+            ok = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        latencies, errors = self.results[operation]
+        latencies.append(elapsed_ms)
+        if not ok:
+            errors.append(response.status_code if response is not None else 'connection')
+        return response
+
+    async def login(self) -> None:
+        response = await self.request(
+            'login', 'POST', '/auth/login', data={'username': self.email, 'password': PASSWORD}
+        )
+        if response is not None and response.status_code == 200:
+            token = response.json()['access_token']
+            self.tokens.append(token)
+            self.headers = {'Authorization': f'Bearer {token}'}
+
+    async def article_list(self) -> None:
+        await self.request('article_list', 'GET', '/articles/')
+
+    async def article_read(self) -> None:
+        await self.request('article_read', 'GET', f'/articles/{self.dataset.hot_article(self.rng)}')
+
+    async def comment_read(self) -> None:
+        await self.request('comment_read', 'GET', f'/comments/{self.dataset.hot_article(self.rng)}')
+
+    async def comment_write(self) -> None:
+        await self.request(
+            'comment_write', 'POST', '/comments/create', headers=self.headers,
+            json={'content': f'Comment from client {self.number}', 'article_id': self.dataset.hot_article(self.rng)},
+        )
+
+    async def register(self) -> None:
+        self.registered += 1
+        await self.request(
+            'register', 'POST', '/auth/register',
+            json={'email': f'{self.dataset.prefix}_new_{self.number}_{self.registered}@example.com',
+                  'password': PASSWORD, 'full_name': f'New user {self.number}'},
+        )
+
+    async def run(self, deadline: float) -> None:
+        await self.login()
+        operations = list(MIX)
+        cum_weights = list(itertools.accumulate(MIX.values()))
+        while time.perf_counter() < deadline:
+            operation = self.rng.choices(operations, cum_weights=cum_weights)[0]
+            await getattr(self, operation)()
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def summarize(results: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for operation, (latencies, errors) in results.items():
+        if not latencies:
+            continue
+        endpoints[operation] = {
+            'requests': len(latencies),
+            'errors': len(errors),
+            'rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'max_ms': round(max(latencies), 3),
+        }
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    return {
+        'seconds': round(elapsed, 3),
+        'requests': total,
+        'errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+        'rps': round(total / elapsed, 1),
+        'endpoints': endpoints,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run(args) -> dict:
+    from backend.db.session import engine
+
+    dataset = await seed(engine, args.users, args.articles, args.comments, args.seed)
+    results = {operation: ([], []) for operation in MIX}
+    tokens: list[str] = []
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+
+    try:
+        async with AsyncExitStack() as stack:
+            if args.url:
+                http = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+            else:
+                from aiosmtpd.controller import Controller
+
+                from backend.benchmarks.email_pipeline import (SinkHandler,
+                                                               configure_mail,
+                                                               free_port)
+                from backend.main import (app,
+                                          lifespan)
+
+                # Регистрации отправляют письма настоящей задачей, но в локальный приемник
+                controller = Controller(SinkHandler(latency=0), hostname='127.0.0.1', port=free_port())
+                controller.start()
+                stack.callback(controller.stop)
+                configure_mail(controller.port)
+                await stack.enter_async_context(lifespan(app))
+                transport = httpx.ASGITransport(app=app)
+                http = httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=args.timeout)
+            await stack.enter_async_context(http)
+
+            clients = [Client(http, dataset, number, results, tokens) for number in range(args.clients)]
+            started = time.perf_counter()
+            await asyncio.gather(*(client.run(started + args.duration) for client in clients))
+            elapsed = time.perf_counter() - started
+    finally:
+        await cleanup(engine, dataset, tokens)
+        await engine.dispose()
+
+    return {
+        'revision': git_revision(),
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'target': args.url or 'asgi',
+        'clients': args.clients,
+        'dataset': {'users': args.users, 'articles': args.articles, 'comments': args.comments},
+        'mix': MIX,
+        **summarize(results, elapsed),
+    }
+
+
+def print_report(result: dict, baseline: Optional[dict] = None) -> None:
+    print(f'{result["requests"]} requests in {result["seconds"]} s, '
+          f'{result["rps"]} req/s, errors: {result["errors"]}')
+    print(f'{"endpoint":>14} {"requests":>9} {"errors":>7} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for operation, stats in result['endpoints'].items():
+        print(f'{operation:>14} {stats["requests"]:>9} {stats["errors"]:>7} {stats["rps"]:>8} '
+              f'{stats["p50_ms"]:>8} {stats["p95_ms"]:>8} {stats["p99_ms"]:>8}')
+
+    if baseline is None:
+        return
+    print(f'\nChange against {baseline.get("revision")} (negative latency change is better)')
+    print(f'{"endpoint":>14} {"req/s":>8} {"p50":>8} {"p99":>8}')
+    for operation, stats in result['endpoints'].items():
+        base = baseline['endpoints'].get(operation)
+        if base is None:
+            continue
+        changes = [
+            f'{(stats[key] - base[key]) / base[key] * 100:+.1f}%' if base[key] else '-'
+            for key in ('rps', 'p50_ms', 'p99_ms')
+        ]
+        print(f'{operation:>14} {changes[0]:>8} {changes[1]:>8} {changes[2]:>8}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Нагрузочный тест API')
+    parser.add_argument('--url', help='Адрес запущенного сервера; без него запросы идут через ASGI')
+    parser.add_argument('--clients', type=int, default=20, help='Одновременных клиентов')
+    parser.add_argument('--duration', type=float, default=20, help='Длительность, сек')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--articles', type=int, default=100)
+    parser.add_argument('--comments', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1, help='Зерно генератора данных')
+    parser.add_argument('--timeout', type=float, default=30, help='Таймаут запроса, сек')
+    parser.add_argument('--json', help='Сохранить результат в файл')
+    parser.add_argument('--compare', help='Файл результата для сравнения (--json другой ветки)')
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    result = await run(args)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(result, baseline)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""Задержки цикла событий при интенсивном логировании.
+
+Несколько корутин пишут в логгер с ротируемым файловым обработчиком,
+отдельная корутина каждую миллисекунду измеряет, на сколько позже
+запланированного она просыпается (задержка цикла событий).
+
+Режимы:
+    direct  - обработчик на логгере, запись в файл в потоке цикла событий
+    queue   - LogQueue: в цикле только постановка в очередь, запись в фоновом потоке
+
+--write-delay имитирует медленный диск (мс на запись, например сетевой том).
+
+Пример:
+    python -m backend.benchmarks.logging_stalls --records 20000 --write-delay 0.05
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from backend.core.log_queue import LogQueue
+
+
+class SlowFileHandler(RotatingFileHandler):
+    def __init__(self, *args, write_delay: float = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_delay = write_delay
+
+    def emit(self, record):
+        super().emit(record)
+        if self.write_delay:
+            time.sleep(self.write_delay)
+
+
+async def monitor(stop: asyncio.Event, lags: list[float], interval: float = 0.001) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append((loop.time() - started - interval) * 1000)
+
+
+async def writer(logger: logging.Logger, records: int) -> None:
+    for i in range(records):
+        logger.info('Article created id=%s', i)
+        if i % 10 == 0:
+            await asyncio.sleep(0)
+
+
+async def run(mode: str, records: int, writers: int, write_delay: float, queue_size: int) -> dict:
+    logger = logging.getLogger(f'bench_{mode}')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers.clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = SlowFileHandler(
+            Path(tmp) / 'bench.log', maxBytes=10 * 1024 * 1024, backupCount=2, write_delay=write_delay / 1000
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        logger.addHandler(handler)
+
+        log_queue = None
+        if mode == 'queue':
+            log_queue = LogQueue([logger.name], queue_size)
+            log_queue.start()
+
+        stop = asyncio.Event()
+        lags: list[float] = []
+        monitor_task = asyncio.create_task(monitor(stop, lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(logger, records // writers) for _ in range(writers)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor_task
+
+        dropped = 0
+        if log_queue is not None:
+            dropped = log_queue.dropped
+            log_queue.stop()
+        handler.close()
+
+    lags.sort()
+    return {
+        'mode': mode,
+        'records_per_s': round(records / elapsed),
+        'lag_p50_ms': round(statistics.median(lags), 3),
+        'lag_p99_ms': round(lags[int(len(lags) * 0.99) - 1], 3),
+        'lag_max_ms': round(lags[-1], 3),
+        'dropped': dropped,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Задержки цикла событий при логировании')
+    parser.add_argument('--modes', nargs='+', choices=['direct', 'queue'], default=['direct', 'queue'])
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--writers', type=int, default=10)
+    parser.add_argument('--write-delay', type=float, default=0.0, help='Искусственная задержка записи, мс')
+    parser.add_argument('--queue-size', type=int, default=10000)
+    parser.add_argument('--json', help='Сохранить результаты в файл')
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    results = []
+    print(f'{"mode":>7} {"records/s":>10} {"lag p50":>8} {"lag p99":>8} {"lag max":>8} {"dropped":>8}')
+    for mode in args.modes:
+        result = await run(mode, args.records, args.writers, args.write_delay, args.queue_size)
+        results.append(result)
+        print(f'{mode:>7} {result["records_per_s"]:>10} {result["lag_p50_ms"]:>8} '
+              f'{result["lag_p99_ms"]:>8} {result["lag_max_ms"]:>8} {result["dropped"]:>8}')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""Сериализация списков: стандартный путь FastAPI против orjson и
+ответа из строк БД без моделей (TrustedResponse).
+
+Варианты (одинаковый список статей, без обращения к БД):
+    default      - модели с валидацией, JSONResponse (json.dumps), повторная
+                   валидация по response_model (как было в приложении)
+    orjson       - то же, но ORJSONResponse
+    construct    - model_construct + TypeAdapter.dump_json
+    trusted      - строки сразу в orjson (TrustedResponse)
+
+Пример:
+    python -m backend.benchmarks.responses --rows 10 100 1000 --iterations 200
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import (datetime,
+                      timedelta)
+from pathlib import Path
+from typing import List
+
+import httpx
+from fastapi import (FastAPI,
+                     Response)
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.core.responses import (default_response_class,
+                                    TrustedResponse)
+from backend.schemas.article import ArticleResponse
+
+
+VARIANTS = ['default', 'orjson', 'construct', 'trusted']
+
+
+def make_rows(count: int) -> list[dict]:
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    return [
+        {
+            'id': i,
+            'title': f'Статья номер {i}',
+            'content': 'Текст статьи, который обрезается в списке до 48 символов...',
+            'author_name': f'Автор {i % 50}',
+            'created_at': created_at + timedelta(minutes=i),
+            'updated_at': None,
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(variant: str, rows: list[dict]) -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse if variant == 'default' else default_response_class)
+    adapter = TypeAdapter(List[ArticleResponse])
+
+    @app.get('/articles', response_model=List[ArticleResponse])
+    async def articles():
+        if variant == 'trusted':
+            return TrustedResponse(rows)
+        if variant == 'construct':
+            content = adapter.dump_json([ArticleResponse.model_construct(**row) for row in rows])
+            return Response(content, media_type='application/json')
+        return [ArticleResponse(**row) for row in rows]
+
+    return app
+
+
+async def run(variant: str, rows_count: int, iterations: int) -> dict:
+    app = build_app(variant, make_rows(rows_count))
+    latencies = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        body = (await client.get('/articles')).content
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = await client.get('/articles')
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+
+    latencies.sort()
+    return {
+        'variant': variant,
+        'rows': rows_count,
+        'bytes': len(body),
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1], 3),
+        'rps': round(iterations / (sum(latencies) / 1000), 1),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Сериализация списков в ответах API')
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=VARIANTS)
+    parser.add_argument('--rows', nargs='+', type=int, default=[10, 100, 1000])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--json', help='Сохранить результаты в файл')
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    results = []
+    print(f'{"variant":>9} {"rows":>6} {"rps":>9} {"p50 ms":>8} {"p99 ms":>8}')
+    for rows_count in args.rows:
+        for variant in args.variants:
+            result = await run(variant, rows_count, args.iterations)
+            results.append(result)
+            print(f'{variant:>9} {rows_count:>6} {result["rps"]:>9} {result["p50_ms"]:>8} {result["p99_ms"]:>8}')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -11,7 +11,7 @@ from sqlalchemy import text
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.security import get_password_hash
-from backend.core.config import PATTERN_LITE, PATTERN_EMAIL
+from backend.core.config import PATTERN_LITE, PATTERN_EMAIL, OPENAPI_DIR, SQLALCHEMY_DATABASE_URL
 from backend.crud.user import get_user
 from backend.db.session import get_db
 from backend.db.models import User
@@ -33,6 +33,25 @@ def parse_args():
     create_superuser.add_argument('--fullname', help='Full name')
     create_superuser.add_argument('--noinput', action='store_true', help='request')
 
+    build_openapi = subparser.add_parser(
+        'buildopenapi',
+        help='Сборка схемы OpenAPI в файл'
+    )
+    build_openapi.add_argument('--output', default=str(OPENAPI_DIR), help='Каталог для файлов схемы')
+
+    seed = subparser.add_parser(
+        'seed',
+        help='Заполнение БД синтетическими пользователями, статьями и комментариями'
+    )
+    seed.add_argument('--users', type=int, default=10_000, help='Количество пользователей')
+    seed.add_argument('--articles', type=int, default=100_000, help='Количество статей')
+    seed.add_argument('--comments', type=int, default=1_000_000, help='Количество комментариев')
+    seed.add_argument('--password', default='Seed12345', help='Пароль всех пользователей')
+    seed.add_argument('--days', type=int, default=365, help='Даты создания за последние N дней')
+    seed.add_argument('--random-seed', type=int, help='Зерно генератора для повторяемых данных')
+    seed.add_argument('--keep-indexes', action='store_true',
+                      help='Не пересоздавать индексы и внешние ключи (таблицы не блокируются, загрузка медленнее)')
+
     return parser.parse_args()
 
 
@@ -110,11 +129,41 @@ async def create_superuser_in_db(email: str, password: str, fullname: str) -> bo
     )
     async for db in get_db():
         db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
     return True
 
 
+def build_openapi_schema(output: str) -> None:
+    """Сборка схемы OpenAPI и ее сжатых копий для core/openapi.py"""
+    # Приложение импортируется только для этой команды
+    from backend.core.openapi import build_openapi
+    from backend.main import app
+
+    for path in build_openapi(app, Path(output)):
+        print(f'{path} ({path.stat().st_size} bytes)')
+
+
+async def seed_database(args) -> None:
+    """Загрузка синтетических данных через COPY (db/seed.py)"""
+    from backend.db.seed import seed
+
+    # Хэш считается один раз на всех пользователей
+    hashed_password = get_password_hash(args.password)
+    conn = await asyncpg.connect(SQLALCHEMY_DATABASE_URL.replace('postgresql+asyncpg', 'postgresql', 1))
+    try:
+        results = await seed(
+            conn, hashed_password, args.users, args.articles, args.comments,
+            days=args.days, random_seed=args.random_seed, keep_indexes=args.keep_indexes,
+        )
+    finally:
+        await conn.close()
+
+    indexes = results.pop('indexes')
+    for table, stats in results.items():
+        print(f"{table:<9} {stats['rows']:>10} rows {stats['seconds']:>8} s {stats['rows_per_sec']:>10} rows/s")
+    print(f"indexes and foreign keys rebuilt in {indexes['seconds']} s")
+    print(f'Пароль пользователей: {args.password}')
+
+
 async def execute_from_command_line():
     """Точка входа для выполнения команд"""
     args = parse_args()
@@ -144,9 +193,15 @@ async def execute_from_command_line():
             print(f"Email: {email}")
             print(f"Password: {'*' * len(password)}")
 
+    elif args.command == 'buildopenapi':
+        build_openapi_schema(args.output)
+
+    elif args.command == 'seed':
+        await seed_database(args)
+
     else:
         print(f"Неизвестная команда: {args.command}")
-        print("Доступные команды: createsuperuser")
+        print("Доступные команды: createsuperuser, buildopenapi, seed")
 
 
 async def main():
@@ -0,0 +1,188 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import (Headers,
+                                      MutableHeaders)
+from starlette.types import (ASGIApp,
+                             Message,
+                             Receive,
+                             Scope,
+                             Send)
+
+from backend.core.config import (COMPRESSION_MIN_SIZE,
+                                 COMPRESSION_GZIP_LEVEL,
+                                 COMPRESSION_BROTLI_QUALITY,
+                                 COMPRESSION_CACHE_SIZE)
+from backend.core.metrics import (COMPRESSION_CACHE_HITS,
+                                  COMPRESSION_CACHE_MISSES)
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен, без него остается только gzip
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'text/',
+)
+
+
+def parse_qvalues(value: str) -> dict[str, float]:
+    encodings = {}
+    for item in value.split(','):
+        name, *params = item.strip().split(';')
+        quality = 1.0
+        for param in params:
+            key, _, number = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+# Порядок - предпочтение сервера, когда у кодировок одинаковый q
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding: str, available: tuple[str, ...] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """Кодировка из available с наибольшим q клиента (None - без сжатия)"""
+    encodings = parse_qvalues(accept_encoding)
+    wildcard = encodings.get('*', 0)
+    chosen, chosen_quality = None, 0.0
+    for encoding in available:
+        quality = encodings.get(encoding, wildcard)
+        if quality > chosen_quality:
+            chosen, chosen_quality = encoding, quality
+    return chosen
+
+
+class CompressedCache:
+    """LRU сжатых тел ответов: ключ - хеш тела и кодировка.
+
+    Одинаковые ответы (популярные статьи, списки) сжимаются один раз,
+    дальше считается только хеш тела, он на порядок дешевле сжатия.
+    """
+
+    # Большие тела не кешируются, чтобы кеш не вытеснял все остальное
+    max_item_size = 1024 * 1024
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+
+    def get(self, key: tuple[bytes, str]) -> Optional[bytes]:
+        body = self._items.get(key)
+        if body is None:
+            self.misses += 1
+            COMPRESSION_CACHE_MISSES.inc()
+            return None
+        self.hits += 1
+        COMPRESSION_CACHE_HITS.inc()
+        self._items.move_to_end(key)
+        return body
+
+    def set(self, key: tuple[bytes, str], body: bytes) -> None:
+        if self.maxsize <= 0 or len(body) > self.max_item_size:
+            return
+        self._items[key] = body
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """Сжатие ответов gzip или brotli по заголовку Accept-Encoding.
+
+    Сжимаются ответы текстовых типов не меньше minimum_size байт, отданные
+    одним сообщением. Ответы с Content-Encoding и потоковые ответы
+    передаются без изменений. Уровни сжатия по умолчанию подобраны под
+    задержку, а не под максимальную степень сжатия.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = COMPRESSION_MIN_SIZE,
+            gzip_level: int = COMPRESSION_GZIP_LEVEL,
+            brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+            cache_size: int = COMPRESSION_CACHE_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = CompressedCache(cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message['type'] == 'http.response.start':
+                headers = Headers(raw=message['headers'])
+                if not self.is_compressible(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                MutableHeaders(scope=message).add_vary_header('Accept-Encoding')
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if passthrough or message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            if message.get('more_body', False) or len(body) < self.minimum_size:
+                # Потоковый или маленький ответ отдается как есть
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self.compress(body, encoding)
+            headers = MutableHeaders(scope=start_message)
+            headers['Content-Encoding'] = encoding
+            headers['Content-Length'] = str(len(compressed))
+            await send(start_message)
+            await send({'type': 'http.response.body', 'body': compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def is_compressible(headers: Headers) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        content_type = headers.get('content-type', '')
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            if encoding == 'br':
+                compressed = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+            self.cache.set(key, compressed)
+        return compressed
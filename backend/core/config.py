@@ -1,9 +1,13 @@
+import atexit
+import logging
 import os
 from logging.config import dictConfig
 from pathlib import Path
 from dotenv import load_dotenv
 
-from fastapi_mail import ConnectionConfig
+from backend.core.log_format import (RateLimitFilter,
+                                     RequestContextFilter)
+from backend.core.log_queue import LogQueue
 
 load_dotenv()
 
@@ -17,8 +21,16 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 # urls config
 
-HOST = '0.0.0.0'
-PORT = 8080
+HOST = os.getenv('HOST', '0.0.0.0')
+PORT = int(os.getenv('PORT', '8080'))
+
+# Production-запуск (python -m backend.server): число процессов, очередь
+# входящих соединений и сколько секунд процесс дожидается текущих запросов
+# после SIGTERM. Пул БД (DB_POOL_SIZE) у каждого процесса свой
+
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', str(os.cpu_count() or 1)))
+WEB_BACKLOG = int(os.getenv('WEB_BACKLOG', '2048'))
+WEB_GRACEFUL_TIMEOUT = float(os.getenv('WEB_GRACEFUL_TIMEOUT', '20'))
 
 # Укажите URL вашей базы данных PostgreSQL
 
@@ -29,20 +41,149 @@ DB_HOST = os.getenv('DB_HOST', 'localhost')
 
 SQLALCHEMY_DATABASE_URL = f'postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_HOST}/{POSTGRES_DB}'
 
-# Конфигурация email
-
-CONF = ConnectionConfig(
-    MAIL_USERNAME=os.getenv('MAIL_USERNAME', 'test@example.com'),
-    MAIL_PASSWORD=os.getenv('MAIL_PASSWORD', 'test_password'),
-    MAIL_FROM=os.getenv('MAIL_USERNAME', 'test@example.com'),
-    MAIL_PORT=465,
-    MAIL_SERVER='smtp.mail.ru',
-    MAIL_STARTTLS=False,
-    MAIL_SSL_TLS=True,
-    MAIL_FROM_NAME='Articles app',
-    TEMPLATE_FOLDER=(BASE_DIR / 'fast_api_email/templates'),
-    SUPPRESS_SEND=os.getenv('SUPPRESS_SEND', '1') == '1'
+# Реплика для чтения (необязательно). Без DB_REPLICA_HOST все запросы идут в основную БД
+
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+SQLALCHEMY_REPLICA_URL = (
+    f'postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_REPLICA_HOST}/{POSTGRES_DB}'
+    if DB_REPLICA_HOST else None
 )
+# Сколько секунд после записи чтения пользователя идут в основную БД
+DB_REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', '5'))
+# Максимально допустимое отставание реплики и период его проверки, сек
+DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '2'))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '1'))
+
+# Режим подключения: direct - напрямую к Postgres, pgbouncer - через PgBouncer
+# в режиме transaction. В режиме pgbouncer имена подготовленных выражений
+# уникальны, а их кеш по умолчанию выключен. Для PgBouncer 1.21+ с
+# max_prepared_statements кеш можно включить через DB_STATEMENT_CACHE_SIZE
+
+DB_CONNECTION_MODE = os.getenv('DB_CONNECTION_MODE', 'direct')
+DB_STATEMENT_CACHE_SIZE = int(os.getenv(
+    'DB_STATEMENT_CACHE_SIZE', '0' if DB_CONNECTION_MODE == 'pgbouncer' else '100'
+))
+# Не держать пул в приложении: соединения пулит PgBouncer
+DB_PGBOUNCER_NULLPOOL = os.getenv('DB_PGBOUNCER_NULLPOOL', '0') == '1'
+
+# Часовой пояс сессий БД. Колонки DateTime хранят время без зоны, а
+# func.now() пишет его в поясе сессии, поэтому пояс задается при
+# подключении, и в нем же читаются значения без зоны (msgpack Timestamp)
+DB_TIMEZONE = os.getenv('DB_TIMEZONE', 'UTC')
+
+# Пул соединений (на один процесс). Подбор размеров - см. README, раздел "Пул соединений"
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '5'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+DB_POOL_USE_LIFO = os.getenv('DB_POOL_USE_LIFO', '1') == '1'
+
+# Прогрев при запуске: сколько соединений пула открыть заранее (0 - не
+# прогревать БД), сколько секунд ждать прогрева БД и сколько секунд может
+# выполняться одно выражение прогрева (statement_timeout)
+
+WARMUP_DB_CONNECTIONS = int(os.getenv('WARMUP_DB_CONNECTIONS', '2'))
+WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', '10'))
+WARMUP_STATEMENT_TIMEOUT = float(os.getenv('WARMUP_STATEMENT_TIMEOUT', '0.5'))
+
+# Выражения дольше DB_SLOW_QUERY_MS пишутся в лог (параметры скрыты).
+# SERVER_TIMING=0 отключает заголовок Server-Timing с временем запросов к БД
+
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '200'))
+SERVER_TIMING = os.getenv('SERVER_TIMING', '1') == '1'
+
+# Сжатие ответов: минимальный размер тела в байтах, уровни gzip (1-9) и
+# brotli (0-11), число сжатых тел в кеше процесса (0 - без кеша)
+
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '5'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+COMPRESSION_CACHE_SIZE = int(os.getenv('COMPRESSION_CACHE_SIZE', '256'))
+
+# /health/ready: таймаут проверок БД и брокера, сколько секунд хранить их
+# результат и при какой доле занятых соединений пула (дольше
+# HEALTH_POOL_SATURATION_SECONDS) процесс перестает быть готовым
+
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '1'))
+HEALTH_CACHE_SECONDS = float(os.getenv('HEALTH_CACHE_SECONDS', '2'))
+HEALTH_POOL_SATURATION = float(os.getenv('HEALTH_POOL_SATURATION', '0.9'))
+HEALTH_POOL_SATURATION_SECONDS = float(os.getenv('HEALTH_POOL_SATURATION_SECONDS', '5'))
+
+# Метрики Prometheus (/metrics). python -m backend.server собирает метрики
+# всех процессов через файлы в METRICS_DIR (очищается при запуске).
+# Хэширование паролей argon2 в API выполняется в пуле из
+# PASSWORD_HASH_WORKERS потоков
+
+METRICS_DIR = Path(os.getenv('PROMETHEUS_MULTIPROC_DIR', str(BASE_DIR / 'metrics')))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(min(os.cpu_count() or 1, 4))))
+
+# Каталог собранной схемы OpenAPI (команда buildopenapi)
+
+OPENAPI_DIR = Path(os.getenv('OPENAPI_DIR', str(BASE_DIR / 'openapi')))
+
+# Конфигурация email. CONF создается при первом обращении (см. __getattr__
+# в конце модуля): fastapi_mail импортируется дольше, чем весь остальной
+# config, а командам и большинству запросов почта не нужна
+
+MAIL_USERNAME = os.getenv('MAIL_USERNAME', 'test@example.com')
+MAIL_PASSWORD = os.getenv('MAIL_PASSWORD', 'test_password')
+SUPPRESS_SEND = os.getenv('SUPPRESS_SEND', '1') == '1'
+MAIL_TIMEOUT = int(os.getenv('MAIL_TIMEOUT', '10'))
+
+
+def create_mail_config():
+    from fastapi_mail import ConnectionConfig
+
+    return ConnectionConfig(
+        MAIL_USERNAME=MAIL_USERNAME,
+        MAIL_PASSWORD=MAIL_PASSWORD,
+        MAIL_FROM=MAIL_USERNAME,
+        MAIL_PORT=465,
+        MAIL_SERVER='smtp.mail.ru',
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=True,
+        MAIL_FROM_NAME='Articles app',
+        TEMPLATE_FOLDER=(BASE_DIR / 'fast_api_email/templates'),
+        SUPPRESS_SEND=SUPPRESS_SEND,
+        TIMEOUT=MAIL_TIMEOUT
+    )
+
+# Ссылка подтверждения регистрации: срок жизни, минимальный интервал между
+# письмами одному пользователю и минимальный остаток срока для повторной отправки
+
+CONF_LINK_EXPIRE_HOURS = int(os.getenv('CONF_LINK_EXPIRE_HOURS', '1'))
+CONF_LINK_RESEND_INTERVAL = int(os.getenv('CONF_LINK_RESEND_INTERVAL', '60'))
+CONF_LINK_REUSE_MIN_TTL = int(os.getenv('CONF_LINK_REUSE_MIN_TTL', '600'))
+
+# Circuit breaker SMTP: после MAIL_BREAKER_FAILURES ошибок подряд письма
+# не отправляются MAIL_BREAKER_RESET_TIMEOUT секунд, затем пробный вызов
+
+MAIL_BREAKER_FAILURES = int(os.getenv('MAIL_BREAKER_FAILURES', '5'))
+MAIL_BREAKER_RESET_TIMEOUT = float(os.getenv('MAIL_BREAKER_RESET_TIMEOUT', '30'))
+
+# Фоновые задачи: celery (нужен REDIS_URL) или local (пул asyncio внутри процесса)
+
+REDIS_URL = os.getenv('REDIS_URL')
+TASK_BACKEND = os.getenv('TASK_BACKEND', 'celery' if REDIS_URL else 'local')
+TASK_WORKERS = int(os.getenv('TASK_WORKERS', '4'))
+TASK_QUEUE_SIZE = int(os.getenv('TASK_QUEUE_SIZE', '1000'))
+TASK_QUEUE_FILE = os.getenv('TASK_QUEUE_FILE', str(BASE_DIR / 'data' / 'task_queue.jsonl'))
+TASK_DRAIN_TIMEOUT = float(os.getenv('TASK_DRAIN_TIMEOUT', '10'))
+TASK_MAX_RETRIES = int(os.getenv('TASK_MAX_RETRIES', '8'))
+TASK_RETRY_BASE_DELAY = float(os.getenv('TASK_RETRY_BASE_DELAY', '2'))
+TASK_RETRY_MAX_DELAY = float(os.getenv('TASK_RETRY_MAX_DELAY', '300'))
+
+# Воркер Celery
+
+CELERY_POOL = os.getenv('CELERY_POOL', 'gevent')
+CELERY_AUTOSCALE_MAX = int(os.getenv('CELERY_AUTOSCALE_MAX', '100'))
+CELERY_AUTOSCALE_MIN = int(os.getenv('CELERY_AUTOSCALE_MIN', '10'))
+CELERY_WORKER_QUEUES = os.getenv('CELERY_WORKER_QUEUES', 'high,low')
+CELERY_PREFETCH_MULTIPLIER = int(os.getenv('CELERY_PREFETCH_MULTIPLIER', '1'))
+# Через сколько секунд Redis вернет в очередь неподтвержденную задачу (acks_late)
+CELERY_VISIBILITY_TIMEOUT = int(os.getenv('CELERY_VISIBILITY_TIMEOUT', '3600'))
 
 # Настройки сложности пароля
 
@@ -50,6 +191,15 @@ PATTERN_FULL = r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%#?&])[A-Za-z\d@$!%#?&]
 PATTERN_LITE = r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)[A-Za-z\d]{8,}$'
 PATTERN_EMAIL = r'[1-9a-zA-Z._%+-]+@[a-zA-Z]+\.[a-zA-Z]{2,}$'
 
+# Формат логов: text - строки для чтения глазами, json - одна запись JSON на
+# строку с полями запроса (request_id, route, user_id, duration_ms, db_queries).
+# Одинаковые предупреждения file_logger ('Article not found') пишутся не чаще
+# LOG_RATE_LIMIT раз за LOG_RATE_LIMIT_INTERVAL секунд (0 - без ограничения)
+
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+LOG_RATE_LIMIT = int(os.getenv('LOG_RATE_LIMIT', '10'))
+LOG_RATE_LIMIT_INTERVAL = float(os.getenv('LOG_RATE_LIMIT_INTERVAL', '60'))
+
 logs_dir = os.path.join(BASE_DIR, 'logs')
 os.makedirs(logs_dir, exist_ok=True)
 
@@ -60,18 +210,21 @@ logging_config = {
             'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             'datefmt': '%Y-%m-%d %H:%M:%S'
         },
+        'json': {
+            '()': 'backend.core.log_format.JsonFormatter',
+        },
     },
     'handlers': {
         'console': {
             'level': os.getenv('LOG_LEVEL_STREAM', 'DEBUG'),
             'class': 'logging.StreamHandler',
-            'formatter': 'standard',
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'standard',
             'stream': 'ext://sys.stdout'
         },
         'file': {
             'level': os.getenv('LOG_LEVEL_FILE', 'INFO'),
             'class': 'logging.handlers.RotatingFileHandler',
-            'formatter': 'standard',
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'standard',
             'filename': str(BASE_DIR / 'logs' / 'articles_app.log'),
             'maxBytes': 10485760,  # 10 MB
             'backupCount': 5,
@@ -97,3 +250,25 @@ logging_config = {
 }
 
 dictConfig(logging_config)
+
+# Запись логов в фоновом потоке: логгеры только кладут записи в очередь
+# размером LOG_QUEUE_SIZE, при переполнении записи отбрасываются и считаются
+
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+log_queue = LogQueue(['console_logger', 'file_logger', ''], LOG_QUEUE_SIZE)
+# Фильтры работают в потоке вызова логгера: контекст запроса еще доступен,
+# а отброшенные записи не форматируются и не занимают очередь
+for queue_handler in log_queue.handlers:
+    queue_handler.addFilter(RequestContextFilter())
+logging.getLogger('file_logger').addFilter(RateLimitFilter(LOG_RATE_LIMIT, LOG_RATE_LIMIT_INTERVAL))
+log_queue.start()
+atexit.register(log_queue.stop)
+
+
+def __getattr__(name: str):
+    # Ленивые настройки модуля: создаются при первом обращении и сохраняются
+    if name == 'CONF':
+        globals()['CONF'] = create_mail_config()
+        return globals()['CONF']
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,99 @@
+from contextvars import ContextVar
+from datetime import (date,
+                      datetime)
+from typing import (Any,
+                    Callable)
+from zoneinfo import ZoneInfo
+
+import msgpack
+from fastapi import (Request,
+                     Response)
+from fastapi.routing import APIRoute
+
+from backend.core.compression import parse_qvalues
+from backend.core.config import DB_TIMEZONE
+from backend.core.log_format import set_log_context
+
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+DB_TZINFO = ZoneInfo(DB_TIMEZONE)
+
+# Формат ответа текущего запроса: json или msgpack
+response_format: ContextVar[str] = ContextVar('response_format', default='json')
+
+
+def wants_msgpack(accept: str) -> bool:
+    qvalues = parse_qvalues(accept)
+    msgpack_quality = max(qvalues.get(media_type, 0) for media_type in MSGPACK_TYPES)
+    return msgpack_quality > 0 and msgpack_quality >= qvalues.get('application/json', 0)
+
+
+def is_msgpack(content_type: str) -> bool:
+    return content_type.split(';')[0].strip().lower() in MSGPACK_TYPES
+
+
+def encode_default(obj: Any) -> Any:
+    # Дата и время - расширение Timestamp (6-10 байт вместо ISO-строки).
+    # Время в БД хранится без зоны, в поясе сессии DB_TIMEZONE
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=DB_TZINFO)
+        return msgpack.Timestamp.from_datetime(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not msgpack serializable')
+
+
+def packb(content: Any) -> bytes:
+    return msgpack.packb(content, default=encode_default, use_bin_type=True, datetime=False)
+
+
+def unpackb(body: bytes) -> Any:
+    return msgpack.unpackb(body, timestamp=3)
+
+
+class MsgPackRequest(Request):
+    """Запрос с телом в MessagePack.
+
+    FastAPI разбирает тело через request.json() только для JSON, поэтому
+    заголовок Content-Type подменяется, а json() декодирует msgpack.
+    """
+
+    def __init__(self, scope, receive):
+        headers = [
+            (name, b'application/json' if name == b'content-type' else value)
+            for name, value in scope['headers']
+        ]
+        super().__init__({**scope, 'headers': headers}, receive)
+
+    async def json(self) -> Any:
+        if not hasattr(self, '_json'):
+            self._json = unpackb(await self.body())
+        return self._json
+
+
+class MsgPackRoute(APIRoute):
+    """Маршрут с поддержкой MessagePack по заголовкам Accept и Content-Type.
+
+    Схемы ответов общие с JSON: меняется только кодирование ответа
+    (см. NegotiatedResponse).
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get('content-type', '')):
+                request = MsgPackRequest(request.scope, request.receive)
+
+            set_log_context(route=self.path)
+            token = response_format.set('msgpack' if wants_msgpack(request.headers.get('accept', '')) else 'json')
+            try:
+                response = await original_route_handler(request)
+            finally:
+                response_format.reset(token)
+            response.headers.add_vary_header('Accept')
+            return response
+
+        return route_handler
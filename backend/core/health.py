@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import (Awaitable,
+                    Callable,
+                    Optional)
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.core.config import (REDIS_URL,
+                                 TASK_BACKEND,
+                                 HEALTH_CHECK_TIMEOUT,
+                                 HEALTH_CACHE_SECONDS,
+                                 HEALTH_POOL_SATURATION,
+                                 HEALTH_POOL_SATURATION_SECONDS)
+from backend.core.throttle import CachedCheck
+
+logger_file = logging.getLogger('file_logger')
+
+
+class SaturationTracker:
+    """Пул считается перегруженным, если занят выше threshold дольше window секунд.
+
+    Короткие всплески нагрузки готовность не снимают.
+    """
+
+    def __init__(self, threshold: float, window: float):
+        self.threshold = threshold
+        self.window = window
+        self.since: Optional[float] = None
+
+    def update(self, saturation: float, now: float) -> bool:
+        if saturation < self.threshold:
+            self.since = None
+            return False
+        if self.since is None:
+            self.since = now
+        return now - self.since >= self.window
+
+
+def pool_saturation(engine: AsyncEngine) -> Optional[float]:
+    # Доля занятых соединений от максимума пула (None - пула в приложении нет)
+    if not hasattr(engine.pool, 'snapshot'):
+        return None
+    snapshot = engine.pool.snapshot()
+    capacity = snapshot['size'] + max(snapshot['max_overflow'], 0)
+    return round(snapshot['checked_out'] / capacity, 3) if capacity else None
+
+
+async def check_database(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+
+
+@lru_cache
+def get_redis_client(url: str, timeout: float):
+    # redis загружается только при проверке брокера Celery
+    from redis.asyncio import Redis
+
+    return Redis.from_url(url, socket_connect_timeout=timeout, socket_timeout=timeout)
+
+
+async def check_broker(url: str = REDIS_URL, timeout: float = HEALTH_CHECK_TIMEOUT) -> None:
+    await get_redis_client(url, timeout).ping()
+
+
+class HealthChecker:
+    """Проверки готовности процесса к приему запросов.
+
+    Доступность БД и брокера проверяется с таймаутом timeout и
+    кешируется на cache_seconds: частые запросы балансировщика не
+    нагружают БД. Загрузка пула проверяется при каждом запросе.
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            check_broker: Optional[Callable[[], Awaitable]] = None,
+            timeout: float = HEALTH_CHECK_TIMEOUT,
+            cache_seconds: float = HEALTH_CACHE_SECONDS,
+            saturation_threshold: float = HEALTH_POOL_SATURATION,
+            saturation_window: float = HEALTH_POOL_SATURATION_SECONDS,
+    ):
+        self.engine = engine
+        self.checks: dict[str, Callable[[], Awaitable]] = {'database': lambda: check_database(engine)}
+        if check_broker is not None:
+            self.checks['broker'] = check_broker
+        self.timeout = timeout
+        self.saturation = SaturationTracker(saturation_threshold, saturation_window)
+        self._dependencies = CachedCheck(self.run_checks, cache_seconds)
+
+    async def run_check(self, name: str, check: Callable[[], Awaitable]) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+            status = 'ok'
+            error = None
+        except Exception as exc:
+            status = 'error'
+            error = repr(exc) if not isinstance(exc, asyncio.TimeoutError) else 'timeout'
+            logger_file.warning(f'Health check {name} failed: {error}')
+        result = {'status': status, 'duration_ms': round((time.perf_counter() - started) * 1000, 3)}
+        if error is not None:
+            result['error'] = error
+        return result
+
+    async def run_checks(self) -> dict:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self.run_check(name, self.checks[name]) for name in names))
+        return dict(zip(names, results))
+
+    async def dependencies(self) -> dict:
+        return await self._dependencies.get()
+
+    async def readiness(self) -> tuple[bool, dict]:
+        checks = dict(await self.dependencies())
+
+        saturation = pool_saturation(self.engine)
+        if saturation is not None:
+            saturated = self.saturation.update(saturation, time.monotonic())
+            checks['pool'] = {'status': 'saturated' if saturated else 'ok', 'saturation': saturation}
+
+        ready = all(check['status'] == 'ok' for check in checks.values())
+        return ready, checks
+
+
+def create_health_checker(engine: AsyncEngine) -> HealthChecker:
+    # Брокер проверяется, только если задачи отправляются в Celery
+    broker = check_broker if TASK_BACKEND == 'celery' and REDIS_URL else None
+    return HealthChecker(engine, broker)
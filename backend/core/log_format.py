@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from datetime import (datetime,
+                      timezone)
+from typing import Optional
+
+import orjson
+
+# Поля текущего запроса (request_id, method, route, user_id) для записей лога
+log_context: ContextVar[Optional[dict]] = ContextVar('log_context', default=None)
+
+# Стандартные атрибуты LogRecord, остальные атрибуты записи - поля из extra
+RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'log_route'}
+
+
+def set_log_context(**fields) -> None:
+    """Добавляет поля в контекст текущего запроса (вне запроса ничего не делает)"""
+    context = log_context.get()
+    if context is not None:
+        context.update(fields)
+
+
+class RequestContextFilter(logging.Filter):
+    """Копирует поля запроса в запись.
+
+    Запись форматируется в потоке очереди логов, где контекста запроса
+    уже нет, поэтому поля переносятся в запись в момент вызова логгера.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = log_context.get()
+        if context:
+            for key, value in context.items():
+                if not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Не больше rate одинаковых записей за interval секунд.
+
+    Одинаковыми считаются записи одного логгера, уровня и шаблона сообщения
+    ('Article not found'). Ошибки и критические записи не ограничиваются.
+    Первая запись после паузы сообщает, сколько похожих было пропущено.
+    """
+
+    max_keys = 10000
+
+    def __init__(self, rate: int, interval: float, max_level: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.interval = interval
+        self.max_level = max_level
+        self._windows: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno > self.max_level:
+            return True
+
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                if len(self._windows) >= self.max_keys:
+                    self._windows.clear()
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                    record.msg = f'{record.msg} [{suppressed} similar suppressed]'
+                return True
+            if window[1] < self.rate:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON с полями запроса и extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRS and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = record.stack_info
+        return orjson.dumps(data, default=str).decode()
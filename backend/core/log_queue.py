@@ -0,0 +1,145 @@
+import copy
+import logging
+import os
+import queue
+import weakref
+from logging.handlers import (QueueHandler,
+                              QueueListener)
+from typing import Iterable
+
+
+class LogQueueStats:
+    """Счетчик записей, не поместившихся в очередь логов"""
+
+    def __init__(self):
+        self.dropped = 0
+        self.reported = 0
+
+
+class RoutedQueueHandler(QueueHandler):
+    """Кладет запись в общую очередь с пометкой логгера-источника.
+
+    Очередь ограничена: при переполнении запись отбрасывается и
+    учитывается в stats.dropped, поток приложения не ждет запись на диск.
+    """
+
+    def __init__(self, log_queue: queue.Queue, route: str, stats: LogQueueStats):
+        super().__init__(log_queue)
+        self.route = route
+        self.stats = stats
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Как QueueHandler.prepare, но трассировка остается в exc_text, а не
+        # в тексте сообщения: JSON-формат пишет ее отдельным полем
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.log_route = self.route
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.stats.dropped += 1
+
+
+class RoutedQueueListener(QueueListener):
+    """Фоновый поток, который пишет записи в обработчики их логгера"""
+
+    def __init__(self, log_queue: queue.Queue, routes: dict[str, list[logging.Handler]], stats: LogQueueStats):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = routes
+        self.stats = stats
+
+    def enqueue_sentinel(self) -> None:
+        # Очередь может быть заполнена: остановка ждет места, а не падает
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        self.report_dropped(record.log_route)
+        for handler in self.routes.get(record.log_route, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def report_dropped(self, route: str) -> None:
+        dropped = self.stats.dropped
+        if dropped == self.stats.reported:
+            return
+        message = logging.makeLogRecord({
+            'name': 'log_queue',
+            'levelno': logging.WARNING,
+            'levelname': 'WARNING',
+            'msg': f'Log queue overflow, {dropped - self.stats.reported} record(s) dropped',
+        })
+        self.stats.reported = dropped
+        for handler in self.routes.get(route, ()):
+            handler.handle(message)
+
+
+class LogQueue:
+    """Перевод логгеров на очередь с фоновой записью.
+
+    Обработчики логгеров (консоль, ротируемый файл) переносятся в поток
+    RoutedQueueListener, сами логгеры только кладут записи в очередь.
+    В дочернем процессе после fork очередь и поток создаются заново.
+    """
+
+    def __init__(self, logger_names: Iterable[str], maxsize: int):
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.stats = LogQueueStats()
+        self.handlers: list[RoutedQueueHandler] = []
+        routes = {}
+        for name in logger_names:
+            logger = logging.getLogger(name or None)
+            routes[name] = list(logger.handlers)
+            for handler in routes[name]:
+                logger.removeHandler(handler)
+            queue_handler = RoutedQueueHandler(self.queue, name, self.stats)
+            logger.addHandler(queue_handler)
+            self.handlers.append(queue_handler)
+        self.listener = RoutedQueueListener(self.queue, routes, self.stats)
+        _live_queues.add(self)
+
+    @property
+    def dropped(self) -> int:
+        return self.stats.dropped
+
+    def start(self) -> None:
+        if self.listener._thread is None:
+            self.listener.start()
+
+    def stop(self) -> None:
+        # Дописывает оставшиеся в очереди записи
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _after_fork(self) -> None:
+        # Поток слушателя не переживает fork, а блокировки очереди могли
+        # остаться захваченными - у дочернего процесса своя очередь
+        running = self.listener._thread is not None
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.listener.queue = self.queue
+        self.listener._thread = None
+        for handler in self.handlers:
+            handler.queue = self.queue
+        if running:
+            self.start()
+
+
+# Очереди, которые нужно пересоздать в дочернем процессе. Обработчик fork
+# регистрируется один раз: register_at_fork не позволяет его снять
+_live_queues: 'weakref.WeakSet[LogQueue]' = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for log_queue in list(_live_queues):
+        log_queue._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
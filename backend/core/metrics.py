@@ -0,0 +1,174 @@
+"""Метрики Prometheus (отдаются на /metrics).
+
+В python -m backend.server у каждого процесса свои значения: они пишутся
+в файлы каталога PROMETHEUS_MULTIPROC_DIR, /metrics любого процесса
+суммирует их (MultiProcessCollector). multiprocess_mode задает, как
+объединяются значения Gauge разных процессов. Без переменной окружения
+(разработка, тесты) метрики хранятся в памяти процесса.
+"""
+import os
+import weakref
+from typing import Optional
+
+from prometheus_client import (CONTENT_TYPE_LATEST,
+                               REGISTRY,
+                               CollectorRegistry,
+                               Counter,
+                               Gauge,
+                               Histogram,
+                               generate_latest)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import Scope
+
+from backend.db.pool import PoolStats
+
+# Состояние circuit breaker: 0 - closed, 1 - open, 2 - half-open
+CIRCUIT_STATE = Gauge(
+    'circuit_breaker_state',
+    'Circuit breaker state (0 - closed, 1 - open, 2 - half-open)',
+    ['name'],
+    multiprocess_mode='max',
+)
+
+# Число запросов маршрута - http_request_duration_seconds_count
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request duration by route template and status',
+    ['method', 'route', 'status'],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out',
+    'Database connections checked out from the pool',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CAPACITY = Gauge(
+    'db_pool_capacity',
+    'Maximum database connections of the pool (pool_size + max_overflow)',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_WAIT = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent waiting for a free pool connection (only checkouts that waited)',
+    ['engine'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    'db_pool_timeouts',
+    'Pool checkouts that failed with a timeout',
+    ['engine'],
+)
+
+PASSWORD_HASH_QUEUE = Gauge(
+    'password_hash_queue_depth',
+    'Argon2 hash/verify calls submitted to the executor and not finished yet',
+    multiprocess_mode='livesum',
+)
+
+# Доля попаданий: rate(..{result="hit"}) / rate(..) по имени кеша
+CACHE_REQUESTS = Counter(
+    'cache_requests',
+    'Cache lookups by result',
+    ['cache', 'result'],
+)
+COMPRESSION_CACHE_HITS = CACHE_REQUESTS.labels('compression', 'hit')
+COMPRESSION_CACHE_MISSES = CACHE_REQUESTS.labels('compression', 'miss')
+
+TASKS_ENQUEUED = Counter(
+    'tasks_enqueued',
+    'Background tasks enqueued',
+    ['task', 'backend'],
+)
+
+# Дочерние метрики маршрутов: labels() берет блокировку, а набор
+# (метод, маршрут, статус) ограничен маршрутами приложения
+_request_children: dict[tuple[str, str, int], object] = {}
+
+
+def route_label(scope: Scope) -> str:
+    """Шаблон пути (/articles/{article_id}), а не сам путь: число меток ограничено"""
+    route = scope.get('route')
+    if route is not None:
+        return route.path
+    # Маршруты app.add_route (схема, документация) - пути без параметров
+    if 'endpoint' in scope:
+        return scope['path']
+    return 'unmatched'
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    key = (method, route, status)
+    child = _request_children.get(key)
+    if child is None:
+        child = _request_children[key] = HTTP_REQUEST_DURATION.labels(method, route, str(status))
+    child.observe(seconds)
+
+
+class MetricsPoolStats(PoolStats):
+    """Счетчики пула, которые дополнительно пишутся в метрики"""
+
+    def __init__(self, engine_name: str):
+        super().__init__()
+        self.wait_metric = DB_POOL_WAIT.labels(engine_name)
+        self.timeout_metric = DB_POOL_TIMEOUTS.labels(engine_name)
+
+    def record(self, elapsed: float, waited: bool) -> None:
+        super().record(elapsed, waited)
+        if waited:
+            self.wait_metric.observe(elapsed)
+
+    def record_timeout(self) -> None:
+        super().record_timeout()
+        self.timeout_metric.inc()
+
+
+_instrumented_engines = weakref.WeakSet()
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> None:
+    """Метрики пула соединений engine с меткой engine=name.
+
+    Вызывается в каждом рабочем процессе (lifespan): значения Gauge,
+    заданные до fork, в рабочих процессах не видны.
+    """
+    if engine.sync_engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine.sync_engine)
+
+    pool = engine.pool
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+
+    if hasattr(pool, 'stats'):
+        pool.stats = MetricsPoolStats(name)
+        DB_POOL_CAPACITY.labels(name).set(pool.size() + max(pool._max_overflow, 0))
+
+    @event.listens_for(engine.sync_engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine.sync_engine, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+_registry: Optional[CollectorRegistry] = None
+
+
+def get_registry() -> CollectorRegistry:
+    global _registry
+    if _registry is None:
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            from prometheus_client.multiprocess import MultiProcessCollector
+
+            _registry = CollectorRegistry()
+            MultiProcessCollector(_registry)
+        else:
+            _registry = REGISTRY
+    return _registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
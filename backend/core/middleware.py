@@ -0,0 +1,93 @@
+import logging
+import re
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (ASGIApp,
+                             Message,
+                             Receive,
+                             Scope,
+                             Send)
+
+from backend.core.config import SERVER_TIMING
+from backend.core.log_format import log_context
+from backend.core.metrics import (observe_request,
+                                  route_label)
+from backend.db.query_stats import (QueryStats,
+                                    current_stats)
+
+logger_console = logging.getLogger('console_logger')
+
+# Идентификатор запроса от балансировщика принимается, только если он похож на идентификатор
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class AccessLogMiddleware:
+    """Контекст запроса для логов и строка access-лога.
+
+    Каждому запросу назначается request_id (из X-Request-ID или новый),
+    он возвращается в заголовке X-Request-ID и попадает во все записи
+    лога запроса вместе с route и user_id (см. log_format).
+    SQL-выражения запроса считаются, результат отдается в заголовке
+    Server-Timing и пишется в access-лог полями db_queries и db_time_ms.
+    Длительность запроса пишется в метрику http_request_duration_seconds
+    с шаблоном маршрута и статусом.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope['headers']:
+            if name == b'x-request-id':
+                request_id = value.decode('latin-1')
+                break
+        if request_id is None or not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        context = {'request_id': request_id, 'method': scope['method'], 'route': None}
+        context_token = log_context.set(context)
+        stats = QueryStats(parent=current_stats.get())
+        stats_token = current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = MutableHeaders(scope=message)
+                headers['X-Request-ID'] = request_id
+                if self.server_timing:
+                    headers.append(
+                        'Server-Timing',
+                        f'db;dur={stats.duration_ms};desc="{stats.count} queries"'
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_stats.reset(stats_token)
+            elapsed = time.perf_counter() - started
+            observe_request(scope['method'], route_label(scope), status_code, elapsed)
+            elapsed_ms = round(elapsed * 1000, 3)
+            logger_console.info(
+                '%s %s %s %s ms db_queries=%s db_time_ms=%s',
+                scope['method'], scope['path'], status_code, elapsed_ms, stats.count, stats.duration_ms,
+                extra={
+                    'path': scope['path'],
+                    'status_code': status_code,
+                    'duration_ms': elapsed_ms,
+                    'db_queries': stats.count,
+                    'db_time_ms': stats.duration_ms,
+                },
+            )
+            log_context.reset(context_token)
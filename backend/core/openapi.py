@@ -0,0 +1,211 @@
+"""Собранная заранее схема OpenAPI.
+
+Схема строится командой buildopenapi (commands/commands.py) в файл
+openapi-<отпечаток>.json рядом со сжатыми gzip и brotli копиями. Отпечаток
+(openapi_fingerprint) считается по маршрутам и исходникам их обработчиков
+и моделей без построения схемы. Процессы API схему не строят: файл с
+отпечатком текущих маршрутов читается при запуске и отдается как есть, с
+ETag и кешированием. Если такого файла нет (разработка или маршруты
+изменились после сборки), схема строится FastAPI, как раньше.
+"""
+import gzip
+import hashlib
+import sys
+import typing
+from pathlib import Path
+from typing import Optional
+
+import fastapi
+import orjson
+import pydantic
+from fastapi import (FastAPI,
+                     Request,
+                     Response)
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.openapi.docs import (get_redoc_html,
+                                  get_swagger_ui_html)
+from fastapi.routing import APIRoute
+
+from backend.core.compression import (brotli,
+                                      choose_encoding)
+from backend.core.config import (BASE_DIR,
+                                 OPENAPI_DIR)
+
+OPENAPI_URL = '/openapi.json'
+DOCS_URL = '/docs'
+REDOC_URL = '/redoc'
+CACHE_CONTROL = 'public, max-age=3600'
+
+
+def schema_path(directory: Path, fingerprint: str) -> Path:
+    return Path(directory) / f'openapi-{fingerprint}.json'
+
+
+def annotation_modules(annotation, modules: set[str], seen: set[type]) -> None:
+    # Модули классов аннотации, включая поля вложенных моделей pydantic
+    if isinstance(annotation, type):
+        if annotation in seen:
+            return
+        seen.add(annotation)
+        modules.add(annotation.__module__)
+        if issubclass(annotation, pydantic.BaseModel):
+            for field in annotation.model_fields.values():
+                annotation_modules(field.annotation, modules, seen)
+    for argument in typing.get_args(annotation):
+        annotation_modules(argument, modules, seen)
+
+
+def dependant_modules(dependant: Dependant, modules: set[str], seen: set[type]) -> None:
+    if dependant.call is not None:
+        modules.add(getattr(dependant.call, '__module__', type(dependant.call).__module__))
+    params = (
+        dependant.path_params + dependant.query_params + dependant.header_params
+        + dependant.cookie_params + dependant.body_params
+    )
+    for param in params:
+        annotation_modules(param.field_info.annotation, modules, seen)
+    for sub_dependant in dependant.dependencies:
+        dependant_modules(sub_dependant, modules, seen)
+
+
+def openapi_fingerprint(app: FastAPI) -> str:
+    """Отпечаток всего, из чего строится схема app.
+
+    Описание приложения, параметры маршрутов из схемы, версии FastAPI и
+    pydantic и содержимое модулей проекта с обработчиками, зависимостями
+    и моделями (поля, описания, docstring). Маршруты вне схемы не
+    учитываются.
+    """
+    routes = []
+    modules = set()
+    seen = set()
+    for route in app.routes:
+        if not getattr(route, 'include_in_schema', False):
+            continue
+        if isinstance(route, APIRoute):
+            response_class = route.response_class
+            if isinstance(response_class, DefaultPlaceholder):
+                response_class = response_class.value
+            routes.append((
+                route.path, sorted(route.methods), route.name, route.status_code, [str(tag) for tag in route.tags],
+                route.summary, route.description, route.response_description, route.deprecated,
+                route.operation_id, sorted(map(str, route.responses)), response_class.__name__,
+            ))
+            annotation_modules(route.response_model, modules, seen)
+            for response in route.responses.values():
+                annotation_modules(response.get('model'), modules, seen)
+            dependant_modules(route.dependant, modules, seen)
+        else:
+            routes.append((route.path, sorted(getattr(route, 'methods', None) or ()), route.name))
+
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(repr((
+        fastapi.__version__, pydantic.VERSION, app.openapi_version, app.title, app.version, app.summary,
+        app.description, app.terms_of_service, app.contact, app.license_info, app.openapi_tags, app.servers,
+        routes,
+    )).encode())
+    for name in sorted(modules):
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path is not None and Path(path).resolve().is_relative_to(BASE_DIR):
+            digest.update(name.encode())
+            digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def build_openapi(app: FastAPI, directory: Path = OPENAPI_DIR) -> list[Path]:
+    """Строит схему приложения и записывает ее и сжатые копии, возвращает пути файлов"""
+    body = orjson.dumps(app.openapi())
+    path = schema_path(directory, openapi_fingerprint(app))
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    variants = {path: body, path.with_name(f'{path.name}.gz'): gzip.compress(body, 9, mtime=0)}
+    if brotli is not None:
+        variants[path.with_name(f'{path.name}.br')] = brotli.compress(body, quality=11)
+    for variant_path, content in variants.items():
+        variant_path.write_bytes(content)
+    return list(variants)
+
+
+class PrebuiltSchema:
+    """Тело схемы в исходном и сжатых вариантах"""
+
+    encodings = ('br', 'gzip')
+
+    def __init__(self, variants: dict[Optional[str], bytes]):
+        self.variants = variants
+        # Слабый ETag: сжатые варианты отличаются побайтно, содержимое одно
+        self.etag = 'W/"{}"'.format(hashlib.blake2b(variants[None], digest_size=12).hexdigest())
+
+    @classmethod
+    def load(cls, directory: Path, fingerprint: str) -> Optional['PrebuiltSchema']:
+        path = schema_path(directory, fingerprint)
+        if not path.exists():
+            return None
+        variants = {None: path.read_bytes()}
+        for encoding, suffix in (('gzip', '.gz'), ('br', '.br')):
+            variant_path = path.with_name(f'{path.name}{suffix}')
+            if variant_path.exists():
+                variants[encoding] = variant_path.read_bytes()
+        return cls(variants)
+
+    def choose(self, accept_encoding: str) -> Optional[str]:
+        available = tuple(encoding for encoding in self.encodings if encoding in self.variants)
+        return choose_encoding(accept_encoding, available)
+
+    def response(self, request: Request) -> Response:
+        headers = {'ETag': self.etag, 'Cache-Control': CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+        if self.etag in request.headers.get('if-none-match', ''):
+            return Response(status_code=304, headers=headers)
+
+        encoding = self.choose(request.headers.get('accept-encoding', ''))
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return Response(self.variants[encoding], media_type='application/json', headers=headers)
+
+
+def prebuilt_schema(app: FastAPI) -> Optional[PrebuiltSchema]:
+    """Собранная схема для текущих маршрутов app (None - схему строит FastAPI).
+
+    Маршруты добавляются и после setup_openapi, поэтому файл ищется при
+    первом обращении (warm-up или запрос схемы) и сохраняется в app.state.openapi.
+    """
+    try:
+        return app.state.openapi
+    except AttributeError:
+        directory = getattr(app.state, 'openapi_dir', None)
+        app.state.openapi = None if directory is None else PrebuiltSchema.load(directory, openapi_fingerprint(app))
+        return app.state.openapi
+
+
+def setup_openapi(app: FastAPI, directory: Path = OPENAPI_DIR) -> None:
+    """Маршруты схемы и документации.
+
+    Приложение создается с openapi_url, docs_url и redoc_url равными None,
+    маршруты добавляются здесь. Страницы документации собираются один раз.
+    """
+    app.state.openapi_dir = directory
+
+    pages = {
+        DOCS_URL: get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f'{app.title} - Swagger UI').body,
+        REDOC_URL: get_redoc_html(openapi_url=OPENAPI_URL, title=f'{app.title} - ReDoc').body,
+    }
+
+    async def openapi(request: Request) -> Response:
+        schema = prebuilt_schema(app)
+        if schema is not None:
+            return schema.response(request)
+        return Response(orjson.dumps(app.openapi()), media_type='application/json')
+
+    async def docs_page(request: Request) -> Response:
+        return Response(pages[request.url.path], media_type='text/html', headers={'Cache-Control': CACHE_CONTROL})
+
+    app.add_route(OPENAPI_URL, openapi, include_in_schema=False)
+    for url in pages:
+        app.add_route(url, docs_page, include_in_schema=False)
+
+
+def ensure_openapi(app: FastAPI) -> None:
+    # Без собранной схемы строит ее заранее, чтобы не платить на первом запросе
+    if prebuilt_schema(app) is None:
+        app.openapi()
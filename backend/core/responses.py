@@ -0,0 +1,49 @@
+from typing import (Any,
+                    Iterable)
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.engine import Row
+
+from backend.core.content_negotiation import (MSGPACK_MEDIA_TYPE,
+                                              packb,
+                                              response_format)
+
+
+class NegotiatedResponse(ORJSONResponse):
+    """JSON (orjson) или MessagePack, если клиент запросил его в Accept.
+
+    Формат выбирает MsgPackRoute, вне таких маршрутов ответ всегда JSON.
+    """
+
+    def __init__(self, content: Any = None, *args, **kwargs):
+        if response_format.get() == 'msgpack':
+            self.media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return packb(content)
+        return super().render(content)
+
+
+# Класс ответа по умолчанию для приложения
+default_response_class = NegotiatedResponse
+
+
+class TrustedResponse(NegotiatedResponse):
+    """Строки из нашей БД, сериализованные без моделей pydantic.
+
+    FastAPI не валидирует возвращенный Response по response_model, поэтому
+    имена колонок в запросе должны совпадать с полями схемы ответа
+    (проверяется в tests/test_api/test_responses.py). Принимает одну строку
+    или список строк.
+    """
+
+    def render(self, content: Row | dict | Iterable[Row | dict]) -> bytes:
+        if isinstance(content, (Row, dict)):
+            return super().render(self.as_dict(content))
+        return super().render([self.as_dict(row) for row in content])
+
+    @staticmethod
+    def as_dict(row: Row | dict) -> dict:
+        return row._asdict() if isinstance(row, Row) else row
@@ -1,4 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 import secrets
 import string
@@ -10,18 +13,27 @@ from fastapi import (Depends,
                      status)
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from argon2 import PasswordHasher
 
 from backend.db.models.user import (User,
                                     Token)
 from backend.db.session import get_db
 from backend.schemas.user import TokenData
-from backend.core.config import  SECRET_KEY, ALGORITHM
+from backend.core.config import  SECRET_KEY, ALGORITHM, PASSWORD_HASH_WORKERS
+from backend.core.log_format import set_log_context
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/login')
 
-# Контекст для хэширования паролей
-ph = PasswordHasher()
+# Контекст для хэширования паролей (argon2 загружается при первом использовании)
+@lru_cache
+def get_password_hasher():
+    from argon2 import PasswordHasher
+
+    return PasswordHasher()
+
+
+# argon2 считает хэш десятки миллисекунд и отпускает GIL: в API он
+# выполняется в своем пуле потоков и не блокирует цикл событий
+password_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='argon2')
 
 # Конфигурация fast_api_email
 
@@ -41,19 +53,47 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 # Функция для проверки пароля
 def verify_password(plain_password: str, hashed_password: str):
-    return ph.verify(hashed_password, plain_password)
+    return get_password_hasher().verify(hashed_password, plain_password)
 
 
 # Функция для хэширования пароля
 def get_password_hash(password: str):
-    return ph.hash(password)
+    return get_password_hasher().hash(password)
+
+
+async def run_password_hasher(func, *args):
+    # Метрики загружаются при первом вызове: командам они не нужны
+    from backend.core.metrics import PASSWORD_HASH_QUEUE
+
+    PASSWORD_HASH_QUEUE.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_hash_executor, func, *args)
+    finally:
+        PASSWORD_HASH_QUEUE.dec()
+
+
+# Проверка и хэширование пароля в обработчиках запросов
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await run_password_hasher(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str):
+    return await run_password_hasher(get_password_hash, password)
+
+
+def token_query(token: str):
+    return select(Token).filter(Token.token == token)
+
+
+def user_by_email_query(email: str):
+    return select(User).filter(User.email == email)
 
 
 async def get_current_user(
         token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ):
     *_, token_exist = token.split()
-    result = await db.execute(select(Token).filter(Token.token == token_exist))
+    result = await db.execute(token_query(token_exist))
     token_bd = result.scalars().first()
 
     credentials_exception = HTTPException(
@@ -74,19 +114,34 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    result = await db.execute(select(User).filter(User.email == token_data.email))
+    result = await db.execute(user_by_email_query(token_data.email))
     db_user = result.scalars().first()
     if db_user is None:
         raise credentials_exception
+    set_log_context(user_id=db_user.id)
     return db_user
 
 
+async def get_current_staff_user(current_user: User = Depends(get_current_user)):
+    if not current_user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='You don`t have permission'
+        )
+    return current_user
+
+
 def generate_timestamp_link(length=24, expires_hours=1):
     timestamp = int(datetime.now().timestamp())
     rand_part = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(length))
     return f'{rand_part}_{timestamp}_{expires_hours}'
 
 
+def restore_timestamp_link(rand_part: str, created_at: datetime, expires_hours=1):
+    timestamp = int(created_at.timestamp())
+    return f'{rand_part}_{timestamp}_{expires_hours}'
+
+
 def verify_timestamp_link(link: str):
     try:
         rand_part, timestamp_str, expires_hours_str = link.split('_')
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import (AsyncIterator,
+                    Awaitable,
+                    Callable,
+                    Generic,
+                    Hashable,
+                    Optional,
+                    TypeVar)
+
+T = TypeVar('T')
+
+
+class ResendThrottle:
+    """Не больше одного действия на ключ за interval секунд в пределах процесса.
+
+    Параллельные запросы с тем же ключом ждут завершения первого и
+    получают отказ, если оно выполнилось успешно.
+
+        async with throttle.acquire(user.id) as allowed:
+            if allowed:
+                ...
+    """
+
+    max_keys = 10000
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._done_at: dict[Hashable, float] = {}
+        # Блокировка ключа и число запросов, которые ее держат или ждут
+        self._locks: dict[Hashable, tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable) -> AsyncIterator[bool]:
+        # Блокировка удаляется, только когда ее больше никто не ждет: проверка
+        # lock.locked() не видит разбуженного, но еще не запущенного ожидающего
+        lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                done_at = self._done_at.get(key)
+                if done_at is not None and time.monotonic() - done_at < self.interval:
+                    yield False
+                    return
+                yield True
+                self._done_at[key] = time.monotonic()
+                self._prune()
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    def _prune(self) -> None:
+        if len(self._done_at) <= self.max_keys:
+            return
+        expired = time.monotonic() - self.interval
+        self._done_at = {key: done_at for key, done_at in self._done_at.items() if done_at > expired}
+
+
+class CachedCheck(Generic[T]):
+    """Результат асинхронной проверки, который кешируется на interval секунд.
+
+    Устаревший результат обновляет один запрос, остальные в это время
+    получают прошлое значение. Ждут проверку только запросы, пришедшие до
+    первого результата. Исключение check передается вызвавшему запросу,
+    кеш при этом не меняется.
+    """
+
+    def __init__(self, check: Callable[[], Awaitable[T]], interval: float):
+        self.check = check
+        self.interval = interval
+        self.value: Optional[T] = None
+        self.checked_at = float('-inf')
+        # Создается при первом вызове: Lock привязывается к циклу событий
+        self._lock: Optional[asyncio.Lock] = None
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.checked_at < self.interval
+
+    async def get(self) -> T:
+        if self.is_fresh():
+            return self.value
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._lock.locked() and self.checked_at > float('-inf'):
+            # Проверку уже выполняет другой запрос, используем прошлый результат
+            return self.value
+
+        async with self._lock:
+            if not self.is_fresh():
+                self.value = await self.check()
+                self.checked_at = time.monotonic()
+        return self.value
@@ -0,0 +1,124 @@
+"""Прогрев процесса перед приемом запросов (lifespan в main.py).
+
+Без прогрева первые запросы после запуска открывают соединения с БД,
+компилируют SQL-выражения, строят схему OpenAPI и шаблоны писем.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from backend.core.config import (DB_POOL_SIZE,
+                                 WARMUP_DB_CONNECTIONS,
+                                 WARMUP_STATEMENT_TIMEOUT,
+                                 WARMUP_TIMEOUT)
+from backend.core.openapi import ensure_openapi
+from backend.core.security import (token_query,
+                                   user_by_email_query)
+from backend.crud.articles import (article_detail_query,
+                                   article_list_query)
+from backend.crud.comments import comment_list_query
+
+logger_console = logging.getLogger('console_logger')
+logger_file = logging.getLogger('file_logger')
+
+# SQLSTATE отмены выражения по statement_timeout
+QUERY_CANCELED = '57014'
+
+
+def hot_statements() -> list:
+    """Выражения самых частых запросов, выполняются на каждом соединении.
+
+    Параметры подобраны так, чтобы выражения ничего не находили: кеш
+    компиляции SQLAlchemy зависит от структуры выражения, а не от значений.
+    """
+    return [
+        token_query(''),
+        user_by_email_query(''),
+        article_list_query(),
+        article_detail_query(0),
+        comment_list_query(0),
+    ]
+
+
+def is_query_canceled(error: Exception) -> bool:
+    return getattr(getattr(error, 'orig', error), 'sqlstate', None) == QUERY_CANCELED
+
+
+async def warm_up_connection(engine: AsyncEngine, statements: list, statement_timeout: float) -> None:
+    """Компилирует выражения и готовит их в asyncpg на одном соединении пула.
+
+    Строки не нужны: курсор отдает первую строку, а выражение, которое
+    строит весь результат до первой строки (список статей без LIMIT
+    сортирует всю таблицу), прерывается statement_timeout. Подготовленное
+    выражение при этом остается в кеше соединения.
+    """
+    async with engine.connect() as conn:
+        for statement in statements:
+            # SET LOCAL действует до конца транзакции и не остается на соединении
+            await conn.execute(text(f"SET LOCAL statement_timeout = '{int(statement_timeout * 1000)}ms'"))
+            try:
+                result = await conn.stream(statement)
+                await result.first()
+            except Exception as error:
+                if not is_query_canceled(error):
+                    raise
+            await conn.rollback()
+
+
+async def warm_up_pool(
+        engine: AsyncEngine,
+        connections: int,
+        statement_timeout: float = WARMUP_STATEMENT_TIMEOUT,
+) -> int:
+    """Открывает connections соединений пула и выполняет на них частые выражения.
+
+    Соединения берутся одновременно, поэтому это разные соединения,
+    после прогрева они остаются в пуле. Возвращает число соединений.
+    """
+    if isinstance(engine.pool, NullPool):
+        connections = 1
+    connections = max(min(connections, DB_POOL_SIZE), 1)
+
+    statements = hot_statements()
+    await asyncio.gather(*(warm_up_connection(engine, statements, statement_timeout) for _ in range(connections)))
+    return connections
+
+
+async def warm_up(
+        app: FastAPI,
+        engines: list[AsyncEngine],
+        connections: int = WARMUP_DB_CONNECTIONS,
+        timeout: Optional[float] = WARMUP_TIMEOUT,
+) -> None:
+    """Прогревает процесс и отмечает приложение готовым (app.state.ready).
+
+    Ошибка шага (например, недоступна БД) пишется в лог и не мешает
+    запуску: готовность БД проверяется отдельно.
+    """
+    started = time.perf_counter()
+
+    try:
+        from backend.fast_api_email.fast_api_email import get_mail
+
+        get_mail().warm_up()
+    except Exception as error:
+        logger_file.warning(f'Warm-up of email templates failed: {error}')
+
+    ensure_openapi(app)
+
+    if connections > 0:
+        for engine in engines:
+            try:
+                await asyncio.wait_for(warm_up_pool(engine, connections), timeout)
+            except Exception as error:
+                logger_file.warning(f'Warm-up of database pool failed: {error!r}')
+
+    app.state.ready = True
+    duration_ms = round((time.perf_counter() - started) * 1000, 3)
+    logger_console.info(f'Warm-up finished in {duration_ms} ms, application ready', extra={'duration_ms': duration_ms})
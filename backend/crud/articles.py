@@ -4,19 +4,20 @@ from typing import Optional
 from fastapi import (HTTPException,
                      status)
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from sqlalchemy.future import select
 
 from backend.core.decorators import (check_user_permissions,
                                      check_is_activate_permissions)
-from backend.crud.user import get_user
 from backend.db.models import Article, User
 from backend.schemas.article import (ArticleCreate,
-                                     ArticleUpdate,
-                                     ArticleResponse)
+                                     ArticleUpdate)
 
 logger_console = logging.getLogger('console_logger')
 logger_file = logging.getLogger('file_logger')
 
+DELETED_AUTHOR_NAME = 'Удаленный пользователь'
+
 
 async def get_article(db: Session, article_id: Optional[int] = None):
     if article_id is None:
@@ -34,13 +35,6 @@ async def get_article(db: Session, article_id: Optional[int] = None):
     return article
 
 
-async def get_article_author_name(db: Session, author_id: Optional[int] = None) -> str:
-    if author_id is not None:
-        user = await get_user(db, user_id=author_id)
-        return user.full_name
-    return 'Удаленный пользователь'
-
-
 @check_is_activate_permissions(schema=ArticleCreate)
 async def create(
         current_user: User,
@@ -54,39 +48,49 @@ async def create(
     )
 
     db.add(article_db)
-    await db.commit()
-    await db.refresh(article_db)
+    await db.flush()
     logger_console.info('Article created')
 
     return {'message': 'Article created', 'status': status.HTTP_201_CREATED}
 
 
+def article_detail_query(article_id: int):
+    return (
+        select(Article.id, Article.title, Article.content,
+               func.coalesce(User.full_name, DELETED_AUTHOR_NAME).label('author_name'),
+               Article.created_at, Article.updated_at)
+        .outerjoin(User, Article.author_id == User.id)
+        .where(Article.id == article_id)
+    )
+
+
+def article_list_query():
+    # В списке нужно только начало текста, остальное из БД не передается
+    return (
+        select(Article.id, Article.title, func.concat(func.left(Article.content, 48), '...').label('content'),
+               func.coalesce(User.full_name, DELETED_AUTHOR_NAME).label('author_name'),
+               Article.created_at, Article.updated_at)
+        .outerjoin(User, Article.author_id == User.id)
+        .order_by(Article.id)
+    )
+
+
 async def read(db: Session, article_id: Optional[int] = None):
+    # Имя автора берется тем же запросом, без отдельного запроса на каждую статью.
+    # Строки отдаются как есть (TrustedResponse), колонки названы по полям ArticleResponse
     if article_id:
-        article = await get_article(db, article_id)
-        author_name = await get_article_author_name(db, article.author_id)
-        article_response = ArticleResponse(
-            id=article.id,
-            title=article.title,
-            content=article.content,
-            author_name=author_name,
-            created_at=article.created_at,
-            updated_at=article.updated_at,
-        )
+        result = await db.execute(article_detail_query(article_id))
+        article = result.first()
+        if article is None:
+            logger_file.warning('Article not found')
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Article not found'
+            )
+        article_response = article
     else:
-        articles = await get_article(db)
-        article_response = []
-        for article in articles:
-            author_name = await get_article_author_name(db, article.author_id)
-            article_response.append(
-                ArticleResponse(
-                    id=article.id,
-                    title=article.title,
-                    content=f'{article.content[:48]}...',
-                    author_name=author_name,
-                    created_at=article.created_at,
-                    updated_at=article.updated_at,
-                ))
+        result = await db.execute(article_list_query())
+        article_response = result.all()
 
     return article_response
 
@@ -105,8 +109,7 @@ async def update(
         setattr(article, key, value)
 
     db.add(article)
-    await db.commit()
-    await  db.refresh(article)
+    await db.flush()
     logger_console.info('Article updated')
 
     return {'message': 'Article updated', 'status': status.HTTP_200_OK}
@@ -121,7 +124,7 @@ async def delete(
     article = await get_article(db, article_id)
 
     await db.delete(article)
-    await db.commit()
+    await db.flush()
     logger_console.info('Article deleted')
 
     return {'message': 'Article deleted', 'status': status.HTTP_200_OK}
@@ -3,16 +3,16 @@ import logging
 from sqlalchemy.orm import Session
 from fastapi import status
 
+from sqlalchemy import func
 from sqlalchemy.future import select
 
 from backend.core.decorators import (check_user_permissions,
                                      check_is_activate_permissions)
-from backend.crud.user import get_user
 from backend.db.models import User
-from backend.schemas.comment import (CommentCreate,
-                                     CommentResponse)
+from backend.schemas.comment import CommentCreate
 from backend.db.models.comment import Comment
-from backend.crud.articles import get_article
+from backend.crud.articles import (get_article,
+                                   DELETED_AUTHOR_NAME)
 
 logger_console = logging.getLogger('console_logger')
 logger_file = logging.getLogger('file_logger')
@@ -32,32 +32,27 @@ async def create(
     )
 
     db.add(comment_db)
-    await db.commit()
-    await db.refresh(comment_db)
+    await db.flush()
     logger_console.info('Comment successfully added')
 
     return {'message': 'Comment successfully added', 'status': status.HTTP_201_CREATED}
 
 
+def comment_list_query(article_id: int):
+    return (
+        select(Comment.id, Comment.content, Comment.article_id,
+               func.coalesce(User.full_name, DELETED_AUTHOR_NAME).label('author_name'),
+               Comment.created_at)
+        .outerjoin(User, Comment.author_id == User.id)
+        .filter(Comment.article_id == article_id)
+        .order_by(Comment.id)
+    )
+
+
 async def read(article_id: int, db: Session):
-    result = await db.execute(select(Comment).filter(Comment.article_id == article_id).order_by(Comment.id))
-    comments = result.scalars().all()
-    comments_response = []
-    for comment in comments:
-        if comment.author_id is not None:
-            user = await get_user(db=db, user_id=comment.author_id)
-            author_name = user.full_name
-        else:
-            author_name = 'Удаленный пользователь'
-        comments_response.append(
-            CommentResponse(
-                id=comment.id,
-                content=comment.content,
-                article_id=comment.article_id,
-                author_name=author_name,
-                created_at=comment.created_at,
-            ))
-    return comments_response
+    # Строки отдаются как есть (TrustedResponse), колонки названы по полям CommentResponse
+    result = await db.execute(comment_list_query(article_id))
+    return result.all()
 
 
 @check_user_permissions(Comment)
@@ -66,7 +61,7 @@ async def delete(comment_id: int, current_user: User, db: Session):
     comment = result.scalars().first()
 
     await db.delete(comment)
-    await db.commit()
+    await db.flush()
     logger_console.info('Comment deleted')
 
     return {'message': 'Comment deleted', 'status': status.HTTP_200_OK}
@@ -1,4 +1,6 @@
 import logging
+from functools import partial
+from typing import Optional
 from datetime import (datetime,
                       timedelta,
                       timezone)
@@ -9,11 +11,17 @@ from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 from pydantic import EmailStr
 
-from backend.core.security import (get_password_hash,
+from backend.core.security import (get_password_hash_async,
                                    verify_timestamp_link,
-                                   generate_timestamp_link)
+                                   generate_timestamp_link,
+                                   restore_timestamp_link)
 from backend.core.config import (HOST,
-                                 PORT)
+                                 PORT,
+                                 CONF_LINK_EXPIRE_HOURS,
+                                 CONF_LINK_RESEND_INTERVAL,
+                                 CONF_LINK_REUSE_MIN_TTL)
+from backend.core.throttle import ResendThrottle
+from backend.db.session import on_commit
 from backend.db.models.user import (User,
                                     Token)
 
@@ -27,6 +35,8 @@ from backend.core.decorators import check_is_staff_or_self_permissions
 logger_console = logging.getLogger('console_logger')
 logger_file = logging.getLogger('file_logger')
 
+link_throttle = ResendThrottle(CONF_LINK_RESEND_INTERVAL)
+
 
 async def get_user(db: Session, user_id: int = None, user_email: EmailStr | str = None):
     if user_id:
@@ -69,8 +79,7 @@ async def add_token(token: str, db: Session):
     )
 
     db.add(token)
-    await db.commit()
-    await db.refresh(token)
+    await db.flush()
     logger_console.info('token add successfully')
 
 
@@ -84,29 +93,65 @@ async def del_token(data: str, db: Session):
             detail='token not found'
         )
     await db.delete(token)
-    await db.commit()
+    await db.flush()
     logger_console.info('token deleted')
 
 
+def get_reusable_link(user: User) -> Optional[str]:
+    """Действующая ссылка пользователя, если до ее истечения достаточно времени"""
+    if not user.conf_reg_link or not user.conf_reg_link_created_at:
+        return None
+    expires_at = user.conf_reg_link_created_at + timedelta(hours=CONF_LINK_EXPIRE_HOURS)
+    if expires_at - datetime.now() < timedelta(seconds=CONF_LINK_REUSE_MIN_TTL):
+        return None
+    return restore_timestamp_link(user.conf_reg_link, user.conf_reg_link_created_at, CONF_LINK_EXPIRE_HOURS)
+
+
 async def send_link(user: User, db: Session):
-    full_link = generate_timestamp_link()
-    rand_part, *_ = full_link.split('_')
-    confirmation_url = f"http://{HOST}:{PORT}/auth/reg-confirm/{full_link}"
-    db_user = await get_user(db, user_email=user.email)
-    db_user.conf_reg_link = rand_part
-
-    db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
-
-    user_data = UserForEmail.model_validate(db_user)
-
-    await send_email_task(
-        user=user_data,
-        subject='Подтверждение регистрации',
-        template_name='reg_confirm.html',
-        link=confirmation_url
-    )
+    async with link_throttle.acquire(user.id) as allowed:
+        if not allowed:
+            logger_console.info(f'Link for user {user.id} already sent')
+            return
+
+        # ResendThrottle работает в пределах процесса. Повтор из другого процесса
+        # ждет блокировку строки до commit первого запроса и видит его ссылку
+        result = await db.execute(
+            select(User).where(User.id == user.id).with_for_update().execution_options(populate_existing=True)
+        )
+        user = result.scalar_one()
+        created_at = user.conf_reg_link_created_at
+        if created_at and datetime.now() - created_at < timedelta(seconds=CONF_LINK_RESEND_INTERVAL):
+            # Ссылку только что создал другой запрос
+            logger_console.info(f'Link for user {user.id} already sent')
+            return
+
+        full_link = get_reusable_link(user)
+        if full_link is None:
+            full_link = generate_timestamp_link(expires_hours=CONF_LINK_EXPIRE_HOURS)
+            rand_part, timestamp, _ = full_link.split('_')
+            user.conf_reg_link = rand_part
+            user.conf_reg_link_created_at = datetime.fromtimestamp(int(timestamp))
+            await db.flush()
+
+        confirmation_url = f"http://{HOST}:{PORT}/auth/reg-confirm/{full_link}"
+        user_data = UserForEmail.model_validate(user)
+
+        # Письмо уходит только после фиксации транзакции: иначе ссылка может не сохраниться
+        await on_commit(db, partial(
+            send_email_task.enqueue,
+            user=user_data.model_dump(),
+            subject='Подтверждение регистрации',
+            template_name='reg_confirm.html',
+            link=confirmation_url
+        ))
+
+
+async def resend_link(current_user: User, db: Session):
+    if current_user.is_active:
+        return {'message': 'User already active'}
+
+    await send_link(current_user, db)
+    return {'message': 'link was sent'}
 
 
 async def create(user: UserCreate, db: Session):
@@ -119,15 +164,14 @@ async def create(user: UserCreate, db: Session):
             detail='Email already registered'
         )
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(
         email=user.email,
         hashed_password=hashed_password,
         full_name=user.full_name,
     )
     db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    await db.flush()
     logger_console.info('Successfully registered')
 
     await send_link(new_user, db)
@@ -156,9 +200,9 @@ async def activate(token: str, db: Session):
 
     db_user.is_active = True
     db_user.conf_reg_link = None
+    db_user.conf_reg_link_created_at = None
 
-    await db.commit()
-    await db.refresh(db_user)
+    await db.flush()
     logger_console.info(f'User {db_user.email} activated')
 
     return {'message': 'User activate'}
@@ -166,21 +210,14 @@ async def activate(token: str, db: Session):
 
 async def read(db: Session, current_user: User, user_list=False):
     if current_user.is_staff and user_list:
-        users = await get_user(db)
-        user_response = [
-            UserResponse(
-                id=user.id,
-                email=user.email,
-                full_name=user.full_name,
-                is_active=user.is_active,
-                created_at=user.created_at,
-                is_staff=user.is_staff,
-                avatar_url=user.avatar_url,
-            ) for user in users
-        ]
+        # Только поля UserResponse, без загрузки объектов в сессию (отдается через TrustedResponse)
+        result = await db.execute(
+            select(*(getattr(User, field) for field in UserResponse.model_fields)).order_by(User.id)
+        )
+        user_response = result.all()
     elif not user_list:
-        user = await get_user(db, user_id=current_user.id)
-        user_response = UserResponse.model_validate(user)
+        # Пользователь уже загружен при проверке токена
+        user_response = UserResponse.model_validate(current_user)
     else:
         logger_file.warning('You don`t have permission')
         raise HTTPException(
@@ -212,8 +249,7 @@ async def update(user_id: int, current_user, db: Session, data: UserUpdate):
         setattr(user, key, value)
 
     db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    await db.flush()
     logger_console.info('Update successfully')
     return {'message': 'Update successfully', 'status': status.HTTP_200_OK}
 
@@ -228,6 +264,6 @@ async def delete(user_id: int, current_user, db: Session):
             detail='User not found'
         )
     await db.delete(user)
-    await db.commit()
+    await db.flush()
     logger_console.info('User deleted')
     return {'message': 'User deleted', 'status': status.HTTP_200_OK}
@@ -22,5 +22,6 @@ class Article(Base):
     # Связь с моделью User
     author = relationship('User', back_populates='articles')
 
-    # Связь с моделью Comment (один ко многим)
-    comments = relationship('Comment', back_populates='article', cascade='all, delete-orphan')
+    # Связь с моделью Comment (один ко многим). Комментарии удаляет БД (ON DELETE CASCADE),
+    # без загрузки в сессию
+    comments = relationship('Comment', back_populates='article', cascade='all, delete-orphan', passive_deletes=True)
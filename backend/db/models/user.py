@@ -22,12 +22,14 @@ class User(Base):
     avatar_url = Column(String, nullable=True, index=True)
     is_staff = Column(Boolean, default=False, index=True)
     conf_reg_link = Column(String, nullable=True, unique=True, index=True)
+    conf_reg_link_created_at = Column(DateTime, nullable=True)
 
-    # Отношение "один ко многим" с моделью Article
-    articles = relationship('Article', back_populates='author')
+    # Отношение "один ко многим" с моделью Article.
+    # При удалении пользователя author_id обнуляет БД (ON DELETE SET NULL)
+    articles = relationship('Article', back_populates='author', passive_deletes=True)
 
     # Отношение "один ко многим" с моделью Comment
-    comments = relationship('Comment', back_populates='commentator')
+    comments = relationship('Comment', back_populates='commentator', passive_deletes=True)
 
     def __str__(self):
         return f'id: {self.id} email: {self.email} full_name: {self.full_name}'
@@ -0,0 +1,71 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    """Счетчики пула соединений с момента запуска процесса"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.timeouts = 0
+
+    def record(self, elapsed: float, waited: bool) -> None:
+        self.checkouts += 1
+        if waited:
+            self.waits += 1
+            self.wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который считает ожидание свободного соединения и таймауты.
+
+    Ожиданием считается выдача соединения, когда в пуле не было свободных
+    соединений и лимит overflow был исчерпан.
+    """
+
+    # Логи пула остаются в иерархии sqlalchemy (уровень WARNING по умолчанию)
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.InstrumentedQueuePool'
+
+    def __init__(self, *args, stats: PoolStats | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def _do_get(self):
+        waited = self._pool.empty() and self._overflow >= self._max_overflow > -1
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record(time.perf_counter() - started, waited)
+        return connection
+
+    def recreate(self) -> 'InstrumentedQueuePool':
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def snapshot(self) -> dict:
+        stats = self.stats
+        return {
+            'size': self.size(),
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': max(self.overflow(), 0),
+            'max_overflow': self._max_overflow,
+            'checkouts': stats.checkouts,
+            'waits': stats.waits,
+            'wait_time_total_ms': round(stats.wait_time * 1000, 3),
+            'wait_time_max_ms': round(stats.max_wait_time * 1000, 3),
+            'timeouts': stats.timeouts,
+        }
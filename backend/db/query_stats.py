@@ -0,0 +1,105 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (Iterator,
+                    Optional)
+
+from sqlalchemy import event
+
+from backend.core.config import DB_SLOW_QUERY_MS
+
+logger_file = logging.getLogger('file_logger')
+
+
+class QueryStats:
+    """Число SQL-выражений и суммарное время их выполнения.
+
+    Выражение учитывается и во внешней статистике (parent), поэтому
+    подсчет в тесте видит запросы, выполненные внутри HTTP-запроса.
+    """
+
+    def __init__(self, parent: Optional['QueryStats'] = None):
+        self.count = 0
+        self.duration = 0.0
+        self.parent = parent
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 3)
+
+    def record(self, elapsed: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+            stats = stats.parent
+
+
+# Статистика текущего запроса (None - запросы не отслеживаются)
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Считает выражения, выполненные в текущем контексте.
+
+        with track_queries() as stats:
+            await crud.read(db)
+        assert stats.count == 1
+    """
+    stats = QueryStats(parent=current_stats.get())
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+
+
+def redact_parameters(parameters):
+    # Значения не попадают в лог (пароли, токены, email), только их типы
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return [redact_parameters(row) for row in parameters]
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(elapsed)
+
+    if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+        redacted = redact_parameters(parameters)
+        logger_file.warning(
+            'Slow query %.1f ms: %s params=%s', elapsed * 1000, statement, redacted,
+            extra={
+                'db_statement': statement,
+                'db_parameters': redacted,
+                'db_time_ms': round(elapsed * 1000, 3),
+            },
+        )
+
+
+def handle_error(exception_context):
+    # after_cursor_execute не вызывается при ошибке выражения
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_started'):
+        conn.info['query_started'].pop()
+
+
+def instrument_engine(engine) -> None:
+    """Подключает подсчет выражений и лог медленных запросов к движку"""
+    sync_engine = getattr(engine, 'sync_engine', engine)
+    event.listen(sync_engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(sync_engine, 'handle_error', handle_error)
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import (ASGIApp,
+                             Message,
+                             Receive,
+                             Scope,
+                             Send)
+
+from backend.core.throttle import CachedCheck
+
+logger_file = logging.getLogger('file_logger')
+
+# 0, если реплика применила все полученные WAL, иначе возраст последней примененной транзакции
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Cookie со временем последней записи клиента (Unix time) и ключ в
+# scope['state'], через который get_db передает это время в middleware
+LAST_WRITE_COOKIE = 'db_last_write'
+LAST_WRITE_STATE = 'db_last_write'
+
+
+class ReplicaRouter:
+    """Решает, можно ли выполнить чтение на реплике.
+
+    Основная БД используется:
+    - sticky_seconds после записи того же клиента (read-your-writes);
+    - пока отставание реплики больше max_lag или реплика недоступна.
+
+    Время последней записи хранит клиент (cookie LAST_WRITE_COOKIE, см.
+    LastWriteCookieMiddleware), поэтому отметку видит любой процесс, а
+    сервер ничего о клиентах не хранит.
+    """
+
+    def __init__(self, replica: AsyncEngine, sticky_seconds: float, max_lag: float, check_interval: float):
+        self.replica = replica
+        self.sticky_seconds = sticky_seconds
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag: CachedCheck[Optional[float]] = CachedCheck(self.check_lag, check_interval)
+
+    @property
+    def lag(self) -> Optional[float]:
+        # Последнее измеренное отставание, None - реплика недоступна или не проверялась
+        return self._lag.value
+
+    def is_sticky(self, last_write: Optional[str]) -> bool:
+        if not last_write:
+            return False
+        try:
+            written_at = float(last_write)
+        except ValueError:
+            return False
+        # Время из будущего (расхождение часов, подмена cookie) держит
+        # клиента на основной БД не дольше sticky_seconds
+        return abs(time.time() - written_at) < self.sticky_seconds
+
+    async def use_primary(self, last_write: Optional[str]) -> bool:
+        if self.is_sticky(last_write):
+            return True
+        lag = await self.get_lag()
+        return lag is None or lag > self.max_lag
+
+    async def get_lag(self) -> Optional[float]:
+        return await self._lag.get()
+
+    async def check_lag(self) -> Optional[float]:
+        try:
+            async with self.replica.connect() as conn:
+                result = await asyncio.wait_for(conn.execute(REPLICA_LAG_QUERY), self.check_interval)
+                lag = float(result.scalar_one())
+        except Exception as error:
+            logger_file.warning(f'Replica lag check failed: {error}')
+            lag = None
+
+        if lag is None or lag > self.max_lag:
+            logger_file.warning(f'Replica lag {lag}, reads go to primary')
+        return lag
+
+
+class LastWriteCookieMiddleware:
+    """Отдает клиенту cookie с временем записи, если запрос что-то записал.
+
+    get_db после commit с изменениями кладет время в scope['state'];
+    зависимости завершаются до отправки ответа, поэтому заголовок
+    добавляется здесь, когда ответ уже сформирован.
+    """
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float):
+        self.app = app
+        self.max_age = math.ceil(sticky_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                written_at = scope.get('state', {}).get(LAST_WRITE_STATE)
+                if written_at is not None:
+                    MutableHeaders(scope=message).append(
+                        'Set-Cookie',
+                        f'{LAST_WRITE_COOKIE}={written_at:.3f}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax',
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
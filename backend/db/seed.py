@@ -0,0 +1,250 @@
+"""Генерация синтетических данных для бенчмарков и воспроизведения проблем.
+
+Строки загружаются через COPY (asyncpg copy_records_to_table) потоком из
+генераторов, без ORM и без списков в памяти. У всех пользователей один
+хэш пароля: argon2 на каждого пользователя занял бы часы. Распределения
+неравномерные (закон Ципфа): небольшая часть авторов пишет большую часть
+статей, у популярных статей больше всего комментариев.
+
+Идентификаторы пользователей и статей берутся из последовательностей
+таблиц заранее (nextval), поэтому данные можно добавлять в непустую БД.
+
+Больше всего времени COPY тратит на обновление индексов (у каждой колонки
+свой) и проверку внешних ключей по строке. Поэтому на время загрузки
+вторичные индексы и внешние ключи удаляются и создаются заново в той же
+транзакции: построение индекса и проверка ключа одним запросом быстрее.
+Таблицы при этом заблокированы, на работающей БД используйте keep_indexes.
+"""
+import bisect
+import itertools
+import random
+import time
+from contextlib import (AsyncExitStack,
+                        asynccontextmanager)
+from datetime import (datetime,
+                      timedelta)
+from typing import (AsyncIterator,
+                    Iterator,
+                    Optional)
+from zoneinfo import ZoneInfo
+
+import asyncpg
+
+from backend.core.config import DB_TIMEZONE
+
+# Показатель распределения Ципфа: чем больше, тем сильнее перекос
+AUTHOR_SKEW = 1.1
+ARTICLE_SKEW = 1.0
+
+ACTIVE_USERS_SHARE = 0.9
+
+WORDS = (
+    'python fastapi postgres asyncio index query cache latency pool worker '
+    'schema article comment release review deploy metrics profile memory'
+).split()
+
+
+def zipf_cum_weights(count: int, skew: float) -> list[float]:
+    """Накопленные веса рангов 1..count: вес ранга k пропорционален 1 / k ** skew"""
+    return list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def texts(rng: random.Random, count: int, words: int) -> list[str]:
+    # Небольшой набор текстов на все строки: генерация текста дороже COPY
+    return [' '.join(rng.choices(WORDS, k=words)).capitalize() + '.' for _ in range(count)]
+
+
+class SkewedChoice:
+    """Выбор элемента values с весами Ципфа по порядку values"""
+
+    def __init__(self, values: list[int], skew: float):
+        self.values = values
+        self.cum_weights = zipf_cum_weights(len(values), skew)
+        self.total = self.cum_weights[-1]
+
+    def pick(self, rng: random.Random) -> int:
+        return self.values[bisect.bisect(self.cum_weights, rng.random() * self.total)]
+
+
+def timestamps(rng: random.Random, now: datetime, days: int) -> Iterator[datetime]:
+    seconds = days * 86400
+    while True:
+        yield now - timedelta(seconds=rng.random() * seconds)
+
+
+async def reserve_ids(conn: asyncpg.Connection, table: str, count: int) -> list[int]:
+    """Берет count значений последовательности первичного ключа таблицы"""
+    if count <= 0:
+        return []
+    return await conn.fetchval(
+        'SELECT array_agg(nextval(pg_get_serial_sequence($1, $2))) FROM generate_series(1, $3)',
+        table, 'id', count,
+    )
+
+
+def user_rows(
+        ids: list[int],
+        hashed_password: str,
+        rng: random.Random,
+        now: datetime,
+        days: int,
+) -> Iterator[tuple]:
+    created = timestamps(rng, now, days)
+    for user_id in ids:
+        yield (
+            user_id,
+            f'user{user_id}@seed.example.com',
+            hashed_password,
+            f'Seed user {user_id}',
+            rng.random() < ACTIVE_USERS_SHARE,
+            False,
+            next(created).date(),
+        )
+
+
+def article_rows(
+        ids: list[int],
+        authors: SkewedChoice,
+        rng: random.Random,
+        now: datetime,
+        days: int,
+) -> Iterator[tuple]:
+    titles = texts(rng, 1000, 6)
+    contents = texts(rng, 1000, 120)
+    created = timestamps(rng, now, days)
+    for article_id in ids:
+        yield (
+            article_id,
+            titles[article_id % len(titles)],
+            contents[article_id % len(contents)],
+            authors.pick(rng),
+            next(created),
+        )
+
+
+def comment_rows(
+        count: int,
+        articles: SkewedChoice,
+        authors: SkewedChoice,
+        rng: random.Random,
+        now: datetime,
+        days: int,
+) -> Iterator[tuple]:
+    contents = texts(rng, 1000, 15)
+    created = timestamps(rng, now, days)
+    for number in range(count):
+        yield (
+            contents[number % len(contents)],
+            articles.pick(rng),
+            authors.pick(rng),
+            next(created),
+        )
+
+
+@asynccontextmanager
+async def without_indexes(conn: asyncpg.Connection, tables: tuple[str, ...]) -> AsyncIterator[None]:
+    """Удаляет внешние ключи и вторичные индексы tables и создает их после блока.
+
+    Индексы ограничений (первичные ключи) остаются. Вызывается внутри транзакции.
+    """
+    foreign_keys = await conn.fetch(
+        """
+        SELECT conrelid::regclass::text AS table_name, conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid::regclass::text = ANY($1::text[])
+        """,
+        list(tables),
+    )
+    indexes = await conn.fetch(
+        """
+        SELECT indexrelid::regclass::text AS name, pg_get_indexdef(indexrelid) AS definition
+        FROM pg_index
+        WHERE indrelid::regclass::text = ANY($1::text[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)
+        """,
+        list(tables),
+    )
+    for key in foreign_keys:
+        await conn.execute(f'ALTER TABLE {key["table_name"]} DROP CONSTRAINT {key["conname"]}')
+    for index in indexes:
+        await conn.execute(f'DROP INDEX {index["name"]}')
+
+    yield
+
+    await conn.execute("SET LOCAL maintenance_work_mem TO '256MB'")
+    for index in indexes:
+        await conn.execute(index['definition'])
+    for key in foreign_keys:
+        await conn.execute(f'ALTER TABLE {key["table_name"]} ADD CONSTRAINT {key["conname"]} {key["definition"]}')
+
+
+async def copy_rows(conn: asyncpg.Connection, table: str, columns: tuple[str, ...], rows: Iterator[tuple]) -> dict:
+    started = time.perf_counter()
+    status = await conn.copy_records_to_table(table, records=rows, columns=columns)
+    seconds = time.perf_counter() - started
+    count = int(status.split()[-1])
+    return {'rows': count, 'seconds': round(seconds, 3), 'rows_per_sec': round(count / seconds) if seconds else count}
+
+
+async def seed(
+        conn: asyncpg.Connection,
+        hashed_password: str,
+        users: int,
+        articles: int,
+        comments: int,
+        days: int = 365,
+        random_seed: Optional[int] = None,
+        keep_indexes: bool = False,
+) -> dict[str, dict]:
+    """Добавляет users пользователей, articles статей и comments комментариев.
+
+    Все выполняется в одной транзакции. Возвращает число строк и скорость
+    загрузки по каждой таблице и время пересоздания индексов (indexes).
+    """
+    if articles and not users or comments and not articles:
+        raise ValueError('Articles need users, comments need articles')
+
+    rng = random.Random(random_seed)
+    # Время в БД хранится без зоны, в поясе сессии DB_TIMEZONE
+    now = datetime.now(ZoneInfo(DB_TIMEZONE)).replace(tzinfo=None)
+    tables = ('users', 'articles', 'comments')
+    results = {}
+
+    async with conn.transaction():
+        # Потеря последних транзакций при сбое сервера для генерации не страшна
+        await conn.execute('SET LOCAL synchronous_commit TO OFF')
+
+        user_ids = await reserve_ids(conn, 'users', users)
+        article_ids = await reserve_ids(conn, 'articles', articles)
+
+        async with AsyncExitStack() as stack:
+            if not keep_indexes:
+                await stack.enter_async_context(without_indexes(conn, tables))
+
+            results['users'] = await copy_rows(
+                conn, 'users',
+                ('id', 'email', 'hashed_password', 'full_name', 'is_active', 'is_staff', 'created_at'),
+                user_rows(user_ids, hashed_password, rng, now, days),
+            )
+            # Ранги случайны: популярные авторы и статьи не обязательно первые по id
+            rng.shuffle(user_ids)
+            rng.shuffle(article_ids)
+            authors = SkewedChoice(user_ids, AUTHOR_SKEW) if user_ids else None
+            results['articles'] = await copy_rows(
+                conn, 'articles',
+                ('id', 'title', 'content', 'author_id', 'created_at'),
+                article_rows(sorted(article_ids), authors, rng, now, days),
+            )
+            results['comments'] = await copy_rows(
+                conn, 'comments',
+                ('content', 'article_id', 'author_id', 'created_at'),
+                comment_rows(comments, SkewedChoice(article_ids, ARTICLE_SKEW), authors, rng, now, days)
+                if comments else iter(()),
+            )
+            started = time.perf_counter()
+        results['indexes'] = {'seconds': round(time.perf_counter() - started, 3)}
+
+    # Статистика планировщика после массовой загрузки
+    for table in tables:
+        await conn.execute(f'ANALYZE {table}')
+    return results
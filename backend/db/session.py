@@ -1,23 +1,219 @@
+import logging
+import time
+from functools import lru_cache
+from typing import (Awaitable,
+                    Callable,
+                    Optional)
+from uuid import uuid4
+
+from fastapi import (Depends,
+                     Request)
+from sqlalchemy import (event,
+                        text)
 from sqlalchemy.ext.asyncio import (create_async_engine,
                                     AsyncSession)
 from sqlalchemy.orm import (sessionmaker,
-                            declarative_base)
+                            declarative_base,
+                            Session)
+from sqlalchemy.pool import NullPool
+
+from backend.core.config import (SQLALCHEMY_DATABASE_URL,
+                                 DB_CONNECTION_MODE,
+                                 DB_STATEMENT_CACHE_SIZE,
+                                 DB_PGBOUNCER_NULLPOOL,
+                                 DB_TIMEZONE,
+                                 SQLALCHEMY_REPLICA_URL,
+                                 DB_REPLICA_STICKY_SECONDS,
+                                 DB_REPLICA_MAX_LAG,
+                                 DB_REPLICA_LAG_CHECK_INTERVAL,
+                                 DB_POOL_SIZE,
+                                 DB_MAX_OVERFLOW,
+                                 DB_POOL_TIMEOUT,
+                                 DB_POOL_RECYCLE,
+                                 DB_POOL_PRE_PING,
+                                 DB_POOL_USE_LIFO)
+from backend.db.pool import InstrumentedQueuePool
+from backend.db.query_stats import instrument_engine
+from backend.db.replica import (LAST_WRITE_COOKIE,
+                                LAST_WRITE_STATE,
+                                ReplicaRouter)
+
+logger_file = logging.getLogger('file_logger')
+
+
+def prepared_statement_name() -> str:
+    # PgBouncer в режиме transaction отдает разные серверные соединения,
+    # поэтому имена вида __asyncpg_stmt_1__ пересекаются между клиентами
+    return f'__asyncpg_{uuid4().hex}__'
+
+
+def get_connect_args(
+        mode: str = DB_CONNECTION_MODE,
+        cache_size: int = DB_STATEMENT_CACHE_SIZE,
+        timezone: str = DB_TIMEZONE,
+) -> dict:
+    # Пояс сессии не зависит от настроек сервера: TimeZone PgBouncer
+    # передает каждому серверному соединению клиента
+    server_settings = {'TimeZone': timezone}
+    if mode == 'direct':
+        return {
+            'statement_cache_size': cache_size,
+            'prepared_statement_cache_size': cache_size,
+            'server_settings': server_settings,
+        }
+    if mode == 'pgbouncer':
+        return {
+            'statement_cache_size': cache_size,
+            'prepared_statement_cache_size': cache_size,
+            'prepared_statement_name_func': prepared_statement_name,
+            'server_settings': server_settings,
+        }
+    raise ValueError(f'Unknown DB_CONNECTION_MODE: {mode}')
+
+
+def get_pool_args(null_pool: bool = DB_PGBOUNCER_NULLPOOL) -> dict:
+    if null_pool:
+        return {'poolclass': NullPool}
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'pool_use_lifo': DB_POOL_USE_LIFO,
+    }
+
+
+def create_engine(url: str):
+    engine = create_async_engine(
+        url,
+        connect_args=get_connect_args(),
+        **get_pool_args(),
+    )
+    instrument_engine(engine)
+    return engine
 
-from backend.core.config import SQLALCHEMY_DATABASE_URL
 
 # Создайте движок SQLAlchemy
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+# Движок реплики для чтения (None - реплика не настроена)
+read_engine = create_engine(SQLALCHEMY_REPLICA_URL) if SQLALCHEMY_REPLICA_URL else None
 
 # Создайте фабрику сессий
 AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+ReadSessionLocal = (
+    sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    if read_engine is not None else None
+)
+
+replica_router = (
+    ReplicaRouter(
+        read_engine,
+        sticky_seconds=DB_REPLICA_STICKY_SECONDS,
+        max_lag=DB_REPLICA_MAX_LAG,
+        check_interval=DB_REPLICA_LAG_CHECK_INTERVAL,
+    )
+    if read_engine is not None else None
+)
 
 Base = declarative_base()
 
 
-# Функция для получения сессии
-async def get_db():
+async def dispose_engines() -> None:
+    # Закрывает соединения пулов при остановке процесса
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+@event.listens_for(Session, 'after_flush')
+def mark_writes(session, flush_context):
+    session.info['has_writes'] = True
+
+
+@lru_cache
+def get_read_only_engine(bind):
+    # Транзакции начинаются с BEGIN READ ONLY, настройка снимается при возврате в пул
+    return bind.execution_options(postgresql_readonly=True)
+
+
+# Перевести уже начатую транзакцию в режим чтения можно и после запросов
+SET_READ_ONLY = text('SET TRANSACTION READ ONLY')
+
+
+async def set_read_only(db: AsyncSession) -> None:
+    """Переводит сессию в режим чтения: READ ONLY транзакция и без autoflush.
+
+    Сессия общая с get_db, и ее транзакцию мог уже начать другой
+    зависимый объект (get_current_user объявлен раньше get_read_db). Тогда
+    режим включается в текущей транзакции, иначе - при ее начале.
+    Транзакцию чужой сессии (тесты, команды) режим не меняет.
+    """
+    db.autoflush = False
+    if not db.in_transaction():
+        db.bind = get_read_only_engine(db.bind)
+        db.sync_session.bind = db.bind.sync_engine
+    elif db.info.get('unit_of_work'):
+        await db.execute(SET_READ_ONLY)
+
+
+def get_last_write(request: Optional[Request]) -> Optional[str]:
+    # Время последней записи клиента из cookie (см. LastWriteCookieMiddleware)
+    if request is None:
+        return None
+    return request.cookies.get(LAST_WRITE_COOKIE)
+
+
+async def on_commit(db: AsyncSession, callback: Callable[[], Awaitable]) -> None:
+    """Выполняет callback после фиксации транзакции запроса.
+
+    Внутри get_db вызов откладывается до commit и отменяется при откате,
+    вне запроса (тесты, команды) callback выполняется сразу.
+    """
+    if db.info.get('unit_of_work'):
+        db.info.setdefault('after_commit', []).append(callback)
+    else:
+        await callback()
+
+
+# Функция для получения сессии. Одна транзакция на запрос: CRUD-функции
+# делают flush, commit выполняется один раз после обработчика. Соединение
+# берется из пула при первом запросе к БД, запросы, отклоненные до обращения
+# к БД (валидация, авторизация), пул не занимают
+async def get_db(request: Request = None):
     async with AsyncSessionLocal() as db:
+        db.info['unit_of_work'] = True
+        try:
+            yield db
+            if db.in_transaction():
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        for callback in db.info.pop('after_commit', []):
+            try:
+                await callback()
+            except Exception:
+                # Данные уже сохранены, ответ клиенту не должен падать
+                logger_file.exception('After commit callback failed')
+
+        if replica_router is not None and request is not None and db.info.get('has_writes'):
+            setattr(request.state, LAST_WRITE_STATE, time.time())
+
+
+# Сессия для чтения: реплика, если она настроена, не отстает и клиент
+# недавно ничего не записывал, иначе сессия основной БД из get_db
+async def get_read_db(request: Request = None, db: AsyncSession = Depends(get_db)):
+    if replica_router is None or await replica_router.use_primary(get_last_write(request)):
+        await set_read_only(db)
         yield db
+        return
+
+    async with ReadSessionLocal(bind=get_read_only_engine(read_engine)) as read_db:
+        yield read_db
 
 
 # Функция для создания таблиц
@@ -0,0 +1,92 @@
+import logging
+import time
+from enum import IntEnum
+from typing import Optional
+
+from prometheus_client import Gauge
+
+logger_file = logging.getLogger('file_logger')
+
+
+class CircuitState(IntEnum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitOpenError(Exception):
+    """Цепь разомкнута: вызов отклонен без обращения к сервису"""
+
+
+class CircuitBreaker:
+    """Circuit breaker для асинхронных вызовов внешнего сервиса.
+
+    closed - вызовы проходят, ошибки из failure_exceptions считаются подряд;
+    open - после failure_threshold ошибок вызовы сразу получают CircuitOpenError;
+    half-open - через reset_timeout пропускается один пробный вызов,
+    успех замыкает цепь, ошибка снова размыкает ее.
+
+    Прочие исключения (отмена задачи, ошибка шаблона) о сервисе ничего не
+    говорят: состояние и счетчик ошибок не меняются.
+
+        async with breaker:
+            await call_service()
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int,
+            reset_timeout: float,
+            failure_exceptions: tuple[type[BaseException], ...],
+            state_gauge: Optional[Gauge] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_exceptions = failure_exceptions
+        self.state_gauge = state_gauge
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._set_state(CircuitState.CLOSED)
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    async def __aenter__(self) -> 'CircuitBreaker':
+        state = self.state
+        if state == CircuitState.OPEN or (state == CircuitState.HALF_OPEN and self._trial_running):
+            raise CircuitOpenError(f'Circuit {self.name} is open')
+        if state == CircuitState.HALF_OPEN:
+            self._trial_running = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._trial_running = False
+        if exc_type is None:
+            self._on_success()
+        elif issubclass(exc_type, self.failure_exceptions):
+            self._on_failure()
+        return False
+
+    def _on_failure(self) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
+
+    def _on_success(self) -> None:
+        self._failures = 0
+        self._set_state(CircuitState.CLOSED)
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self._state:
+            logger_file.warning(f'Circuit {self.name}: {self._state.name} -> {state.name}')
+        self._state = state
+        if self.state_gauge is not None:
+            self.state_gauge.labels(self.name).set(state)
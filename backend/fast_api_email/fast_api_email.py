@@ -1,16 +1,85 @@
+import asyncio
 import datetime
 import logging
+from functools import lru_cache
 
-from aiosmtplib import SMTPDataError
+from aiosmtplib import (SMTPDataError,
+                        SMTPConnectError,
+                        SMTPServerDisconnected,
+                        SMTPTimeoutError)
 
-from fastapi_mail import FastMail, MessageSchema, MessageType
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+from jinja2 import Environment
+from fastapi_mail.errors import ConnectionErrors
+from pydantic import PrivateAttr
 
-from backend.core.config import CONF
+from backend.core.config import (CONF,
+                                 MAIL_BREAKER_FAILURES,
+                                 MAIL_BREAKER_RESET_TIMEOUT)
+from backend.core.metrics import CIRCUIT_STATE
+from backend.fast_api_email.circuit_breaker import CircuitBreaker
 from backend.schemas.user import UserForEmail
 
 
 logger_file = logging.getLogger('file_logger')
 
+# Ошибки недоступности SMTP-сервера. SMTPDataError означает, что сервер
+# отклонил конкретное письмо, и на состояние цепи не влияет
+SMTP_FAILURES = (
+    ConnectionErrors,
+    SMTPConnectError,
+    SMTPServerDisconnected,
+    SMTPTimeoutError,
+    asyncio.TimeoutError,
+    OSError,
+)
+
+smtp_breaker = CircuitBreaker(
+    'smtp',
+    failure_threshold=MAIL_BREAKER_FAILURES,
+    reset_timeout=MAIL_BREAKER_RESET_TIMEOUT,
+    failure_exceptions=SMTP_FAILURES,
+    state_gauge=CIRCUIT_STATE,
+)
+
+
+class TemplateCacheConfig(ConnectionConfig):
+    """ConnectionConfig, который создает окружение Jinja один раз"""
+
+    _template_env: Environment | None = PrivateAttr(None)
+
+    def template_engine(self) -> Environment:
+        if self._template_env is None:
+            self._template_env = super().template_engine()
+        return self._template_env
+
+
+class TemplateCacheMail(FastMail):
+    """FastMail с одним окружением Jinja на процесс.
+
+    FastMail вызывает config.template_engine() на каждое письмо, и новое
+    окружение компилирует шаблон заново. Здесь config заменяется на
+    TemplateCacheConfig: окружение одно, скомпилированный шаблон берется
+    из его кеша.
+    """
+
+    def __init__(self, config: ConnectionConfig):
+        super().__init__(TemplateCacheConfig(**config.model_dump()))
+        self.template_env = self.config.template_engine()
+
+    def warm_up(self) -> list[str]:
+        # Компилирует все шаблоны заранее, чтобы первое письмо не ждало
+        names = self.template_env.list_templates()
+        for name in names:
+            self.template_env.get_template(name)
+        return names
+
+
+@lru_cache
+def get_mail() -> TemplateCacheMail:
+    return TemplateCacheMail(CONF)
+
+
 async def send_email(
         user: UserForEmail,
         subject: str,
@@ -29,12 +98,10 @@ async def send_email(
             subtype=MessageType.html
         )
 
-        fm = FastMail(CONF)
-
-        await fm.send_message(
-            message,
-            template_name=template_name,
-        )
+        async with smtp_breaker:
+            await get_mail().send_message(
+                message,
+                template_name=template_name,
+            )
     except SMTPDataError as smtp:
         logger_file.warning(f'Ошибка данных SMTP: {smtp}')
-
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, status
 import uvicorn
 
@@ -5,12 +7,37 @@ from backend.api.v1.endpoints.auth import router as auth_router
 from backend.api.v1.endpoints.users import router as users_router
 from backend.api.v1.endpoints.articles import router as articles_router
 from backend.api.v1.endpoints.comments import router as comments_router
-from backend.core.config import HOST, PORT
+from backend.api.v1.endpoints.service import router as service_router
+from backend.api.v1.endpoints.health import router as health_router
+from backend.api.v1.endpoints.metrics import router as metrics_router
+from backend.core.config import HOST, PORT, DB_REPLICA_STICKY_SECONDS
+from backend.core.compression import CompressionMiddleware
+from backend.core.metrics import instrument_pool
+from backend.core.middleware import AccessLogMiddleware
+from backend.core.openapi import setup_openapi
+from backend.core.responses import default_response_class
+from backend.core.warmup import warm_up
+from backend.db.replica import LastWriteCookieMiddleware
+from backend.db.session import (dispose_engines,
+                                engine,
+                                read_engine)
+from backend.tasks.dispatch import backend as task_backend
+
 
-# @asynccontextmanager
-# async def lifespan(app: FastAPI):
-#     await create_tables()
-#     yield
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await task_backend.start()
+    for name, pool_engine in (('primary', engine), ('replica', read_engine)):
+        if pool_engine is not None:
+            instrument_pool(pool_engine, name)
+    # Запросы принимаются после прогрева соединений, выражений и схем
+    await warm_up(app, [engine] + ([read_engine] if read_engine is not None else []))
+    yield
+    app.state.ready = False
+    # Дожидаемся выполнения поставленных задач перед остановкой
+    await task_backend.stop()
+    # Пулы закрываются последними: задачам при остановке тоже нужна БД
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -20,13 +47,30 @@ app = FastAPI(
     contact={
         'name': 'Александр',
         'email': 'alex_77_90@mail.ru'
-    }
+    },
+    lifespan=lifespan,
+    default_response_class=default_response_class,
+    # Схема и документация отдаются из собранного файла (core/openapi.py)
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
 
+app.state.ready = False
+
+app.add_middleware(LastWriteCookieMiddleware, sticky_seconds=DB_REPLICA_STICKY_SECONDS)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AccessLogMiddleware)
+
 app.include_router(articles_router)
 app.include_router(auth_router)
 app.include_router(comments_router)
 app.include_router(users_router)
+app.include_router(service_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
+
+setup_openapi(app)
 
 
 @app.get(
@@ -65,5 +109,7 @@ async def root():
     return {'message': 'Welcome to the Articles API!'}
 
 
+# Запуск для разработки (перезагрузка при изменении кода).
+# В production: python -m backend.server
 if __name__ == '__main__':
     uvicorn.run('main:app', host=HOST, port=PORT, reload=True)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    waits: int
+    wait_time_total_ms: float
+    wait_time_max_ms: float
+    timeouts: int
+
+
+class HealthCheckResponse(BaseModel):
+    status: str
+    duration_ms: Optional[float] = None
+    saturation: Optional[float] = None
+    error: Optional[str] = None
+
+
+class HealthResponse(BaseModel):
+    status: str
+    checks: dict[str, HealthCheckResponse] = {}
@@ -0,0 +1,203 @@
+"""Запуск приложения в production
+
+    python -m backend.server [--workers N] [--host HOST] [--port PORT]
+
+Главный процесс импортирует приложение (preload), замораживает объекты
+сборщика мусора (gc.freeze) и создает процессы uvicorn с uvloop и httptools
+через fork: код и данные модулей остаются общими страницами памяти
+(copy-on-write), сборщик мусора не трогает их счетчики и не копирует страницы.
+Все процессы принимают соединения с одного сокета. Метрики процессов
+пишутся в файлы METRICS_DIR, /metrics отдает их сумму.
+
+SIGTERM/SIGINT главному процессу: процессы перестают принимать соединения,
+дожидаются текущих запросов (WEB_GRACEFUL_TIMEOUT), выполняют lifespan
+(задачи, пулы соединений) и завершаются. Упавший процесс перезапускается.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+
+import uvicorn
+
+from backend.core.config import (HOST,
+                                 PORT,
+                                 WEB_WORKERS,
+                                 WEB_BACKLOG,
+                                 WEB_GRACEFUL_TIMEOUT,
+                                 METRICS_DIR,
+                                 log_queue)
+
+logger_console = logging.getLogger('console_logger')
+
+# Процесс, упавший быстрее, перезапускается с паузой, а не в цикле
+MIN_WORKER_LIFETIME = 1
+
+STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+def create_socket(host: str, port: int, backlog: int = WEB_BACKLOG) -> socket.socket:
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def prepare_metrics_dir(directory: Path) -> None:
+    # Вызывается до импорта prometheus_client: режим нескольких процессов
+    # выбирается по переменной окружения при импорте
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob('*.db'):
+        path.unlink()
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = str(directory)
+
+
+def run_worker(app, sock: socket.socket, worker_id: int, graceful_timeout: float) -> None:
+    from backend.tasks.dispatch import backend as task_backend
+    from backend.tasks.local_pool import worker_queue_file
+
+    # Журнал локальной очереди задач у каждого процесса свой
+    if hasattr(task_backend, 'queue_file'):
+        task_backend.queue_file = worker_queue_file(task_backend.queue_file, worker_id)
+
+    config = uvicorn.Config(
+        app,
+        loop='uvloop',
+        http='httptools',
+        lifespan='on',
+        timeout_graceful_shutdown=graceful_timeout,
+        # Логирование настроено в core/config.py, access-лог пишет AccessLogMiddleware
+        log_config=None,
+        access_log=False,
+        proxy_headers=True,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """Главный процесс: создает рабочие процессы и следит за ними"""
+
+    def __init__(self, app, sock: socket.socket, workers: int, graceful_timeout: float):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children: dict[int, tuple[int, float]] = {}
+        self.stopping = False
+
+    def spawn(self, worker_id: int) -> None:
+        # Сигнал между fork и заменой обработчиков выполнил бы stop главного
+        # процесса в рабочем, поэтому на время fork сигналы задерживаются
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        pid = os.fork()
+        if pid:
+            self.children[pid] = (worker_id, time.monotonic())
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+            return
+
+        # Рабочий процесс: Ctrl+C терминала получает только главный процесс,
+        # сигналы остановки uvicorn установит сам
+        exit_code = 1
+        try:
+            os.setpgid(0, 0)
+            for signum in STOP_SIGNALS:
+                signal.signal(signum, signal.SIG_DFL)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+            run_worker(self.app, self.sock, worker_id, self.graceful_timeout)
+            exit_code = 0
+        except BaseException:
+            logger_console.exception(f'Worker {worker_id} failed')
+        finally:
+            # os._exit не вызывает atexit: очередь логов дописывается явно
+            log_queue.stop()
+            logging.shutdown()
+            os._exit(exit_code)
+
+    def stop(self, signum, frame) -> None:
+        if not self.stopping:
+            logger_console.info(f'Received {signal.Signals(signum).name}, draining {len(self.children)} worker(s)')
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        from prometheus_client import multiprocess
+
+        from backend.tasks.dispatch import backend as task_backend
+        from backend.tasks.local_pool import merge_orphan_journals
+
+        # Задачи из журналов процессов, которых больше нет (изменилось число
+        # процессов), выполнит процесс 0
+        if hasattr(task_backend, 'queue_file'):
+            merge_orphan_journals(task_backend.queue_file, self.workers)
+
+        for signum in STOP_SIGNALS:
+            signal.signal(signum, self.stop)
+
+        for worker_id in range(self.workers):
+            self.spawn(worker_id)
+        logger_console.info(f'Started {self.workers} worker(s) on {self.sock.getsockname()}')
+
+        while self.children:
+            pid, status = os.wait()
+            worker_id, started = self.children.pop(pid)
+            # Gauge завершенного процесса больше не учитываются в сумме
+            multiprocess.mark_process_dead(pid, str(METRICS_DIR))
+            if self.stopping:
+                continue
+
+            logger_console.warning(
+                f'Worker {worker_id} (pid {pid}) exited with code {os.waitstatus_to_exitcode(status)}, restarting'
+            )
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            if not self.stopping:
+                self.spawn(worker_id)
+
+        self.sock.close()
+        logger_console.info('All workers stopped')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Production-запуск API')
+    parser.add_argument('--workers', type=int, default=WEB_WORKERS)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--graceful-timeout', type=float, default=WEB_GRACEFUL_TIMEOUT)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    prepare_metrics_dir(METRICS_DIR)
+
+    # Preload: все модули и приложение импортируются один раз до fork
+    from backend.core.openapi import ensure_openapi
+    from backend.main import app
+
+    sock = create_socket(args.host, args.port)
+
+    # Без собранной схемы (buildopenapi) она строится до fork и остается
+    # общей, соединения с БД открывает прогрев в lifespan каждого процесса
+    ensure_openapi(app)
+
+    # Объекты, созданные при импорте, переносятся в постоянное поколение:
+    # сборщик мусора в рабочих процессах их не обходит и не копирует страницы
+    gc.collect()
+    gc.freeze()
+
+    Supervisor(app, sock, max(args.workers, 1), args.graceful_timeout).run()
+
+
+if __name__ == '__main__':
+    main()
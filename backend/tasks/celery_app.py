@@ -1,35 +1,56 @@
-import os
+from asgiref.sync import async_to_sync
 from celery import Celery
-from dotenv import load_dotenv
-
-load_dotenv()
-
+from kombu import Queue
+
+from backend.core.config import (REDIS_URL,
+                                 CELERY_PREFETCH_MULTIPLIER,
+                                 CELERY_VISIBILITY_TIMEOUT,
+                                 TASK_MAX_RETRIES)
+from backend.tasks import email_tasks  # noqa: F401 - регистрация задач в реестре
+from backend.tasks.dispatch import (TASKS,
+                                    QUEUE_HIGH,
+                                    QUEUE_LOW)
+from backend.tasks.retry import (RetryTask,
+                                 retry_delay)
+
+# Результаты задач никто не читает, поэтому result backend не подключается
 celery_app = Celery(
     'tasks',
-    broker=os.getenv('REDIS_URL'),
-    backend=os.getenv('REDIS_URL'),
-    include=['backend.tasks']
+    broker=REDIS_URL,
 )
 
 
 celery_app.conf.update(
     task_serializer='json',
     accept_content=['json'],
-    result_serializer='json',
     timezone='UTC',
-    enable_utc=True
+    enable_utc=True,
+    task_ignore_result=True,
+    task_store_errors_even_if_ignored=False,
+    # Подтверждение после выполнения: задача упавшего воркера вернется в очередь
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=CELERY_PREFETCH_MULTIPLIER,
+    broker_transport_options={'visibility_timeout': CELERY_VISIBILITY_TIMEOUT},
+    task_queues=(
+        Queue(QUEUE_HIGH),
+        Queue(QUEUE_LOW),
+    ),
+    task_default_queue=QUEUE_LOW,
+    task_routes={name: {'queue': func.queue} for name, func in TASKS.items()},
 )
 
 
+def register_task(name: str, func) -> None:
+    # Воркер Celery синхронный, корутина выполняется в собственном цикле событий
+    @celery_app.task(name=name, bind=True, max_retries=TASK_MAX_RETRIES)
+    def run(self, **kwargs):
+        try:
+            async_to_sync(func)(**kwargs)
+        except RetryTask as exc:
+            # Отложенный повтор через брокер, слот воркера освобождается сразу
+            raise self.retry(exc=exc, countdown=retry_delay(self.request.retries))
 
 
-
-
-
-
-
-
-
-
-
-
+for task_name, task_func in TASKS.items():
+    register_task(task_name, task_func)
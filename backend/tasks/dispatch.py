@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from functools import partial
+from typing import (Awaitable,
+                    Callable)
+
+from backend.core.config import (TASK_BACKEND,
+                                 TASK_WORKERS,
+                                 TASK_QUEUE_SIZE,
+                                 TASK_QUEUE_FILE,
+                                 TASK_DRAIN_TIMEOUT,
+                                 TASK_MAX_RETRIES)
+
+logger_console = logging.getLogger('console_logger')
+
+# Очереди Celery: срочные письма (регистрация) не ждут массовых рассылок
+QUEUE_HIGH = 'high'
+QUEUE_LOW = 'low'
+
+# Реестр фоновых задач: имя задачи -> корутинная функция
+TASKS: dict[str, Callable[..., Awaitable[None]]] = {}
+
+
+def task(name: str, queue: str = QUEUE_LOW) -> Callable:
+    """Регистрирует корутинную функцию как фоновую задачу.
+
+    У функции появляется метод enqueue(**kwargs), который ставит задачу
+    в очередь активного бэкенда. Аргументы должны сериализоваться в JSON.
+    """
+    def decorator(func):
+        TASKS[name] = func
+        func.queue = queue
+        func.enqueue = partial(enqueue, name)
+        return func
+
+    return decorator
+
+
+class CeleryBackend:
+    """Отправка задач брокеру Celery, выполняет их отдельный воркер"""
+
+    def __init__(self):
+        self.app = None
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        # Закрывает соединения с брокером, если задачи отправлялись
+        if self.app is not None:
+            await asyncio.to_thread(self.app.close)
+
+    async def enqueue(self, name: str, **kwargs) -> None:
+        from backend.tasks.celery_app import celery_app
+
+        self.app = celery_app
+        # send_task блокирует поток на время записи в брокер
+        await asyncio.to_thread(celery_app.send_task, name, kwargs=kwargs)
+
+
+def create_backend(name: str = TASK_BACKEND):
+    if name == 'celery':
+        return CeleryBackend()
+    if name == 'local':
+        from backend.tasks.local_pool import LocalTaskPool
+
+        return LocalTaskPool(
+            TASKS,
+            workers=TASK_WORKERS,
+            maxsize=TASK_QUEUE_SIZE,
+            queue_file=TASK_QUEUE_FILE,
+            drain_timeout=TASK_DRAIN_TIMEOUT,
+            max_retries=TASK_MAX_RETRIES,
+        )
+    raise ValueError(f'Unknown task backend: {name}')
+
+
+backend = create_backend()
+
+
+async def enqueue(name: str, **kwargs) -> None:
+    if name not in TASKS:
+        raise KeyError(f'Task {name} is not registered')
+    await backend.enqueue(name, **kwargs)
+    # Метрики загружаются при первой задаче: команды ставят задачи редко
+    from backend.core.metrics import TASKS_ENQUEUED
+
+    TASKS_ENQUEUED.labels(name, TASK_BACKEND).inc()
+    logger_console.debug(f'Task {name} enqueued')
@@ -1,8 +1,26 @@
+import logging
+
 from backend.schemas.user import UserForEmail
-from backend.fast_api_email.fast_api_email import send_email
-from .celery_app import celery_app
+from .dispatch import (task,
+                       QUEUE_HIGH)
+from .retry import RetryTask
+
+logger_file = logging.getLogger('file_logger')
+
 
+@task(name='send_email_task', queue=QUEUE_HIGH)
+async def send_email_task(user: dict | UserForEmail, subject: str, template_name: str, link: str):
+    # Почтовый стек (fastapi_mail, jinja2, aiosmtplib) загружается при первом
+    # письме, а не при импорте crud и команд
+    from backend.fast_api_email.circuit_breaker import CircuitOpenError
+    from backend.fast_api_email.fast_api_email import (send_email,
+                                                       SMTP_FAILURES)
 
-@celery_app.task(name='send_email_task')
-async def send_email_task(user: UserForEmail, subject: str, template_name: str, link: str):
-    await send_email(user, subject, template_name, link)
+    try:
+        await send_email(UserForEmail.model_validate(user), subject, template_name, link)
+    except CircuitOpenError as error:
+        # Сервер недоступен: не ждем таймаут соединения, откладываем письмо
+        raise RetryTask(str(error)) from error
+    except SMTP_FAILURES as error:
+        logger_file.warning(f'SMTP unavailable: {error}')
+        raise RetryTask(str(error)) from error
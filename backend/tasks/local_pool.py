@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import (Awaitable,
+                    Callable,
+                    Optional)
+from uuid import uuid4
+
+from backend.tasks.retry import (RetryTask,
+                                 retry_delay)
+
+logger_console = logging.getLogger('console_logger')
+logger_file = logging.getLogger('file_logger')
+
+
+def worker_queue_file(queue_file: Path, worker_id: int) -> Path:
+    """Журнал рабочего процесса worker_id в python -m backend.server"""
+    return queue_file.with_name(f'{queue_file.stem}.{worker_id}{queue_file.suffix}')
+
+
+def is_worker_queue_file(path: Path, queue_file: Path) -> bool:
+    name = path.name
+    if not name.startswith(f'{queue_file.stem}.') or not name.endswith(queue_file.suffix):
+        return False
+    return name[len(queue_file.stem) + 1:len(name) - len(queue_file.suffix)].isdigit()
+
+
+def merge_orphan_journals(queue_file: Path, workers: int) -> list[Path]:
+    """Переносит журналы, которые не прочитает ни один процесс, в журнал процесса 0.
+
+    Вызывается главным процессом до fork. Без хозяина остаются журналы
+    процессов с номером >= workers (WEB_WORKERS уменьшили) и журнал без
+    номера (запуск без backend.server), их задачи иначе бы потерялись.
+    Возвращает перенесенные файлы.
+    """
+    queue_file = Path(queue_file)
+    target = worker_queue_file(queue_file, 0)
+    owned = {worker_queue_file(queue_file, worker_id) for worker_id in range(workers)}
+    orphans = sorted(
+        path for path in queue_file.parent.glob(f'{queue_file.stem}*')
+        if path not in owned and (path == queue_file or is_worker_queue_file(path, queue_file))
+    )
+    if not orphans:
+        return []
+
+    # Файл заменяется целиком, и только потом удаляются источники: при
+    # падении между шагами задачи выполнятся повторно, но не пропадут
+    chunks = [path.read_text(encoding='utf8') for path in (target, *orphans) if path.exists()]
+    temp_file = target.with_name(f'{target.name}.tmp')
+    # Недописанная последняя строка журнала не должна склеиться со следующим файлом
+    temp_file.write_text(''.join(chunk if chunk.endswith('\n') else f'{chunk}\n' for chunk in chunks if chunk),
+                         encoding='utf8')
+    os.replace(temp_file, target)
+    for path in orphans:
+        path.unlink()
+    logger_console.info(f'Merged task journal(s) {", ".join(path.name for path in orphans)} into {target.name}')
+    return orphans
+
+
+class LocalTaskPool:
+    """Ограниченный пул asyncio-воркеров с журналом задач на диске.
+
+    Каждая задача записывается в файл очереди до постановки в очередь,
+    после выполнения в файл дописывается отметка о завершении. Задачи без
+    отметки (остановка по таймауту, падение процесса) выполняются повторно
+    при следующем запуске пула.
+
+    Задача, бросившая RetryTask, возвращается в очередь по таймеру с
+    экспоненциальной задержкой и не занимает воркер на время ожидания.
+    """
+
+    def __init__(
+            self,
+            tasks: dict[str, Callable[..., Awaitable[None]]],
+            workers: int,
+            maxsize: int,
+            queue_file: str | Path,
+            drain_timeout: float,
+            max_retries: int = 0,
+    ):
+        self.tasks = tasks
+        self.workers = workers
+        self.maxsize = maxsize
+        self.queue_file = Path(queue_file)
+        self.drain_timeout = drain_timeout
+        self.max_retries = max_retries
+        self._delayed: dict[str, asyncio.TimerHandle] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._journal = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        if self.running:
+            return
+
+        pending = self._load_pending()
+        self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+        # Журнал переписывается при старте: в нем остаются только невыполненные задачи
+        self._journal = open(self.queue_file, 'w', encoding='utf8')
+        for record in pending:
+            self._write(record)
+
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        for record in pending:
+            await self._queue.put(record)
+
+        if pending:
+            logger_console.info(f'Restored {len(pending)} task(s) from {self.queue_file}')
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger_file.warning(f'Task queue not drained, {self._queue.qsize()} task(s) left in {self.queue_file}')
+
+        # Отложенные повторы остаются в журнале и выполнятся при следующем запуске
+        for handle in self._delayed.values():
+            handle.cancel()
+        self._delayed.clear()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._journal.close()
+        self._journal = None
+
+    async def enqueue(self, name: str, **kwargs) -> None:
+        record = {'id': uuid4().hex, 'name': name, 'kwargs': kwargs}
+        if not self.running:
+            # Пул не запущен (CLI, тесты без lifespan) - выполняем задачу сразу
+            await self._execute(record)
+            return
+
+        self._write(record)
+        await self._queue.put(record)
+
+    async def _worker(self) -> None:
+        while True:
+            record = await self._queue.get()
+            # При отмене задача остается в журнале без отметки и будет выполнена повторно
+            await self._execute(record)
+            self._write({'id': record['id'], 'done': True})
+            self._queue.task_done()
+
+    async def _execute(self, record: dict) -> None:
+        try:
+            await self.tasks[record['name']](**record['kwargs'])
+        except RetryTask:
+            self._retry(record)
+        except Exception:
+            logger_file.exception(f'Task {record["name"]} failed')
+
+    def _retry(self, record: dict) -> None:
+        attempt = record.get('attempt', 0) + 1
+        if not self.running or attempt > self.max_retries:
+            logger_file.error(f'Task {record["name"]} dropped after {attempt} attempt(s)')
+            return
+
+        retry_record = {**record, 'id': uuid4().hex, 'attempt': attempt}
+        self._write(retry_record)
+        self._schedule(retry_record, retry_delay(attempt - 1))
+
+    def _schedule(self, record: dict, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._delayed[record['id']] = loop.call_later(delay, self._put_delayed, record)
+
+    def _put_delayed(self, record: dict) -> None:
+        self._delayed.pop(record['id'], None)
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._schedule(record, retry_delay(record['attempt']))
+
+    def _write(self, record: dict) -> None:
+        self._journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._journal.flush()
+
+    def _load_pending(self) -> list[dict]:
+        if not self.queue_file.exists():
+            return []
+
+        pending: dict[str, dict] = {}
+        with open(self.queue_file, encoding='utf8') as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Недописанная строка после аварийной остановки
+                    continue
+                if record.get('done'):
+                    pending.pop(record['id'], None)
+                elif record.get('name') in self.tasks:
+                    pending[record['id']] = record
+        return list(pending.values())
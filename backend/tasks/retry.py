@@ -0,0 +1,14 @@
+import random
+
+from backend.core.config import (TASK_RETRY_BASE_DELAY,
+                                 TASK_RETRY_MAX_DELAY)
+
+
+class RetryTask(Exception):
+    """Задачу нужно повторить позже: внешний сервис временно недоступен"""
+
+
+def retry_delay(attempt: int) -> float:
+    # Экспоненциальная задержка с джиттером: повторы не приходят пачкой
+    delay = min(TASK_RETRY_MAX_DELAY, TASK_RETRY_BASE_DELAY * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,27 @@
+"""Запуск воркера Celery с настройками из core/config.py
+
+    python -m backend.tasks.worker
+"""
+from celery import maybe_patch_concurrency
+
+from backend.core.config import (CELERY_POOL,
+                                 CELERY_AUTOSCALE_MAX,
+                                 CELERY_AUTOSCALE_MIN,
+                                 CELERY_WORKER_QUEUES)
+
+argv = [
+    'worker',
+    f'--pool={CELERY_POOL}',
+    f'--autoscale={CELERY_AUTOSCALE_MAX},{CELERY_AUTOSCALE_MIN}',
+    f'--queues={CELERY_WORKER_QUEUES}',
+    '--loglevel=info',
+]
+
+# Патчи gevent применяются до импорта приложения Celery и его зависимостей
+maybe_patch_concurrency(argv)
+
+from backend.tasks.celery_app import celery_app  # noqa: E402
+
+
+if __name__ == '__main__':
+    celery_app.worker_main(argv)
@@ -1,3 +1,6 @@
+import asyncio
+
+import pytest
 from async_asgi_testclient import TestClient
 from sqlalchemy.future import select
 
@@ -6,6 +9,7 @@ from backend.api.v1.endpoints.auth import router as auth_router
 from backend.db.session import get_db
 from backend.tests.conftest import test_data
 from backend.db.models.user import Token
+from backend.core.throttle import ResendThrottle
 
 
 async def test_register_success(db_session):
@@ -174,3 +178,75 @@ async def test_get_link(db_session, test_data):
 
         assert response.status_code == 200
         assert data.get('message') == 'link was sent'
+
+
+async def test_get_link_active_user(db_session, auth_client, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(0)
+
+    response = await client.get(f'{auth_router.prefix}/get_link')
+    data = response.json()
+    user = test_data.get('users')[0]
+    await db_session.refresh(user)
+
+    assert response.status_code == 200
+    assert data.get('message') == 'User already active'
+    assert user.conf_reg_link is None
+
+
+async def test_get_link_repeated_reuses_link(db_session, auth_client, test_data, mocker):
+    app.dependency_overrides[get_db] = lambda: db_session
+    enqueue = mocker.patch('backend.crud.user.send_email_task.enqueue')
+    mocker.patch('backend.crud.user.link_throttle.interval', 0)
+    mocker.patch('backend.crud.user.CONF_LINK_RESEND_INTERVAL', 0)
+    client = await auth_client(2)
+    user = test_data.get('users')[2]
+
+    await client.get(f'{auth_router.prefix}/get_link')
+    await db_session.refresh(user)
+    first_link = user.conf_reg_link
+    await client.get(f'{auth_router.prefix}/get_link')
+    await db_session.refresh(user)
+
+    first_url = enqueue.call_args_list[0].kwargs['link']
+    second_url = enqueue.call_args_list[1].kwargs['link']
+    assert enqueue.call_count == 2
+    assert user.conf_reg_link == first_link
+    assert first_url == second_url
+
+
+async def test_get_link_coalesces_within_interval(db_session, auth_client, test_data, mocker):
+    app.dependency_overrides[get_db] = lambda: db_session
+    enqueue = mocker.patch('backend.crud.user.send_email_task.enqueue')
+    mocker.patch('backend.crud.user.link_throttle', ResendThrottle(60))
+    client = await auth_client(2)
+
+    responses = [await client.get(f'{auth_router.prefix}/get_link') for _ in range(3)]
+
+    assert [response.json().get('message') for response in responses] == ['link was sent'] * 3
+    assert enqueue.call_count == 1
+
+
+async def test_throttle_waiter_keeps_lock():
+    throttle = ResendThrottle(60)
+    running = set()
+    overlapped = []
+
+    async def send():
+        async with throttle.acquire('key'):
+            overlapped.append(bool(running))
+            running.add(asyncio.current_task())
+            await asyncio.sleep(0.01)
+            running.discard(asyncio.current_task())
+
+    with pytest.raises(ConnectionError):
+        async with throttle.acquire('key'):
+            waiter = asyncio.create_task(send())
+            await asyncio.sleep(0)
+            raise ConnectionError
+    # Ожидающий разбужен, но еще не запущен: новый запрос ждет ту же блокировку
+    await send()
+    await waiter
+
+    assert overlapped == [False, False]
+    assert throttle._locks == {}
@@ -0,0 +1,108 @@
+import gzip
+
+import brotli
+import httpx
+import pytest
+from fastapi import (FastAPI,
+                     Response)
+
+from backend.core.compression import (CompressionMiddleware,
+                                      choose_encoding)
+
+BODY = {'content': 'Текст статьи ' * 200}
+
+
+@pytest.fixture
+def compression_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache_size=8)
+
+    @app.get('/big')
+    async def big():
+        return BODY
+
+    @app.get('/small')
+    async def small():
+        return {'message': 'ok'}
+
+    @app.get('/encoded')
+    async def encoded():
+        return Response(gzip.compress(b'x' * 1000), media_type='text/plain', headers={'Content-Encoding': 'gzip'})
+
+    return app
+
+
+def get_middleware(app: FastAPI) -> CompressionMiddleware:
+    app.build_middleware_stack()
+    middleware = app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+    return middleware
+
+
+async def request(app, path, accept_encoding=None):
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {'Accept-Encoding': 'identity'}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get(path, headers=headers)
+        return response, await response.aread()
+
+
+def test_choose_encoding():
+    assert choose_encoding('gzip, deflate, br') == 'br'
+    assert choose_encoding('gzip, br;q=0') == 'gzip'
+    assert choose_encoding('deflate') is None
+    assert choose_encoding('*') == 'br'
+    assert choose_encoding('') is None
+    # Выбирается наибольший q, предпочтение сервера - только при равных
+    assert choose_encoding('gzip;q=1, br;q=0.1') == 'gzip'
+    assert choose_encoding('gzip;q=0.5, br;q=0.5') == 'br'
+    assert choose_encoding('br;q=0.2, *;q=0.8') == 'gzip'
+
+
+async def test_brotli_preferred(compression_app):
+    response, _ = await request(compression_app, '/big', 'gzip, br')
+
+    assert response.headers['content-encoding'] == 'br'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.json() == BODY
+    assert int(response.headers['content-length']) < len(response.content)
+
+
+async def test_gzip(compression_app):
+    response, _ = await request(compression_app, '/big', 'gzip')
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.json() == BODY
+
+
+async def test_small_response_not_compressed(compression_app):
+    response, _ = await request(compression_app, '/small', 'gzip, br')
+
+    assert 'content-encoding' not in response.headers
+    assert response.json() == {'message': 'ok'}
+
+
+async def test_identity_keeps_vary(compression_app):
+    response, _ = await request(compression_app, '/big')
+
+    assert 'content-encoding' not in response.headers
+    assert response.headers['vary'] == 'Accept-Encoding'
+
+
+async def test_encoded_response_passed_through(compression_app):
+    response, _ = await request(compression_app, '/encoded', 'br')
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.content == b'x' * 1000
+
+
+async def test_repeated_body_compressed_once(compression_app, mocker):
+    compress = mocker.spy(brotli, 'compress')
+
+    for _ in range(3):
+        response, _ = await request(compression_app, '/big', 'br')
+        assert response.json() == BODY
+
+    cache = get_middleware(compression_app).cache
+    assert compress.call_count == 1
+    assert (cache.hits, cache.misses) == (2, 1)
@@ -0,0 +1,99 @@
+import asyncio
+
+from async_asgi_testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.v1.endpoints.health import router as health_router
+from backend.core.health import (HealthChecker,
+                                 SaturationTracker)
+from backend.db.pool import InstrumentedQueuePool
+from backend.tests.conftest import (app,
+                                    TEST_DATABASE_URL)
+
+
+async def test_live():
+    response = await TestClient(app).get(f'{health_router.prefix}/live')
+
+    assert response.status_code == 200
+    assert response.json()['status'] == 'alive'
+
+
+async def test_ready():
+    response = await TestClient(app).get(f'{health_router.prefix}/ready')
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data['status'] == 'ready'
+    assert data['checks']['database']['status'] == 'ok'
+    assert data['checks']['pool']['status'] == 'ok'
+
+
+async def test_not_ready_until_warmed_up():
+    app.state.ready = False
+    try:
+        response = await TestClient(app).get(f'{health_router.prefix}/ready')
+    finally:
+        del app.state.ready
+
+    assert response.status_code == 503
+    assert response.json()['status'] == 'not_ready'
+
+
+async def test_dependency_results_cached():
+    calls = []
+
+    async def broker():
+        calls.append(1)
+
+    checker = HealthChecker(create_async_engine(TEST_DATABASE_URL), broker, cache_seconds=60)
+    try:
+        results = await asyncio.gather(*(checker.readiness() for _ in range(5)))
+        await checker.readiness()
+    finally:
+        await checker.engine.dispose()
+
+    assert all(is_ready for is_ready, _ in results)
+    assert len(calls) == 1
+
+
+async def test_broker_timeout():
+    async def broker():
+        await asyncio.sleep(10)
+
+    checker = HealthChecker(create_async_engine(TEST_DATABASE_URL), broker, timeout=0.05)
+    try:
+        is_ready, checks = await checker.readiness()
+    finally:
+        await checker.engine.dispose()
+
+    assert not is_ready
+    assert checks['database']['status'] == 'ok'
+    assert checks['broker'] == {'status': 'error', 'duration_ms': checks['broker']['duration_ms'], 'error': 'timeout'}
+    assert checks['broker']['duration_ms'] < 1000
+
+
+async def test_saturated_pool_not_ready():
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0)
+    checker = HealthChecker(engine, timeout=0.2, saturation_threshold=0.9, saturation_window=0)
+    try:
+        is_ready, _ = await checker.readiness()
+        async with engine.connect():
+            saturated, checks = await checker.readiness()
+        recovered, _ = await checker.readiness()
+    finally:
+        await engine.dispose()
+
+    assert is_ready
+    assert not saturated
+    assert checks['pool'] == {'status': 'saturated', 'saturation': 1.0}
+    assert recovered
+
+
+def test_saturation_must_persist():
+    tracker = SaturationTracker(threshold=0.9, window=5)
+
+    assert not tracker.update(1.0, now=100)
+    assert not tracker.update(0.95, now=103)
+    assert tracker.update(1.0, now=105)
+    assert not tracker.update(0.5, now=106)
+    assert not tracker.update(1.0, now=107)
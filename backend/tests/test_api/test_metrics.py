@@ -0,0 +1,93 @@
+import pytest
+from async_asgi_testclient import TestClient
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.compression import CompressedCache
+from backend.core.metrics import instrument_pool
+from backend.core.security import (get_password_hash_async,
+                                   verify_password_async)
+from backend.db.pool import InstrumentedQueuePool
+from backend.tests.conftest import (app,
+                                    TEST_DATABASE_URL)
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def test_request_duration_by_route_template():
+    labels = {'method': 'GET', 'route': '/health/live', 'status': '200'}
+    before = sample('http_request_duration_seconds_count', **labels)
+
+    client = TestClient(app)
+    for _ in range(3):
+        await client.get('/health/live')
+
+    assert sample('http_request_duration_seconds_count', **labels) == before + 3
+    assert sample('http_request_duration_seconds_bucket', le='+Inf', **labels) == before + 3
+
+
+async def test_unmatched_route_label():
+    labels = {'method': 'GET', 'route': 'unmatched', 'status': '404'}
+    before = sample('http_request_duration_seconds_count', **labels)
+
+    await TestClient(app).get('/no-such-page/12345')
+
+    assert sample('http_request_duration_seconds_count', **labels) == before + 1
+
+
+async def test_metrics_endpoint():
+    await TestClient(app).get('/health/live')
+    response = await TestClient(app).get('/metrics')
+    names = {family.name for family in text_string_to_metric_families(response.text)}
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert {'http_request_duration_seconds', 'cache_requests', 'password_hash_queue_depth'} <= names
+
+
+async def test_pool_metrics():
+    engine = create_async_engine(
+        TEST_DATABASE_URL, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    instrument_pool(engine, 'test')
+    instrument_pool(engine, 'test')
+    try:
+        async with engine.connect():
+            checked_out = sample('db_pool_checked_out', engine='test')
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+        released = sample('db_pool_checked_out', engine='test')
+    finally:
+        await engine.dispose()
+
+    assert checked_out == 1
+    assert released == 0
+    assert sample('db_pool_capacity', engine='test') == 1
+    assert sample('db_pool_timeouts_total', engine='test') == 1
+    assert engine.pool.snapshot()['timeouts'] == 1
+
+
+async def test_password_hash_in_executor():
+    hashed = await get_password_hash_async('Qwerty741')
+
+    assert await verify_password_async('Qwerty741', hashed)
+    assert sample('password_hash_queue_depth') == 0
+
+
+def test_compression_cache_hit_ratio():
+    hits = sample('cache_requests_total', cache='compression', result='hit')
+    misses = sample('cache_requests_total', cache='compression', result='miss')
+    cache = CompressedCache(maxsize=2)
+
+    cache.get((b'key', 'gzip'))
+    cache.set((b'key', 'gzip'), b'body')
+    cache.get((b'key', 'gzip'))
+    cache.get((b'key', 'gzip'))
+
+    assert sample('cache_requests_total', cache='compression', result='hit') == hits + 2
+    assert sample('cache_requests_total', cache='compression', result='miss') == misses + 1
@@ -0,0 +1,113 @@
+from datetime import (date,
+                      datetime,
+                      timezone)
+from zoneinfo import ZoneInfo
+
+import msgpack
+from async_asgi_testclient import TestClient
+from sqlalchemy import (select,
+                        text)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.api.v1.endpoints.comments import router as comments_router
+from backend.core.content_negotiation import (packb,
+                                              unpackb,
+                                              wants_msgpack)
+from backend.db.models.article import Article
+from backend.db.session import (get_connect_args,
+                                get_db)
+from backend.tests.conftest import (app,
+                                    TEST_DATABASE_URL)
+
+MSGPACK = {'Accept': 'application/msgpack'}
+
+
+def test_wants_msgpack():
+    assert wants_msgpack('application/msgpack')
+    assert wants_msgpack('application/x-msgpack, application/json;q=0.9')
+    assert not wants_msgpack('application/json, application/msgpack;q=0.5')
+    assert not wants_msgpack('*/*')
+    assert not wants_msgpack('')
+
+
+def test_datetime_encoded_as_timestamp():
+    created_at = datetime(2024, 1, 1, 12, 30, 15, 250000)
+
+    packed = packb({'created_at': created_at, 'day': date(2024, 1, 1)})
+    data = msgpack.unpackb(packed)
+
+    assert isinstance(data['created_at'], msgpack.Timestamp)
+    assert unpackb(packed)['created_at'] == created_at.replace(tzinfo=timezone.utc)
+    assert data['day'] == '2024-01-01'
+    assert len(packb(created_at)) < len(created_at.isoformat())
+
+
+async def test_naive_db_time_in_session_timezone(mocker):
+    # Пояс сессии не UTC: func.now() в колонке без зоны дает местное время
+    mocker.patch('backend.core.content_negotiation.DB_TZINFO', ZoneInfo('Asia/Tokyo'))
+    engine = create_async_engine(TEST_DATABASE_URL, connect_args=get_connect_args(timezone='Asia/Tokyo'))
+    try:
+        async with engine.connect() as conn:
+            naive, aware = (await conn.execute(text('SELECT now()::timestamp, now()'))).one()
+    finally:
+        await engine.dispose()
+
+    assert naive.tzinfo is None
+    assert unpackb(packb(naive)) == aware
+
+
+async def test_list_in_msgpack(db_session, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = TestClient(app)
+
+    response = await client.get(f'{articles_router.prefix}/', headers=MSGPACK)
+    json_response = await client.get(f'{articles_router.prefix}/')
+    articles = unpackb(response.content)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/msgpack'
+    assert 'Accept' in response.headers['vary']
+    assert [article['title'] for article in articles] == [article['title'] for article in json_response.json()]
+    assert isinstance(articles[0]['created_at'], datetime)
+    assert len(response.content) < len(json_response.content)
+
+
+async def test_comments_and_detail_in_msgpack(db_session, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = TestClient(app)
+
+    comments = unpackb((await client.get(f'{comments_router.prefix}/1', headers=MSGPACK)).content)
+    article = unpackb((await client.get(f'{articles_router.prefix}/1', headers=MSGPACK)).content)
+
+    assert [comment['author_name'] for comment in comments] == ['test_user_1', 'test_user_2']
+    assert article['author_name'] == 'test_user_1'
+
+
+async def test_create_with_msgpack_body(db_session, auth_client, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(0)
+
+    response = await client.post(
+        f'{articles_router.prefix}/create',
+        data=packb({'title': 'Msgpack article', 'content': 'Article sent as msgpack'}),
+        headers={'Content-Type': 'application/msgpack', **MSGPACK},
+    )
+    articles = (await db_session.execute(select(Article).filter(Article.title == 'Msgpack article'))).scalars().all()
+
+    assert response.status_code == 201
+    assert unpackb(response.content)['message'] == 'Article created'
+    assert len(articles) == 1
+
+
+async def test_invalid_msgpack_body(db_session, auth_client, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(0)
+
+    response = await client.post(
+        f'{articles_router.prefix}/create',
+        data=b'\xc1',
+        headers={'Content-Type': 'application/msgpack'},
+    )
+
+    assert response.status_code == 400
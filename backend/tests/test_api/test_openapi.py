@@ -0,0 +1,119 @@
+import gzip
+
+import brotli
+import orjson
+import pytest
+from async_asgi_testclient import TestClient
+from fastapi import FastAPI
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.api.v1.endpoints.auth import router as auth_router
+from backend.core.openapi import (build_openapi,
+                                  ensure_openapi,
+                                  openapi_fingerprint,
+                                  setup_openapi)
+
+
+def create_app(directory) -> FastAPI:
+    app = FastAPI(title='Articles API', version='1.2.3', openapi_url=None, docs_url=None, redoc_url=None)
+    app.include_router(auth_router)
+    app.include_router(articles_router)
+    setup_openapi(app, directory)
+    return app
+
+
+def test_build_writes_compressed_variants(tmp_path):
+    app = create_app(tmp_path)
+    paths = build_openapi(app, tmp_path)
+    body, gzipped, compressed = (path.read_bytes() for path in paths)
+    name = f'openapi-{openapi_fingerprint(app)}.json'
+
+    assert [path.name for path in paths] == [name, f'{name}.gz', f'{name}.br']
+    assert gzip.decompress(gzipped) == body
+    assert brotli.decompress(compressed) == body
+    assert f'{articles_router.prefix}/' in orjson.loads(body)['paths']
+
+
+async def test_prebuilt_schema_served_without_building(tmp_path):
+    path = build_openapi(create_app(tmp_path), tmp_path)[0]
+    app = create_app(tmp_path)
+    client = TestClient(app)
+
+    response = await client.get('/openapi.json', headers={'Accept-Encoding': 'br'})
+    plain = await client.get('/openapi.json', headers={'Accept-Encoding': 'identity'})
+    not_modified = await client.get('/openapi.json', headers={'If-None-Match': response.headers['etag']})
+
+    assert app.openapi_schema is None
+    assert response.headers['content-encoding'] == 'br'
+    assert 'max-age' in response.headers['cache-control']
+    assert brotli.decompress(response.content) == path.read_bytes()
+    assert 'content-encoding' not in plain.headers
+    assert orjson.loads(plain.content)['info']['version'] == '1.2.3'
+    assert not_modified.status_code == 304
+    assert not_modified.content == b''
+
+
+async def test_prebuilt_schema_prefers_highest_quality(tmp_path):
+    build_openapi(create_app(tmp_path), tmp_path)
+    client = TestClient(create_app(tmp_path))
+
+    response = await client.get('/openapi.json', headers={'Accept-Encoding': 'gzip;q=1, br;q=0.1'})
+
+    assert response.headers['content-encoding'] == 'gzip'
+
+
+def test_fingerprint_follows_routes(tmp_path):
+    app = create_app(tmp_path)
+    fingerprint = openapi_fingerprint(app)
+
+    assert openapi_fingerprint(create_app(tmp_path)) == fingerprint
+
+    @app.get('/extra')
+    async def extra() -> dict:
+        return {}
+
+    assert openapi_fingerprint(app) != fingerprint
+
+
+async def test_stale_schema_not_served(tmp_path):
+    build_openapi(create_app(tmp_path), tmp_path)
+    # Маршрут добавлен после сборки (и после setup_openapi): файл устарел
+    app = create_app(tmp_path)
+
+    @app.get('/extra')
+    async def extra() -> dict:
+        return {}
+
+    response = await TestClient(app).get('/openapi.json')
+
+    assert app.state.openapi is None
+    assert '/extra' in orjson.loads(response.content)['paths']
+
+
+@pytest.mark.parametrize('url', ['/docs', '/redoc'])
+async def test_docs_pages(tmp_path, url):
+    response = await TestClient(create_app(tmp_path)).get(url)
+
+    assert response.status_code == 200
+    assert '/openapi.json' in response.text
+
+
+async def test_runtime_schema_without_build(tmp_path):
+    app = create_app(tmp_path / 'missing')
+    response = await TestClient(app).get('/openapi.json')
+
+    assert app.state.openapi is None
+    assert orjson.loads(response.content) == app.openapi()
+    assert '/openapi.json' not in app.openapi()['paths']
+
+
+def test_ensure_openapi_skips_prebuilt(tmp_path):
+    build_openapi(create_app(tmp_path), tmp_path)
+    prebuilt = create_app(tmp_path)
+    runtime = create_app(tmp_path / 'missing')
+
+    ensure_openapi(prebuilt)
+    ensure_openapi(runtime)
+
+    assert prebuilt.openapi_schema is None
+    assert runtime.openapi_schema is not None
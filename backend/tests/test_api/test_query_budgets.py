@@ -0,0 +1,100 @@
+import pytest
+from async_asgi_testclient import TestClient
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.api.v1.endpoints.comments import router as comments_router
+from backend.api.v1.endpoints.users import router as users_router
+from backend.db.models.article import Article
+from backend.db.models.comment import Comment
+from backend.db.models.user import User
+from backend.db.session import get_db
+from backend.tests.conftest import app
+
+# Бюджет SQL-выражений на запрос. Проверка токена - 2 выражения (токен и пользователь)
+QUERY_BUDGETS = {
+    'articles_list': 1,
+    'article_detail': 1,
+    'article_create': 3,
+    'article_update': 5,
+    'article_delete': 5,
+    'comments_list': 1,
+    'comment_create': 4,
+    'comment_delete': 5,
+    'users_list': 3,
+    'user_profile': 2,
+    'user_update': 4,
+    'user_delete': 4,
+}
+
+
+@pytest.fixture
+def override_db(db_session):
+    app.dependency_overrides[get_db] = lambda: db_session
+
+
+async def add_rows(db_session, count):
+    authors = [
+        User(email=f'budget_{i}@mail.ru', hashed_password='hash', full_name=f'budget_{i}')
+        for i in range(count)
+    ]
+    db_session.add_all(authors)
+    await db_session.flush()
+    articles = [Article(title=f'Budget {i}', content='text', author_id=author.id) for i, author in enumerate(authors)]
+    db_session.add_all(articles)
+    db_session.add_all([Comment(content='budget', article_id=1, author_id=author.id) for author in authors])
+    await db_session.flush()
+
+
+@pytest.mark.parametrize('name, url', [
+    ('articles_list', f'{articles_router.prefix}/'),
+    ('article_detail', f'{articles_router.prefix}/1'),
+    ('comments_list', f'{comments_router.prefix}/1'),
+])
+async def test_public_read_budgets(override_db, test_data, assert_max_queries, name, url):
+    with assert_max_queries(QUERY_BUDGETS[name]):
+        response = await TestClient(app).get(url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('name, method, url, json', [
+    ('article_create', 'post', f'{articles_router.prefix}/create', {'title': 'Budget', 'content': 'Budget article text'}),
+    ('article_update', 'patch', f'{articles_router.prefix}/update/1', {'title': 'Budget'}),
+    ('article_delete', 'delete', f'{articles_router.prefix}/delete/1', None),
+    ('comment_create', 'post', f'{comments_router.prefix}/create', {'content': 'Budget', 'article_id': 1}),
+    ('comment_delete', 'delete', f'{comments_router.prefix}/delete/1', None),
+    ('users_list', 'get', f'{users_router.prefix}/users', None),
+    ('user_profile', 'get', f'{users_router.prefix}/profile', None),
+    ('user_update', 'patch', f'{users_router.prefix}/update/1', {'full_name': 'Budget'}),
+    ('user_delete', 'delete', f'{users_router.prefix}/delete/1', None),
+])
+async def test_authorized_budgets(override_db, auth_client, test_data, assert_max_queries, name, method, url, json):
+    client = await auth_client(3)
+    kwargs = {'json': json} if json is not None else {}
+
+    with assert_max_queries(QUERY_BUDGETS[name]):
+        response = await getattr(client, method)(url, **kwargs)
+
+    assert response.status_code < 300
+
+
+@pytest.mark.parametrize('name, url', [
+    ('articles_list', f'{articles_router.prefix}/'),
+    ('comments_list', f'{comments_router.prefix}/1'),
+    ('users_list', f'{users_router.prefix}/users'),
+])
+async def test_listing_queries_do_not_grow_with_rows(override_db, db_session, auth_client, test_data,
+                                                     assert_max_queries, name, url):
+    client = await auth_client(3)
+
+    with assert_max_queries(QUERY_BUDGETS[name]) as before:
+        response = await client.get(url)
+    assert response.status_code == 200
+
+    await add_rows(db_session, 10)
+
+    with assert_max_queries(before.count) as after:
+        response = await client.get(url)
+    assert response.status_code == 200
+    assert len(response.json()) >= 10
+    assert after.count == before.count
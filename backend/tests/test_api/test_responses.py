@@ -0,0 +1,60 @@
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.api.v1.endpoints.comments import router as comments_router
+from backend.api.v1.endpoints.users import router as users_router
+from backend.crud import (articles,
+                          comments,
+                          user)
+from backend.db.session import get_db
+from backend.schemas.article import ArticleResponse
+from backend.schemas.comment import CommentResponse
+from backend.schemas.user import UserResponse
+from backend.tests.conftest import app
+
+
+@pytest.mark.parametrize('url, schema', [
+    (f'{articles_router.prefix}/', ArticleResponse),
+    (f'{comments_router.prefix}/1', CommentResponse),
+    (f'{users_router.prefix}/users', UserResponse),
+])
+async def test_trusted_list_matches_response_model(db_session, auth_client, test_data, url, schema):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(3)
+
+    response = await client.get(url)
+    data = response.json()
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert data
+    # Ответ совпадает с тем, что построил бы FastAPI по response_model
+    adapter = TypeAdapter(List[schema])
+    assert adapter.dump_python(adapter.validate_python(data), mode='json') == data
+
+
+async def test_list_rows_have_response_fields(db_session, test_data):
+    current_user = test_data['users'][3]
+
+    rows = {
+        ArticleResponse: await articles.read(db_session),
+        CommentResponse: await comments.read(1, db_session),
+        UserResponse: await user.read(db_session, current_user, user_list=True),
+    }
+
+    for schema, result in rows.items():
+        assert set(result[0]._fields) == set(schema.model_fields)
+
+
+async def test_trusted_detail_matches_response_model(db_session, auth_client, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(3)
+
+    response = await client.get(f'{articles_router.prefix}/1')
+    data = response.json()
+
+    assert response.status_code == 200
+    assert ArticleResponse.model_validate(data).model_dump(mode='json') == data
@@ -0,0 +1,24 @@
+from backend.tests.conftest import db_session, app, test_data, auth_client
+from backend.api.v1.endpoints.service import router as service_router
+from backend.db.session import get_db
+
+
+async def test_db_pool_stats_by_admin(db_session, auth_client, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    client = await auth_client()
+    response = await client.get(f'{service_router.prefix}/db-pool')
+    data = response.json()
+
+    assert response.status_code == 200
+    assert set(data['primary']) >= {'size', 'checked_out', 'overflow', 'waits', 'timeouts'}
+
+
+async def test_db_pool_stats_by_base_user(db_session, auth_client, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    client = await auth_client(0)
+    response = await client.get(f'{service_router.prefix}/db-pool')
+
+    assert response.status_code == 403
+    assert response.json().get('detail') == 'You don`t have permission'
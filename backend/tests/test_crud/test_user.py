@@ -1,8 +1,13 @@
+import asyncio
+
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import (AsyncSession,
+                                    create_async_engine)
+from sqlalchemy.orm import sessionmaker
 
-from backend.crud.user import get_user, create, read, update, delete
-from backend.tests.conftest import test_data, db_session
+from backend.crud.user import get_user, create, read, update, delete, send_link
+from backend.tests.conftest import test_data, db_session, TEST_DATABASE_URL
 from backend.schemas.user import UserCreate, UserUpdate
 
 
@@ -204,3 +209,31 @@ async def test_delete_other_user_by_not_self(db_session, test_data):
     assert len(users_before_update) == len(users_after_update)
     assert e.value.status_code == 403
     assert e.value.detail == 'You don`t have permission'
+
+
+async def test_send_link_from_two_processes(db_session, test_data, mocker):
+    # Две сессии вместо двух процессов: ResendThrottle процесса не помогает
+    enqueue = mocker.patch('backend.crud.user.send_email_task.enqueue')
+    mocker.patch('backend.crud.user.link_throttle.interval', 0)
+    await db_session.commit()
+    engine = create_async_engine(TEST_DATABASE_URL)
+    sessions = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with sessions() as first, sessions() as second:
+            first_user = await get_user(first, 1)
+            second_user = await get_user(second, 1)
+
+            await send_link(first_user, first)
+            # Второй запрос ждет блокировку строки, пока первый не зафиксирован
+            retry = asyncio.create_task(send_link(second_user, second))
+            await asyncio.sleep(0.2)
+            assert not retry.done()
+            await first.commit()
+            await retry
+            await second.commit()
+
+            assert second_user.conf_reg_link == first_user.conf_reg_link
+    finally:
+        await engine.dispose()
+
+    assert enqueue.call_count == 1
@@ -0,0 +1,116 @@
+import pytest
+from async_asgi_testclient import TestClient
+from fastapi import Depends
+from sqlalchemy import (event,
+                        text)
+from sqlalchemy.ext.asyncio import (AsyncSession,
+                                    create_async_engine)
+from sqlalchemy.orm import sessionmaker
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.api.v1.endpoints.users import router as users_router
+from backend.core.security import get_current_user
+from backend.db.session import (get_db,
+                                get_read_db)
+from backend.tests.conftest import (app,
+                                    TEST_DATABASE_URL)
+
+
+@pytest.fixture
+async def pool_engine(db_session, test_data, mocker):
+    # Данные test_data должны быть видны из соединений другого движка
+    await db_session.commit()
+    engine = create_async_engine(TEST_DATABASE_URL)
+    mocker.patch(
+        'backend.db.session.AsyncSessionLocal',
+        sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    app.dependency_overrides.pop(get_db, None)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def checkouts(pool_engine):
+    checkouts = []
+    event.listen(pool_engine.sync_engine, 'checkout', lambda *args: checkouts.append(args))
+    return checkouts
+
+
+async def test_rejected_requests_do_not_checkout(checkouts):
+    client = TestClient(app)
+
+    response = await client.post(f'{articles_router.prefix}/create', json={'title': 'no auth'})
+    assert response.status_code == 401
+
+    response = await client.get(f'{users_router.prefix}/users')
+    assert response.status_code == 401
+
+    assert checkouts == []
+
+
+async def test_read_request_uses_single_checkout(checkouts):
+    response = await TestClient(app).get(f'{articles_router.prefix}/')
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+
+
+async def test_auth_and_read_share_checkout(db_session, auth_client, checkouts):
+    client = await auth_client(3)
+    await db_session.commit()
+
+    response = await client.get(f'{users_router.prefix}/users')
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+
+
+async def test_read_session_is_read_only(pool_engine):
+    db_gen = get_db()
+    db = await db_gen.__anext__()
+    read_gen = get_read_db(db=db)
+    read_db = await read_gen.__anext__()
+
+    result = await read_db.execute(text('SHOW transaction_read_only'))
+
+    assert result.scalar() == 'on'
+    assert read_db.autoflush is False
+    for gen in (read_gen, db_gen):
+        with pytest.raises(StopAsyncIteration):
+            await gen.__anext__()
+
+
+async def test_read_only_after_transaction_began(pool_engine):
+    # Обратный порядок зависимостей: сессию get_db уже использовал get_current_user
+    db_gen = get_db()
+    db = await db_gen.__anext__()
+    await db.execute(text('SELECT 1'))
+    read_gen = get_read_db(db=db)
+    read_db = await read_gen.__anext__()
+
+    result = await read_db.execute(text('SHOW transaction_read_only'))
+
+    assert result.scalar() == 'on'
+    assert read_db.autoflush is False
+    for gen in (read_gen, db_gen):
+        with pytest.raises(StopAsyncIteration):
+            await gen.__anext__()
+
+
+async def test_read_only_with_auth_declared_first(db_session, auth_client, checkouts):
+    client = await auth_client(3)
+    await db_session.commit()
+
+    # Маршрут, у которого get_current_user объявлен раньше get_read_db
+    @app.get('/test-read-only-order')
+    async def read_only_order(current_user=Depends(get_current_user), db=Depends(get_read_db)):
+        return {'read_only': (await db.execute(text('SHOW transaction_read_only'))).scalar()}
+
+    try:
+        response = await client.get('/test-read-only-order')
+    finally:
+        app.router.routes.pop()
+
+    assert response.json() == {'read_only': 'on'}
+    assert len(checkouts) == 1
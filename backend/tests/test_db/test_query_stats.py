@@ -0,0 +1,54 @@
+from async_asgi_testclient import TestClient
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.crud.articles import read
+from backend.crud.user import get_user
+from backend.db.query_stats import (logger_file,
+                                    redact_parameters,
+                                    track_queries)
+from backend.db.session import get_db
+from backend.tests.conftest import app
+
+
+async def test_track_queries_counts_statements(db_session, test_data):
+    with track_queries() as stats:
+        await read(db_session)
+
+    assert stats.count > 0
+    assert stats.duration > 0
+
+
+async def test_statements_outside_tracking_not_counted(db_session, test_data):
+    with track_queries() as stats:
+        pass
+    await read(db_session)
+
+    assert stats.count == 0
+
+
+async def test_server_timing_header(db_session, test_data):
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    response = await TestClient(app).get(f'{articles_router.prefix}/')
+
+    assert response.status_code == 200
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+    assert 'queries' in response.headers['Server-Timing']
+
+
+def test_redact_parameters():
+    assert redact_parameters(('secret@mail.ru', 10)) == ['str', 'int']
+    assert redact_parameters({'token': 'secret'}) == {'token': 'str'}
+    assert redact_parameters([('secret', 1), ('other', 2)]) == [['str', 'int'], ['str', 'int']]
+
+
+async def test_slow_query_logged_without_values(db_session, test_data, mocker):
+    mocker.patch('backend.db.query_stats.DB_SLOW_QUERY_MS', 0)
+    warning = mocker.patch.object(logger_file, 'warning')
+
+    await get_user(db_session, user_email='test_user_1@mail.ru')
+
+    message = warning.call_args.args[0]
+    assert message.startswith('Slow query')
+    assert 'test_user_1@mail.ru' not in message
+    assert warning.call_args.kwargs['extra']['db_parameters'] == ['str']
@@ -0,0 +1,99 @@
+import random
+from collections import Counter
+from datetime import (datetime,
+                      timedelta)
+from zoneinfo import ZoneInfo
+
+import asyncpg
+import pytest
+
+from backend.db.seed import (SkewedChoice,
+                             seed)
+from backend.tests.conftest import TEST_DATABASE_URL
+
+TABLES = ['users', 'articles', 'comments']
+
+
+@pytest.fixture
+async def conn(db_session, test_data):
+    # Данные test_data должны быть видны из соединения asyncpg
+    await db_session.commit()
+    conn = await asyncpg.connect(TEST_DATABASE_URL.replace('postgresql+asyncpg', 'postgresql'))
+    yield conn
+    await conn.close()
+
+
+async def schema(conn) -> tuple[list, list]:
+    indexes = await conn.fetch(
+        'SELECT indexname, indexdef FROM pg_indexes WHERE tablename = ANY($1::text[]) ORDER BY indexname', TABLES
+    )
+    keys = await conn.fetch(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE contype = 'f' AND conrelid::regclass::text = ANY($1::text[]) ORDER BY conname
+        """,
+        TABLES,
+    )
+    return indexes, keys
+
+
+@pytest.mark.parametrize('keep_indexes', [False, True])
+async def test_seed(conn, keep_indexes):
+    before = {table: await conn.fetchval(f'SELECT count(*) FROM {table}') for table in TABLES}
+    indexes_before = await schema(conn)
+
+    results = await seed(conn, 'hash', users=50, articles=200, comments=5000, random_seed=1, keep_indexes=keep_indexes)
+
+    assert {table: results[table]['rows'] for table in TABLES} == {'users': 50, 'articles': 200, 'comments': 5000}
+    for table in TABLES:
+        assert await conn.fetchval(f'SELECT count(*) FROM {table}') == before[table] + results[table]['rows']
+    assert await schema(conn) == indexes_before
+
+    # Комментарии неравномерны: у самой популярной статьи их намного больше среднего
+    per_article = await conn.fetch(
+        'SELECT article_id, count(*) FROM comments GROUP BY article_id ORDER BY 2 DESC'
+    )
+    assert per_article[0]['count'] > 10 * 5000 / 200
+    # Пользователи вставлены с идентификаторами последовательности: новые записи не конфликтуют
+    assert await conn.fetchval(
+        "INSERT INTO users (email, hashed_password, is_active) VALUES ('after_seed@mail.ru', 'hash', true) RETURNING id"
+    )
+
+
+async def test_seed_is_atomic(conn):
+    with pytest.raises(ValueError):
+        await seed(conn, 'hash', users=0, articles=10, comments=0)
+
+    # email следующего пользователя уже занят: уникальный индекс не пересоздается
+    next_id = await conn.fetchval("SELECT nextval(pg_get_serial_sequence('users', 'id'))") + 1
+    await conn.execute(f"INSERT INTO users (id, email) VALUES (-1, 'user{next_id}@seed.example.com')")
+    before = {table: await conn.fetchval(f'SELECT count(*) FROM {table}') for table in TABLES}
+    schema_before = await schema(conn)
+
+    with pytest.raises(asyncpg.UniqueViolationError):
+        await seed(conn, 'hash', users=1, articles=1, comments=1)
+
+    assert {table: await conn.fetchval(f'SELECT count(*) FROM {table}') for table in TABLES} == before
+    assert await schema(conn) == schema_before
+
+
+async def test_seed_timestamps_in_db_timezone(conn, mocker):
+    # Пояс на 12 часов западнее UTC: время процесса оказалось бы в будущем
+    mocker.patch('backend.db.seed.DB_TIMEZONE', 'Etc/GMT+12')
+    now = datetime.now(ZoneInfo('Etc/GMT+12')).replace(tzinfo=None)
+    last_ids = {table: await conn.fetchval(f'SELECT coalesce(max(id), 0) FROM {table}') for table in TABLES}
+
+    await seed(conn, 'hash', users=20, articles=20, comments=200, random_seed=1, days=1)
+
+    # У пользователей created_at - дата, время проверяется по статьям и комментариям
+    for table in ('articles', 'comments'):
+        newest = await conn.fetchval(f'SELECT max(created_at) FROM {table} WHERE id > $1', last_ids[table])
+        assert now - timedelta(days=1) < newest <= now + timedelta(minutes=1)
+
+
+def test_skewed_choice():
+    rng = random.Random(1)
+    choice = SkewedChoice([10, 20, 30, 40], skew=1.0)
+    counts = Counter(choice.pick(rng) for _ in range(10000))
+
+    assert counts[10] > counts[20] > counts[30] > counts[40] > 0
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import (event,
+                        select)
+from sqlalchemy.ext.asyncio import (AsyncSession,
+                                    create_async_engine)
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models.user import User
+from backend.db.session import (get_db,
+                                on_commit)
+from backend.tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def uow_engine(db_session, mocker):
+    engine = create_async_engine(TEST_DATABASE_URL)
+    mocker.patch(
+        'backend.db.session.AsyncSessionLocal',
+        sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def commits(uow_engine):
+    commits = []
+    event.listen(uow_engine.sync_engine, 'commit', lambda conn: commits.append(conn))
+    return commits
+
+
+def new_user(email):
+    return User(email=email, hashed_password='hash', full_name='Unit Of Work')
+
+
+async def count_users(engine, email):
+    async with engine.connect() as conn:
+        result = await conn.execute(select(User).filter(User.email == email))
+        return len(result.all())
+
+
+async def test_single_commit_and_callbacks_after_commit(uow_engine, commits, mocker):
+    callback = mocker.AsyncMock()
+    gen = get_db()
+    db = await gen.__anext__()
+
+    db.add(new_user('uow_1@mail.ru'))
+    await db.flush()
+    db.add(new_user('uow_2@mail.ru'))
+    await db.flush()
+    await on_commit(db, callback)
+    callback.assert_not_awaited()
+
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+
+    assert len(commits) == 1
+    callback.assert_awaited_once()
+    assert await count_users(uow_engine, 'uow_2@mail.ru') == 1
+
+
+async def test_rollback_on_error_skips_callbacks(uow_engine, commits, mocker):
+    callback = mocker.AsyncMock()
+    gen = get_db()
+    db = await gen.__anext__()
+
+    db.add(new_user('uow_3@mail.ru'))
+    await db.flush()
+    await on_commit(db, callback)
+
+    with pytest.raises(ValueError):
+        await gen.athrow(ValueError('handler failed'))
+
+    assert commits == []
+    callback.assert_not_awaited()
+    assert await count_users(uow_engine, 'uow_3@mail.ru') == 0
+
+
+async def test_on_commit_outside_request_runs_immediately(db_session, mocker):
+    callback = mocker.AsyncMock()
+
+    await on_commit(db_session, callback)
+
+    callback.assert_awaited_once()
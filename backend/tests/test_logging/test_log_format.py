@@ -0,0 +1,123 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from backend.api.v1.endpoints.articles import router as articles_router
+from backend.core import log_format
+from backend.core.log_format import (JsonFormatter,
+                                     RateLimitFilter,
+                                     RequestContextFilter)
+from backend.db.session import get_db
+from backend.tests.conftest import app
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(RequestContextFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    handlers = {}
+    for name in ('console_logger', 'file_logger'):
+        logger = logging.getLogger(name)
+        # Ограничение частоты общее для процесса, в тесте оно не нужно
+        monkeypatch.setattr(logger, 'filters', [])
+        handlers[name] = ListHandler()
+        logger.addHandler(handlers[name])
+    yield handlers
+    for name, handler in handlers.items():
+        logging.getLogger(name).removeHandler(handler)
+
+
+def make_record(msg='message', level=logging.WARNING, name='file_logger', exc_info=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, exc_info)
+
+
+def test_json_formatter_fields():
+    record = make_record('Article %s not found', level=logging.INFO)
+    record.args = (5,)
+    record.request_id = 'abc'
+    record.db_queries = 2
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data['message'] == 'Article 5 not found'
+    assert data['level'] == 'INFO'
+    assert data['logger'] == 'file_logger'
+    assert data['request_id'] == 'abc'
+    assert data['db_queries'] == 2
+    assert 'args' not in data and 'msg' not in data
+
+
+def test_json_formatter_exception():
+    try:
+        raise ValueError('broken')
+    except ValueError:
+        record = make_record('failed', level=logging.ERROR, exc_info=sys.exc_info())
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data['message'] == 'failed'
+    assert 'ValueError: broken' in data['exception']
+
+
+def test_rate_limit(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(log_format.time, 'monotonic', lambda: now[0])
+    rate_limit = RateLimitFilter(rate=3, interval=60)
+
+    passed = [rate_limit.filter(make_record('Article not found')) for _ in range(10)]
+    other = rate_limit.filter(make_record('User not found'))
+    errors = [rate_limit.filter(make_record('Article not found', level=logging.ERROR)) for _ in range(10)]
+
+    assert passed == [True] * 3 + [False] * 7
+    assert other
+    assert all(errors)
+
+    now[0] += 61
+    record = make_record('Article not found')
+    assert rate_limit.filter(record)
+    assert record.suppressed == 7
+    assert record.getMessage() == 'Article not found [7 similar suppressed]'
+
+
+async def test_request_context_in_logs(db_session, auth_client, test_data, captured):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(0)
+
+    response = await client.get(f'{articles_router.prefix}/999', headers={'X-Request-ID': 'req-42'})
+
+    assert response.status_code == 404
+    assert response.headers['x-request-id'] == 'req-42'
+
+    warning = captured['file_logger'].records[-1]
+    assert warning.getMessage() == 'Article not found'
+    assert warning.request_id == 'req-42'
+    assert warning.route == f'{articles_router.prefix}/{{article_id:int}}'
+
+    access = captured['console_logger'].records[-1]
+    assert access.request_id == 'req-42'
+    assert access.route == warning.route
+    assert access.status_code == 404
+    assert access.db_queries >= 1
+    assert access.duration_ms > 0
+
+
+async def test_user_id_and_generated_request_id(db_session, auth_client, test_data, captured):
+    app.dependency_overrides[get_db] = lambda: db_session
+    client = await auth_client(0)
+
+    response = await client.get('/users/profile', headers={'X-Request-ID': 'bad id\n'})
+    access = captured['console_logger'].records[-1]
+
+    assert len(response.headers['x-request-id']) == 32
+    assert access.request_id == response.headers['x-request-id']
+    assert access.user_id is not None
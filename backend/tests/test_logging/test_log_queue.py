@@ -0,0 +1,115 @@
+import gc
+import logging
+import os
+import threading
+
+import pytest
+
+from backend.core import log_queue as log_queue_module
+from backend.core.log_queue import LogQueue
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, block: threading.Event = None):
+        super().__init__()
+        self.records = []
+        self.block = block
+
+    def emit(self, record):
+        if self.block is not None:
+            self.block.wait(5)
+        self.records.append(self.format(record))
+
+
+@pytest.fixture
+def loggers():
+    names = ['test_queue_console', 'test_queue_file']
+    handlers = {}
+    for name in names:
+        logger = logging.getLogger(name)
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        handlers[name] = ListHandler()
+        logger.addHandler(handlers[name])
+    yield handlers
+    for name in names:
+        logging.getLogger(name).handlers.clear()
+
+
+def test_records_routed_to_logger_handlers(loggers):
+    log_queue = LogQueue(loggers, maxsize=100)
+    log_queue.start()
+
+    logging.getLogger('test_queue_console').info('to console %s', 1)
+    logging.getLogger('test_queue_file').warning('to file')
+    log_queue.stop()
+
+    assert loggers['test_queue_console'].records == ['to console 1']
+    assert loggers['test_queue_file'].records == ['to file']
+
+
+def test_overflow_dropped_and_reported(loggers):
+    log_queue = LogQueue(['test_queue_file'], maxsize=2)
+    logger = logging.getLogger('test_queue_file')
+
+    # Слушатель не запущен: очередь заполняется, лишние записи отбрасываются
+    for i in range(5):
+        logger.warning(f'record {i}')
+    assert log_queue.dropped == 3
+
+    log_queue.start()
+    log_queue.stop()
+
+    records = loggers['test_queue_file'].records
+    assert records[0] == 'Log queue overflow, 3 record(s) dropped'
+    assert records[1:] == ['record 0', 'record 1']
+
+
+def test_logging_does_not_wait_for_handler(loggers):
+    release = threading.Event()
+    loggers['test_queue_file'].block = release
+    log_queue = LogQueue(['test_queue_file'], maxsize=10)
+    log_queue.start()
+
+    # Обработчик заблокирован, но вызовы логгера возвращаются сразу
+    for i in range(3):
+        logging.getLogger('test_queue_file').warning(f'record {i}')
+    assert loggers['test_queue_file'].records == []
+
+    release.set()
+    log_queue.stop()
+    assert loggers['test_queue_file'].records == ['record 0', 'record 1', 'record 2']
+
+
+def test_fork_callback_registered_once(loggers, mocker):
+    register = mocker.patch('os.register_at_fork')
+    log_queue = LogQueue(['test_queue_file'], maxsize=10)
+    dropped = LogQueue(['test_queue_console'], maxsize=10)
+    dropped_id = id(dropped)
+    del dropped
+    gc.collect()
+
+    assert register.call_count == 0
+    assert log_queue in log_queue_module._live_queues
+    assert dropped_id not in {id(queue) for queue in log_queue_module._live_queues}
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not available')
+def test_child_restarts_listener(loggers):
+    log_queue = LogQueue(['test_queue_file'], maxsize=10)
+    log_queue.start()
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        # Дочерний процесс: своя очередь и живой поток слушателя
+        alive = log_queue.listener._thread is not None and log_queue.listener._thread.is_alive()
+        os.write(write_fd, b'1' if alive and log_queue.handlers[0].queue is log_queue.queue else b'0')
+        os._exit(0)
+    os.waitpid(pid, 0)
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.close(read_fd)
+    log_queue.stop()
+
+    assert result == b'1'
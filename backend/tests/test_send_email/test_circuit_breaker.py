@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from backend.fast_api_email.circuit_breaker import (CircuitBreaker,
+                                                    CircuitOpenError,
+                                                    CircuitState)
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(
+        'test',
+        failure_threshold=2,
+        reset_timeout=0.05,
+        failure_exceptions=(ConnectionError,),
+    )
+
+
+async def call(breaker: CircuitBreaker, error: Exception | None = None):
+    async with breaker:
+        if error is not None:
+            raise error
+
+
+async def call_forever(breaker: CircuitBreaker):
+    async with breaker:
+        await asyncio.sleep(10)
+
+
+async def test_opens_after_threshold(breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await call(breaker, ConnectionError())
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await call(breaker)
+
+
+async def test_other_errors_do_not_open(breaker):
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await call(breaker, ValueError())
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_other_errors_keep_failures(breaker):
+    with pytest.raises(ConnectionError):
+        await call(breaker, ConnectionError())
+    with pytest.raises(ValueError):
+        await call(breaker, ValueError())
+    with pytest.raises(ConnectionError):
+        await call(breaker, ConnectionError())
+
+    assert breaker.state == CircuitState.OPEN
+
+
+async def test_half_open_success_closes(breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await call(breaker, ConnectionError())
+    await asyncio.sleep(0.06)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    await call(breaker)
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_half_open_failure_reopens(breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await call(breaker, ConnectionError())
+    await asyncio.sleep(0.06)
+
+    with pytest.raises(ConnectionError):
+        await call(breaker, ConnectionError())
+    assert breaker.state == CircuitState.OPEN
+
+
+async def test_half_open_allows_single_trial(breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await call(breaker, ConnectionError())
+    await asyncio.sleep(0.06)
+
+    async with breaker:
+        with pytest.raises(CircuitOpenError):
+            await call(breaker)
+
+
+async def test_half_open_cancelled_trial(breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await call(breaker, ConnectionError())
+    await asyncio.sleep(0.06)
+
+    trial = asyncio.create_task(call_forever(breaker))
+    await asyncio.sleep(0)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    # Отмена не замыкает цепь, но следующий пробный вызов разрешен
+    assert breaker.state == CircuitState.HALF_OPEN
+    await call(breaker)
+    assert breaker.state == CircuitState.CLOSED
@@ -2,9 +2,13 @@ import pytest
 import requests
 
 from backend.schemas.user import UserForEmail
-from backend.fast_api_email.fast_api_email import send_email
+from fastapi_mail import MessageSchema, MessageType
+
+from backend.core.config import CONF
+from backend.fast_api_email.fast_api_email import TemplateCacheMail, send_email
 from backend.tests.conftest import override_smtp_config, clear_mailhog
 from backend.tasks.email_tasks import send_email_task
+from backend.tasks.local_pool import LocalTaskPool
 
 @pytest.mark.asyncio
 async def test_send_email_real_smtp(override_smtp_config, clear_mailhog):
@@ -33,13 +37,22 @@ async def test_send_email_real_smtp(override_smtp_config, clear_mailhog):
 
 
 @pytest.mark.asyncio
-async def test_send_email_task_real(override_smtp_config, clear_mailhog):
+async def test_send_email_task_real(override_smtp_config, clear_mailhog, tmp_path):
     test_user = UserForEmail(
         email='test_receiver@example.com',
         full_name='Test User'
     )
 
-    await send_email_task.apply(args=(test_user, 'Test Email', 'reg_confirm.html', 'https://example.com')).get()
+    pool = LocalTaskPool({'send_email_task': send_email_task}, workers=1, maxsize=10, queue_file=tmp_path / 'queue.jsonl', drain_timeout=10)
+    await pool.start()
+    await pool.enqueue(
+        'send_email_task',
+        user=test_user.model_dump(),
+        subject='Test Email',
+        template_name='reg_confirm.html',
+        link='https://example.com'
+    )
+    await pool.stop()
 
     response = requests.get('http://localhost:8025/api/v2/messages')
     messages = response.json()
@@ -50,4 +63,21 @@ async def test_send_email_task_real(override_smtp_config, clear_mailhog):
     assert response.status_code == 200
     assert len(messages['items']) > 0
     assert test_user.email in recipients
-    assert 'Test Email' in subject
\ No newline at end of file
+    assert 'Test Email' in subject
+
+
+async def test_template_environment_reused_between_messages(mocker):
+    mail = TemplateCacheMail(CONF)
+    template_engine = mocker.spy(type(mail.config), 'template_engine')
+    message = MessageSchema(
+        subject='Test Email',
+        recipients=['test_user_13@mail.ru'],
+        template_body={'full_name': 'Test User', 'current_year': 2025, 'link': 'https://example.com'},
+        subtype=MessageType.html,
+    )
+
+    first = await mail.get_message(message, template_name='reg_confirm.html')
+    await mail.get_message(message, template_name='reg_confirm.html')
+
+    assert 'https://example.com' in first.get_payload()[0].get_payload(decode=True).decode()
+    assert {id(result) for result in template_engine.spy_return_list} == {id(mail.template_env)}
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+
+# Модули, которые загружаются только при использовании: почта (при первом
+# письме), Celery (при первой отправке задачи брокеру)
+LAZY_MODULES = {'fastapi_mail', 'jinja2', 'aiosmtplib', 'redis', 'celery', 'kombu'}
+
+# Метрики нужны API (/metrics, middleware), командам - нет
+LAZY_MODULES_BY_MODULE = {
+    'backend.commands.commands': LAZY_MODULES | {'prometheus_client'},
+    'backend.main': LAZY_MODULES,
+}
+
+# Бюджет импорта, мс (с запасом: без кеша файловой системы импорт медленнее)
+IMPORT_BUDGETS = {
+    'backend.commands.commands': 2000,
+    'backend.main': 2500,
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Накопленное время импорта каждого модуля, мкс (по -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize('module, lazy_modules', LAZY_MODULES_BY_MODULE.items())
+def test_heavy_subsystems_not_imported(module, lazy_modules):
+    times = import_times(module)
+
+    assert module in times
+    assert lazy_modules.isdisjoint(times), sorted(lazy_modules & set(times))
+
+
+@pytest.mark.parametrize('module, budget_ms', IMPORT_BUDGETS.items())
+def test_import_time_budget(module, budget_ms):
+    times = import_times(module)
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+
+    assert times[module] / 1000 <= budget_ms, slowest
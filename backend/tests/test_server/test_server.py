@@ -0,0 +1,134 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from backend.core.config import (DB_POOL_SIZE,
+                                 DB_MAX_OVERFLOW)
+from backend.server import create_socket
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get(port: int, timeout: float = 10, path: str = '/') -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=2) as response:
+                return {'status': response.status, 'body': response.read()}
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def worker_pids(pid: int) -> set[int]:
+    children = Path(f'/proc/{pid}/task/{pid}/children').read_text().split()
+    return {int(child) for child in children}
+
+
+@pytest.fixture
+def server(tmp_path):
+    port = free_port()
+    env = {
+        **os.environ,
+        'TASK_BACKEND': 'local',
+        'TASK_QUEUE_FILE': str(tmp_path / 'task_queue.jsonl'),
+        'LOG_LEVEL_STREAM': 'INFO',
+        'PROMETHEUS_MULTIPROC_DIR': str(tmp_path / 'metrics'),
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'backend.server', '--workers', '2', '--host', '127.0.0.1', '--port', str(port)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    process.port = port
+    yield process
+    if process.poll() is None:
+        # Рабочие процессы в своей группе: после SIGKILL главного они остались бы
+        # работать с открытыми соединениями БД
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            for pid in worker_pids(process.pid):
+                os.kill(pid, signal.SIGKILL)
+            process.kill()
+            process.communicate()
+
+
+def test_create_socket_shared_by_children():
+    sock = create_socket('127.0.0.1', 0)
+    try:
+        assert sock.get_inheritable()
+        assert sock.getsockname()[1] > 0
+    finally:
+        sock.close()
+
+
+def test_workers_serve_and_stop_on_sigterm(server):
+    response = get(server.port)
+    assert response['status'] == 200
+    assert len(worker_pids(server.pid)) == 2
+
+    server.send_signal(signal.SIGTERM)
+    output, _ = server.communicate(timeout=30)
+
+    assert server.returncode == 0
+    assert 'Started 2 worker(s)' in output
+    assert 'All workers stopped' in output
+
+
+def test_crashed_worker_restarted(server):
+    get(server.port)
+    workers = worker_pids(server.pid)
+
+    killed = workers.pop()
+    os.kill(killed, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while killed in worker_pids(server.pid) or len(worker_pids(server.pid)) < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+    assert workers < worker_pids(server.pid)
+    assert get(server.port)['status'] == 200
+
+    server.send_signal(signal.SIGTERM)
+    output, _ = server.communicate(timeout=30)
+    assert 'restarting' in output
+
+
+def test_metrics_aggregated_across_workers(server):
+    for _ in range(20):
+        assert get(server.port)['status'] == 200
+
+    body = get(server.port, path='/metrics')['body'].decode()
+    samples = [sample for family in text_string_to_metric_families(body) for sample in family.samples]
+
+    requests = [
+        sample.value for sample in samples
+        if sample.name == 'http_request_duration_seconds_count' and sample.labels['route'] == '/'
+    ]
+    capacity = [
+        sample.value for sample in samples
+        if sample.name == 'db_pool_capacity' and sample.labels['engine'] == 'primary'
+    ]
+    assert requests == [20]
+    # Gauge пула задает каждый рабочий процесс, значения суммируются
+    assert capacity == [2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)]
@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.tasks import local_pool
+from backend.tasks.local_pool import (LocalTaskPool,
+                                      merge_orphan_journals,
+                                      worker_queue_file)
+from backend.tasks.retry import RetryTask
+
+
+@pytest.fixture
+def executed():
+    return []
+
+
+@pytest.fixture
+def tasks(executed):
+    async def collect(value: int):
+        executed.append(value)
+
+    async def fail(value: int):
+        raise RuntimeError('boom')
+
+    async def flaky(value: int):
+        # Успешно выполняется с третьей попытки
+        executed.append(-value)
+        if executed.count(-value) < 3:
+            raise RetryTask()
+        executed.append(value)
+
+    return {'collect': collect, 'fail': fail, 'flaky': flaky}
+
+
+def read_journal(path):
+    with open(path, encoding='utf8') as journal:
+        return [json.loads(line) for line in journal]
+
+
+async def test_enqueue_and_drain(tasks, executed, tmp_path):
+    queue_file = tmp_path / 'queue.jsonl'
+    pool = LocalTaskPool(tasks, workers=2, maxsize=2, queue_file=queue_file, drain_timeout=5)
+
+    await pool.start()
+    for value in range(10):
+        await pool.enqueue('collect', value=value)
+    await pool.stop()
+
+    records = read_journal(queue_file)
+    assert sorted(executed) == list(range(10))
+    assert len([record for record in records if record.get('done')]) == 10
+    assert not pool.running
+
+
+async def test_failed_task_does_not_stop_worker(tasks, executed, tmp_path):
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=tmp_path / 'queue.jsonl', drain_timeout=5)
+
+    await pool.start()
+    await pool.enqueue('fail', value=1)
+    await pool.enqueue('collect', value=2)
+    await pool.stop()
+
+    assert executed == [2]
+
+
+async def test_restore_pending_tasks(tasks, executed, tmp_path):
+    queue_file = tmp_path / 'queue.jsonl'
+    queue_file.write_text(
+        '{"id": "1", "name": "collect", "kwargs": {"value": 1}}\n'
+        '{"id": "2", "name": "collect", "kwargs": {"value": 2}}\n'
+        '{"id": "1", "done": true}\n'
+        '{"id": "3", "name": "coll',
+        encoding='utf8'
+    )
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=queue_file, drain_timeout=5)
+
+    await pool.start()
+    await pool.stop()
+
+    records = read_journal(queue_file)
+    assert executed == [2]
+    assert records == [
+        {'id': '2', 'name': 'collect', 'kwargs': {'value': 2}},
+        {'id': '2', 'done': True},
+    ]
+
+
+def pending_record(value: int) -> str:
+    return json.dumps({'id': str(value), 'name': 'collect', 'kwargs': {'value': value}}) + '\n'
+
+
+async def test_fewer_workers_restore_orphan_journals(tasks, executed, tmp_path):
+    # Было 3 процесса, стал 1: задачи процессов 1 и 2 выполняет процесс 0
+    queue_file = tmp_path / 'queue.jsonl'
+    for worker_id in range(3):
+        worker_queue_file(queue_file, worker_id).write_text(pending_record(worker_id), encoding='utf8')
+
+    merged = merge_orphan_journals(queue_file, workers=1)
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=worker_queue_file(queue_file, 0), drain_timeout=5)
+    await pool.start()
+    await pool.stop()
+
+    assert [path.name for path in merged] == ['queue.1.jsonl', 'queue.2.jsonl']
+    assert sorted(executed) == [0, 1, 2]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['queue.0.jsonl']
+
+
+async def test_more_workers_restore_unnumbered_journal(tasks, executed, tmp_path):
+    # Журнал запуска без backend.server, последняя строка недописана
+    queue_file = tmp_path / 'queue.jsonl'
+    queue_file.write_text(pending_record(1) + '{"id": "2", "na', encoding='utf8')
+    worker_queue_file(queue_file, 0).write_text(pending_record(3), encoding='utf8')
+    (tmp_path / 'queue.backup.jsonl').write_text(pending_record(4), encoding='utf8')
+
+    merge_orphan_journals(queue_file, workers=2)
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=worker_queue_file(queue_file, 0), drain_timeout=5)
+    await pool.start()
+    await pool.stop()
+
+    assert sorted(executed) == [1, 3]
+    assert not queue_file.exists()
+    assert (tmp_path / 'queue.backup.jsonl').exists()
+    assert merge_orphan_journals(queue_file, workers=2) == []
+
+
+async def test_enqueue_without_start_runs_inline(tasks, executed, tmp_path):
+    queue_file = tmp_path / 'queue.jsonl'
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=queue_file, drain_timeout=5)
+
+    await pool.enqueue('collect', value=7)
+
+    assert executed == [7]
+    assert not queue_file.exists()
+
+
+async def test_retry_with_backoff(tasks, executed, tmp_path, mocker):
+    mocker.patch.object(local_pool, 'retry_delay', return_value=0.01)
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=tmp_path / 'queue.jsonl',
+                         drain_timeout=5, max_retries=5)
+
+    await pool.start()
+    await pool.enqueue('flaky', value=3)
+    await asyncio.sleep(0.1)
+    await pool.stop()
+
+    assert executed == [-3, -3, -3, 3]
+
+
+async def test_retry_gives_up_after_max_retries(tasks, executed, tmp_path, mocker):
+    mocker.patch.object(local_pool, 'retry_delay', return_value=0.01)
+    pool = LocalTaskPool(tasks, workers=1, maxsize=10, queue_file=tmp_path / 'queue.jsonl',
+                         drain_timeout=5, max_retries=1)
+
+    await pool.start()
+    await pool.enqueue('flaky', value=3)
+    await asyncio.sleep(0.1)
+    await pool.stop()
+
+    assert executed == [-3, -3]